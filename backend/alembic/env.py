@@ -6,7 +6,7 @@ import os
 
 # --- ADD THESE IMPORTS ---
 from sqlmodel import SQLModel
-from app.models import user, question, exam, attempt # Import ALL your models
+from app.models import user, question, exam, attempt, import_job, analytics # Import ALL your models
 from app.core.config import settings 
 # -------------------------
 
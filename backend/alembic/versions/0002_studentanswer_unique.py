@@ -0,0 +1,42 @@
+"""unique answer per attempt and question
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 05:40:12.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older autosaves could race and insert the same answer twice.
+    # Keep one row per (attempt, question) before adding the constraint.
+    op.execute(
+        """
+        DELETE FROM studentanswer a
+        USING studentanswer b
+        WHERE a.attempt_id = b.attempt_id
+          AND a.question_id = b.question_id
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_studentanswer_attempt_question', 'studentanswer', ['attempt_id', 'question_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_studentanswer_attempt_question', 'studentanswer', type_='unique')
@@ -0,0 +1,45 @@
+"""denormalized exam question count and max score
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 06:31:08.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exam', sa.Column('question_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('exam', sa.Column('max_possible_score', sa.Float(), nullable=False, server_default='0'))
+    # Backfill; `python -m app.services.exam_totals` runs the same recompute later on
+    op.execute(
+        """
+        UPDATE exam SET
+            question_count = (
+                SELECT count(*) FROM examquestionlink l WHERE l.exam_id = exam.id
+            ),
+            max_possible_score = (
+                SELECT coalesce(sum(q.max_score), 0)
+                FROM examquestionlink l JOIN question q ON q.id = l.question_id
+                WHERE l.exam_id = exam.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('exam', 'max_possible_score')
+    op.drop_column('exam', 'question_count')
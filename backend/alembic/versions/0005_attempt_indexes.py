@@ -0,0 +1,54 @@
+"""attempt hot path indexes and one attempt per student and exam
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 07:05:52.661930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Duplicate attempts created by racing starts: keep the submitted one,
+# otherwise the earliest, and drop the rest together with their answers.
+DUPLICATE_ATTEMPTS = """
+    SELECT id FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY student_id, exam_id
+            ORDER BY (status = 'SUBMITTED') DESC, start_time, id
+        ) AS rn
+        FROM studentexamattempt
+    ) ranked
+    WHERE rn > 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"DELETE FROM studentanswer WHERE attempt_id IN ({DUPLICATE_ATTEMPTS})")
+    op.execute(f"DELETE FROM studentexamattempt WHERE id IN ({DUPLICATE_ATTEMPTS})")
+    op.create_unique_constraint(
+        'uq_studentexamattempt_student_exam', 'studentexamattempt', ['student_id', 'exam_id']
+    )
+    op.create_index(
+        'ix_studentexamattempt_exam_score', 'studentexamattempt', ['exam_id', 'total_score', 'id']
+    )
+    op.create_index(
+        'ix_studentexamattempt_student_start', 'studentexamattempt', ['student_id', 'start_time', 'id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_studentexamattempt_student_start', table_name='studentexamattempt')
+    op.drop_index('ix_studentexamattempt_exam_score', table_name='studentexamattempt')
+    op.drop_constraint('uq_studentexamattempt_student_exam', 'studentexamattempt', type_='unique')
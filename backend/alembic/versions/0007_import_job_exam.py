@@ -0,0 +1,31 @@
+"""exam an import job links its questions to
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 08:41:55.270318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('importjob', sa.Column('exam_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('importjob_exam_id_fkey', 'importjob', 'exam', ['exam_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('importjob_exam_id_fkey', 'importjob', type_='foreignkey')
+    op.drop_column('importjob', 'exam_id')
@@ -0,0 +1,69 @@
+"""question content hash for import deduplication
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 09:12:40.581126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.models.question import QuestionType
+from app.services.question_hash import question_content_hash
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def backfill_content_hashes() -> None:
+    """
+    Hashes existing questions with the importer's normalization. Of a group
+    of duplicates only the first one (physical order, roughly insertion
+    order) gets the hash; the others keep NULL so the unique index holds.
+    """
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, title, q_type, options, correct_answers FROM question ORDER BY ctid"),
+        execution_options={"stream_results": True},
+    )
+    seen = set()
+    hashed = []
+    for batch in rows.partitions(BATCH_SIZE):
+        for question_id, title, q_type, options, correct_answers in batch:
+            content_hash = question_content_hash(title, QuestionType[q_type], options, correct_answers)
+            if content_hash not in seen:
+                seen.add(content_hash)
+                hashed.append({"id": question_id, "content_hash": content_hash})
+
+    update = sa.text("UPDATE question SET content_hash = :content_hash WHERE id = :id")
+    for start in range(0, len(hashed), BATCH_SIZE):
+        bind.execute(update, hashed[start:start + BATCH_SIZE])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('question', sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    backfill_content_hashes()
+    op.create_index(op.f('ix_question_content_hash'), 'question', ['content_hash'], unique=True)
+
+    op.add_column('importjob', sa.Column('on_duplicate', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default='skip'))
+    op.add_column('importjob', sa.Column('rows_skipped', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importjob', sa.Column('rows_updated', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('importjob', 'rows_updated')
+    op.drop_column('importjob', 'rows_skipped')
+    op.drop_column('importjob', 'on_duplicate')
+    op.drop_index(op.f('ix_question_content_hash'), table_name='question')
+    op.drop_column('question', 'content_hash')
@@ -0,0 +1,42 @@
+"""ordered exam papers
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 09:47:03.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('examquestionlink', sa.Column('position', sa.Integer(), nullable=True))
+    # Existing papers keep the order they were built in (physical order, roughly insertion order)
+    op.execute(
+        """
+        UPDATE examquestionlink l SET position = numbered.position
+        FROM (
+            SELECT exam_id, question_id, row_number() OVER (PARTITION BY exam_id ORDER BY ctid) AS position
+            FROM examquestionlink
+        ) numbered
+        WHERE l.exam_id = numbered.exam_id AND l.question_id = numbered.question_id
+        """
+    )
+    op.create_index('ix_examquestionlink_exam_position', 'examquestionlink', ['exam_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_examquestionlink_exam_position', table_name='examquestionlink')
+    op.drop_column('examquestionlink', 'position')
@@ -0,0 +1,62 @@
+"""question tags array, search vector and listing indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 10:21:55.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.question import SEARCH_DOCUMENT
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CSV string -> array, normalized like QuestionBase.tags (trimmed, lowercased,
+    # deduplicated in order, empty -> NULL). ALTER ... USING cannot take a subquery.
+    op.add_column('question', sa.Column('tag_list', postgresql.ARRAY(sa.String()), nullable=True))
+    op.execute(
+        """
+        UPDATE question SET tag_list = (
+            SELECT NULLIF(array_agg(tag ORDER BY first), '{}')
+            FROM (
+                SELECT lower(btrim(part, E' \\t\\r\\n')) AS tag, min(n) AS first
+                FROM unnest(string_to_array(tags, ',')) WITH ORDINALITY AS t(part, n)
+                WHERE btrim(part, E' \\t\\r\\n') <> ''
+                GROUP BY 1
+            ) normalized
+        )
+        WHERE tags IS NOT NULL
+        """
+    )
+    op.drop_column('question', 'tags')
+    op.alter_column('question', 'tag_list', new_column_name='tags')
+
+    op.add_column('question', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_DOCUMENT, persisted=True), nullable=True
+    ))
+    op.create_index('ix_question_complexity_id', 'question', ['complexity', 'id'], unique=False)
+    op.create_index('ix_question_q_type_id', 'question', ['q_type', 'id'], unique=False)
+    op.create_index('ix_question_search_vector', 'question', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_question_tags', 'question', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_question_tags', table_name='question', postgresql_using='gin')
+    op.drop_index('ix_question_search_vector', table_name='question', postgresql_using='gin')
+    op.drop_index('ix_question_q_type_id', table_name='question')
+    op.drop_index('ix_question_complexity_id', table_name='question')
+    op.drop_column('question', 'search_vector')
+    op.alter_column('question', 'tags', type_=sa.String(), postgresql_using="array_to_string(tags, ',')")
@@ -0,0 +1,46 @@
+"""attempt deadline for the deadline sweeper
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 11:02:37.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('studentexamattempt', sa.Column('deadline_at', sa.DateTime(), nullable=True))
+    # Open attempts already past it are submitted by the first sweep after deploy
+    op.execute(
+        """
+        UPDATE studentexamattempt a
+        SET deadline_at = LEAST(a.start_time + make_interval(mins => e.duration_minutes), e.end_time)
+        FROM exam e
+        WHERE e.id = a.exam_id
+        """
+    )
+    op.create_index(
+        'ix_studentexamattempt_open_deadline', 'studentexamattempt', ['deadline_at'], unique=False,
+        postgresql_where=sa.text("status = 'IN_PROGRESS'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_studentexamattempt_open_deadline', table_name='studentexamattempt',
+        postgresql_where=sa.text("status = 'IN_PROGRESS'")
+    )
+    op.drop_column('studentexamattempt', 'deadline_at')
@@ -0,0 +1,31 @@
+"""grader work queue index on studentanswer
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 12:14:08.301552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_studentanswer_question_graded', 'studentanswer', ['question_id', 'is_graded', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_studentanswer_question_graded', table_name='studentanswer')
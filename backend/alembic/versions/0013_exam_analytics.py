@@ -0,0 +1,44 @@
+"""cached per-exam item analysis
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 15:02:41.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('examanalytics',
+    sa.Column('exam_id', sa.Uuid(), nullable=False),
+    sa.Column('stale_since', sa.DateTime(), nullable=True),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.Column('compute_ms', sa.Float(), nullable=False),
+    sa.Column('report', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ),
+    sa.PrimaryKeyConstraint('exam_id')
+    )
+    op.create_index(
+        'ix_examanalytics_stale_since', 'examanalytics', ['stale_since'], unique=False,
+        postgresql_where=sa.text('stale_since IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_examanalytics_stale_since', table_name='examanalytics', postgresql_where=sa.text('stale_since IS NOT NULL')
+    )
+    op.drop_table('examanalytics')
@@ -1,35 +1,48 @@
+import uuid
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import jwt
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models.user import User, UserRole
+from app.services.user_cache import AuthUser, user_cache
 
 # This tells FastAPI that the token comes from the "Authorization: Bearer" header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
-def get_current_user(
+async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    session: Session = Depends(get_session)
-) -> User:
+    session: AsyncSession = Depends(get_async_session)
+) -> AuthUser:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token payload")
-    except jwt.InvalidTokenError:
+        user_id = uuid.UUID(user_id)
+    except (jwt.InvalidTokenError, ValueError):
         raise HTTPException(status_code=401, detail="Could not validate credentials")
-    
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+
+    # Hot path: signed claims, then the per-worker cache, then the database
+    user = None
+    if settings.AUTH_TOKEN_CLAIMS and "role" in payload and "active" in payload:
+        user = AuthUser(id=user_id, role=UserRole(payload["role"]), is_active=payload["active"])
+    if user is None:
+        user = user_cache.get(user_id)
+    if user is None:
+        db_user = await session.get(User, user_id)
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = AuthUser.from_user(db_user)
+        user_cache.put(user)
+
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
\ No newline at end of file
@@ -1,260 +1,490 @@
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, desc
-from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select, desc
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime, timedelta
+import asyncio
+import csv
+import io
 import uuid
 
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_async_session, new_async_session, new_session
 from app.api.deps import get_current_user, get_current_admin
 from app.models.user import User, UserRole
-from app.models.exam import Exam
-from app.models.question import Question, QuestionType # Make sure QuestionType is imported
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question
 from app.models.attempt import StudentExamAttempt, StudentAnswer, AttemptStatus
+from app.models.analytics import ExamAnalytics
 from app.schemas.attempt_schema import (
     AttemptState, 
+    AttemptSession,
     AnswerSave, 
+    AnswerBulkSave,
+    AnswerSaveResult,
+    BulkSaveResult,
     AttemptResult, 
-    ExamPaperQuestion, 
     AttemptPublic, 
+    ExamResultRow,
     AttemptReview, 
     QuestionReview,
-    GradeUpdate
+    GradeUpdate,
+    AnswerGrade,
+    GradeBulk,
+    AttemptTotal,
+    BulkGradeResult,
+    UngradedAnswer
 )
-from app.services.grading_service import grade_answer
+from app.schemas.analytics_schema import ExamAnalyticsPublic
+from app.services.attempt_grading import grade_attempts
+from app.services.answer_service import upsert_answers
+from app.services.autosave_buffer import autosave_buffer
+from app.services.exam_analytics import mark_analytics_stale, refresh_exam_analytics
+from app.services.manual_grading import apply_manual_grades
+from app.services.paper_cache import get_compiled_paper
+from app.services.user_cache import AuthUser
 
 router = APIRouter()
 
-# ... (Keep start_or_resume_exam and save_answer exactly as they are)
+async def get_or_create_attempt(session: AsyncSession, student_id: uuid.UUID, exam: Exam) -> StudentExamAttempt:
+    """
+    Idempotent attempt creation: double clicks and retries all resolve to the
+    same row. The unique (student_id, exam_id) constraint decides the winner;
+    a first start costs one INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    Does not commit: a racing insert waits for this transaction and then
+    falls back to reading the committed row.
+    """
+    now = datetime.now()
+    stmt = (
+        insert(StudentExamAttempt)
+        .values(
+            id=uuid.uuid4(),
+            student_id=student_id,
+            exam_id=exam.id,
+            start_time=now,
+            deadline_at=min(now + timedelta(minutes=exam.duration_minutes), exam.end_time),
+            status=AttemptStatus.IN_PROGRESS,
+            total_score=0.0,
+        )
+        .on_conflict_do_nothing(index_elements=[StudentExamAttempt.student_id, StudentExamAttempt.exam_id])
+        .returning(StudentExamAttempt)
+    )
+    attempt = (await session.exec(stmt)).scalar_one_or_none()
+
+    if attempt is None:
+        # Resume (or lost the race): the row exists and is committed
+        attempt = (await session.exec(
+            select(StudentExamAttempt).where(
+                StudentExamAttempt.student_id == student_id,
+                StudentExamAttempt.exam_id == exam.id
+            )
+        )).one()
+    return attempt
+
+
+async def load_answers(session: AsyncSession, attempt_id: uuid.UUID) -> List[StudentAnswer]:
+    """Answers of an attempt; async sessions cannot lazy load attempt.answers."""
+    return (await session.exec(
+        select(StudentAnswer).where(StudentAnswer.attempt_id == attempt_id)
+    )).all()
+
+
+async def load_exam_questions(session: AsyncSession, exam_id: uuid.UUID) -> List[Question]:
+    """Questions of an exam; async sessions cannot lazy load exam.questions."""
+    return (await session.exec(
+        select(Question)
+        .join(ExamQuestionLink, ExamQuestionLink.question_id == Question.id)
+        .where(ExamQuestionLink.exam_id == exam_id)
+        .order_by(ExamQuestionLink.position)
+    )).all()
+
+
 @router.post("/start/{exam_id}", response_model=AttemptState)
-def start_or_resume_exam(
+async def start_or_resume_exam(
     exam_id: uuid.UUID,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
 ):
     # ... (Existing code)
-    exam = session.get(Exam, exam_id)
+    exam = await session.get(Exam, exam_id)
     if not exam or not exam.is_published:
         raise HTTPException(status_code=404, detail="Exam not found or not active")
 
-    statement = select(StudentExamAttempt).where(
-        StudentExamAttempt.student_id == user.id,
-        StudentExamAttempt.exam_id == exam_id
-    )
-    attempt = session.exec(statement).first()
+    attempt = await get_or_create_attempt(session, user.id, exam)
 
-    if not attempt:
-        attempt = StudentExamAttempt(student_id=user.id, exam_id=exam_id)
-        session.add(attempt)
-        session.commit()
-        session.refresh(attempt)
-    
     if attempt.status == AttemptStatus.SUBMITTED:
         raise HTTPException(status_code=400, detail="You have already submitted this exam")
 
-    now = datetime.now()
-    time_passed = (now - attempt.start_time).total_seconds()
-    total_duration_sec = exam.duration_minutes * 60
-    remaining_seconds = max(0, total_duration_sec - time_passed)
+    if settings.AUTOSAVE_WRITE_BEHIND:
+        # Resume must see answers that are still waiting in the buffer
+        await asyncio.to_thread(autosave_buffer.flush_attempt, attempt.id, new_session)
+
+    # Counts down to the deadline the sweeper enforces, end_time included
+    deadline = attempt.deadline_at or attempt.start_time + timedelta(minutes=exam.duration_minutes)
+    remaining_seconds = max(0, (deadline - datetime.now()).total_seconds())
 
     saved_answers = []
-    for ans in attempt.answers:
+    for ans in await load_answers(session, attempt.id):
         saved_answers.append({
             "question_id": ans.question_id,
             "selected_options": ans.selected_options,
             "text_answer": ans.text_answer
         })
 
-    questions_payload = []
-    for q in exam.questions:
-        questions_payload.append(ExamPaperQuestion(
-            id=q.id,
-            title=q.title,
-            type=q.q_type,
-            options=q.options,
-            max_score=q.max_score
-        ))
-
-    return AttemptState(
+    # The paper is identical for every student: splice the cached JSON
+    # into the per-student part instead of rebuilding it on every start.
+    paper = await get_compiled_paper(session, exam)
+    student_part = AttemptSession(
         attempt_id=attempt.id,
         exam_title=exam.title,
         start_time=attempt.start_time,
         duration_minutes=exam.duration_minutes,
         remaining_seconds=remaining_seconds,
-        questions=questions_payload,
         saved_answers=saved_answers
-    )
+    ).model_dump_json().encode()
+
+    body = student_part[:-1] + b',"questions":' + paper.questions_json + b'}'
+    await session.commit()
+    return Response(content=body, media_type="application/json")
+
+async def store_answers(attempt_id: uuid.UUID, answers: List[AnswerSave], session: AsyncSession) -> int:
+    """
+    Stores answers either in the write-behind buffer or directly in the database.
+    Returns the number of distinct answers accepted.
+    """
+    if not settings.AUTOSAVE_WRITE_BEHIND:
+        saved_count = await session.run_sync(upsert_answers, attempt_id, answers)
+        await session.commit()
+        return saved_count
+
+    over_limit = autosave_buffer.put(attempt_id, answers)
+    if over_limit:
+        # Backpressure: the request that crosses the limit pays for the flush
+        await asyncio.to_thread(autosave_buffer.flush, new_session)
+    return len({a.question_id for a in answers})
+
 
 @router.post("/{attempt_id}/save", status_code=200)
-def save_answer(
+async def save_answer(
     attempt_id: uuid.UUID,
     payload: AnswerSave,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
 ):
     # ... (Existing code)
-    attempt = session.get(StudentExamAttempt, attempt_id)
+    attempt = await session.get(StudentExamAttempt, attempt_id)
     if not attempt or attempt.student_id != user.id:
         raise HTTPException(status_code=404, detail="Attempt not found")
     if attempt.status == AttemptStatus.SUBMITTED:
         raise HTTPException(status_code=400, detail="Exam is already submitted")
 
-    stmt = select(StudentAnswer).where(
-        StudentAnswer.attempt_id == attempt_id,
-        StudentAnswer.question_id == payload.question_id
-    )
-    answer_db = session.exec(stmt).first()
-    
-    if not answer_db:
-        answer_db = StudentAnswer(attempt_id=attempt_id, question_id=payload.question_id)
-
-    answer_db.selected_options = payload.selected_options
-    answer_db.text_answer = payload.text_answer
-    
-    session.add(answer_db)
-    session.commit()
+    await store_answers(attempt_id, [payload], session)
     return {"message": "Saved"}
 
 
-@router.post("/{attempt_id}/submit", response_model=AttemptResult)
-def submit_exam(
+@router.post("/{attempt_id}/save/bulk", response_model=BulkSaveResult)
+async def save_answers_bulk(
     attempt_id: uuid.UUID,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user)
+    payload: AnswerBulkSave,
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
 ):
-    attempt = session.get(StudentExamAttempt, attempt_id)
+    """
+    Saves every changed answer of an attempt in one round trip.
+    Answers for questions outside the exam are rejected individually,
+    so the client can keep them marked as dirty.
+    """
+    attempt = await session.get(StudentExamAttempt, attempt_id)
     if not attempt or attempt.student_id != user.id:
         raise HTTPException(status_code=404, detail="Attempt not found")
-    
     if attempt.status == AttemptStatus.SUBMITTED:
-        exam = session.get(Exam, attempt.exam_id)
-        max_score = sum(q.max_score for q in exam.questions) if exam else 0
-        return AttemptResult(
-            attempt_id=attempt.id, 
-            status=attempt.status, 
-            total_score=attempt.total_score,
-            max_possible_score=max_score
+        raise HTTPException(status_code=400, detail="Exam is already submitted")
+
+    requested_ids = {a.question_id for a in payload.answers}
+    valid_ids = set((await session.exec(
+        select(ExamQuestionLink.question_id).where(
+            ExamQuestionLink.exam_id == attempt.exam_id,
+            ExamQuestionLink.question_id.in_(requested_ids)
         )
+    )).all())
 
-    total_score = 0.0
-    exam = session.get(Exam, attempt.exam_id)
-    if not exam:
-        raise HTTPException(status_code=404, detail="Exam not found")
-    
-    question_map = {q.id: q for q in exam.questions}
-
-    for answer in attempt.answers:
-        question = question_map.get(answer.question_id)
-        if question:
-            # Auto-grade logic
-            score = grade_answer(question, answer)
-            answer.score_awarded = score
-            answer.is_correct = (score == question.max_score)
-            
+    accepted = [a for a in payload.answers if a.question_id in valid_ids]
+    saved_count = await store_answers(attempt_id, accepted, session)
 
-            # Objective questions are automatically graded. Text/Image are NOT.
-            if question.q_type in [QuestionType.SINGLE_CHOICE, QuestionType.MULTI_CHOICE]:
-                answer.is_graded = True
-            else:
-                answer.is_graded = False # Explicitly false for text questions
-            
-            total_score += score
-            session.add(answer)
+    results = []
+    for q_id in dict.fromkeys(a.question_id for a in payload.answers):
+        if q_id in valid_ids:
+            results.append(AnswerSaveResult(question_id=q_id, saved=True))
+        else:
+            results.append(AnswerSaveResult(
+                question_id=q_id, saved=False, detail="Question is not part of this exam"
+            ))
+    return BulkSaveResult(saved_count=saved_count, results=results)
 
-    attempt.status = AttemptStatus.SUBMITTED
-    attempt.submit_time = datetime.now()
-    attempt.total_score = total_score
-    
-    session.add(attempt)
-    session.commit()
-    session.refresh(attempt)
+
+@router.post("/{attempt_id}/submit", response_model=AttemptResult)
+async def submit_exam(
+    attempt_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
+):
+    """
+    Submits and auto-grades the attempt in a fixed number of statements.
+    The conditional UPDATE claims the attempt: a concurrent submit (timer
+    and student together) waits on the row lock, matches nothing once this
+    one commits, and returns the stored result instead of grading again.
+    """
+    if settings.AUTOSAVE_WRITE_BEHIND:
+        # Grade the latest answers, not the last flushed ones
+        await asyncio.to_thread(autosave_buffer.flush_attempt, attempt_id, new_session)
+
+    claimed = (await session.exec(
+        update(StudentExamAttempt)
+        .where(
+            StudentExamAttempt.id == attempt_id,
+            StudentExamAttempt.student_id == user.id,
+            StudentExamAttempt.status == AttemptStatus.IN_PROGRESS,
+            StudentExamAttempt.exam_id == Exam.id,
+        )
+        .values(status=AttemptStatus.SUBMITTED, submit_time=datetime.now())
+        .returning(Exam.max_possible_score)
+        # Nothing of the attempt is loaded in this session
+        .execution_options(synchronize_session=False)
+    )).first()
+
+    if claimed is None:
+        submitted = (await session.exec(
+            select(StudentExamAttempt.status, StudentExamAttempt.total_score, Exam.max_possible_score)
+            .join(Exam, Exam.id == StudentExamAttempt.exam_id)
+            .where(StudentExamAttempt.id == attempt_id, StudentExamAttempt.student_id == user.id)
+        )).first()
+        if not submitted:
+            raise HTTPException(status_code=404, detail="Attempt not found")
+        return AttemptResult(
+            attempt_id=attempt_id,
+            status=submitted.status,
+            total_score=submitted.total_score,
+            max_possible_score=submitted.max_possible_score
+        )
+
+    totals = await grade_attempts(session, [attempt_id])
+    await session.commit()
+    await mark_analytics_stale(session, [attempt_id])
+    await session.commit()
 
     return AttemptResult(
-        attempt_id=attempt.id,
-        status=attempt.status,
-        total_score=total_score,
-        max_possible_score=sum(q.max_score for q in exam.questions)
+        attempt_id=attempt_id,
+        status=AttemptStatus.SUBMITTED,
+        total_score=totals[attempt_id],
+        max_possible_score=claimed.max_possible_score
     )
 
 # ... (Keep get_my_attempts and get_exam_results as is)
 @router.get("/history", response_model=List[AttemptPublic])
-def get_my_attempts(
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user)
+async def get_my_attempts(
+    status: Optional[AttemptStatus] = None,
+    before: Optional[datetime] = None,
+    before_id: Optional[uuid.UUID] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
 ):
-    statement = select(StudentExamAttempt).where(
-        StudentExamAttempt.student_id == user.id
-    ).order_by(desc(StudentExamAttempt.start_time))
-    
-    attempts = session.exec(statement).all()
-    
-    results = []
-    for attempt in attempts:
-        exam = session.get(Exam, attempt.exam_id)
-        if not exam:
-            continue
-        max_score = sum(q.max_score for q in exam.questions)
-        results.append(AttemptPublic(
-            id=attempt.id,
-            exam_title=exam.title,
-            start_time=attempt.start_time,
-            submit_time=attempt.submit_time,
-            status=attempt.status,
-            total_score=attempt.total_score,
-            max_possible_score=max_score
-        ))
-    return results
+    """
+    Newest attempts first, served by one query joined to Exam.
+    Next page: pass `before`/`before_id` = `start_time`/`id` of the last item.
+    """
+    statement = (
+        select(
+            StudentExamAttempt.id,
+            StudentExamAttempt.start_time,
+            StudentExamAttempt.submit_time,
+            StudentExamAttempt.status,
+            StudentExamAttempt.total_score,
+            Exam.title,
+            Exam.max_possible_score,
+        )
+        .join(Exam, Exam.id == StudentExamAttempt.exam_id)
+        .where(StudentExamAttempt.student_id == user.id)
+    )
+    if status:
+        statement = statement.where(StudentExamAttempt.status == status)
+    if before and before_id:
+        statement = statement.where(
+            tuple_(StudentExamAttempt.start_time, StudentExamAttempt.id) < tuple_(before, before_id)
+        )
+    elif before:
+        statement = statement.where(StudentExamAttempt.start_time < before)
+
+    statement = statement.order_by(
+        desc(StudentExamAttempt.start_time), desc(StudentExamAttempt.id)
+    ).limit(limit)
+
+    return [
+        AttemptPublic(
+            id=row.id,
+            exam_title=row.title,
+            start_time=row.start_time,
+            submit_time=row.submit_time,
+            status=row.status,
+            total_score=row.total_score,
+            max_possible_score=row.max_possible_score
+        )
+        for row in (await session.exec(statement)).all()
+    ]
+
+def exam_results_statement(exam_id: uuid.UUID):
+    """Results of one exam with the student's name and email, best score first."""
+    return (
+        select(
+            StudentExamAttempt.id,
+            StudentExamAttempt.start_time,
+            StudentExamAttempt.submit_time,
+            StudentExamAttempt.status,
+            StudentExamAttempt.total_score,
+            Exam.title,
+            Exam.max_possible_score,
+            User.id.label("student_id"),
+            User.full_name,
+            User.email,
+        )
+        .join(Exam, Exam.id == StudentExamAttempt.exam_id)
+        .join(User, User.id == StudentExamAttempt.student_id)
+        .where(StudentExamAttempt.exam_id == exam_id)
+        .order_by(desc(StudentExamAttempt.total_score), desc(StudentExamAttempt.id))
+    )
+
+
+def exam_result_row(row) -> ExamResultRow:
+    return ExamResultRow(
+        id=row.id,
+        exam_title=row.title,
+        start_time=row.start_time,
+        submit_time=row.submit_time,
+        status=row.status,
+        total_score=row.total_score,
+        max_possible_score=row.max_possible_score,
+        student_id=row.student_id,
+        student_name=row.full_name,
+        student_email=row.email
+    )
+
 
-@router.get("/exam/{exam_id}", response_model=List[AttemptPublic])
-def get_exam_results(
+@router.get("/exam/{exam_id}", response_model=List[ExamResultRow])
+async def get_exam_results(
     exam_id: uuid.UUID,
-    session: Session = Depends(get_session),
-    admin: User = Depends(get_current_admin)
+    after_score: Optional[float] = None,
+    after_id: Optional[uuid.UUID] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
 ):
-    statement = select(StudentExamAttempt).where(
-        StudentExamAttempt.exam_id == exam_id
-    ).order_by(desc(StudentExamAttempt.total_score))
-    
-    attempts = session.exec(statement).all()
-    results = []
-    exam = session.get(Exam, exam_id)
-    if not exam: 
-        return []
-    max_score = sum(q.max_score for q in exam.questions)
-
-    for attempt in attempts:
-        results.append(AttemptPublic(
-            id=attempt.id,
-            exam_title=exam.title,
-            start_time=attempt.start_time,
-            submit_time=attempt.submit_time,
-            status=attempt.status,
-            total_score=attempt.total_score,
-            max_possible_score=max_score
-        ))
-    return results
+    """
+    One page of results, best score first.
+    Next page: pass `after_score`/`after_id` = `total_score`/`id` of the last item.
+    """
+    statement = exam_results_statement(exam_id)
+    if after_score is not None and after_id:
+        statement = statement.where(
+            tuple_(StudentExamAttempt.total_score, StudentExamAttempt.id) < tuple_(after_score, after_id)
+        )
+    statement = statement.limit(limit)
+    return [exam_result_row(row) for row in (await session.exec(statement)).all()]
+
+
+EXPORT_BATCH_SIZE = 1000
+CSV_COLUMNS = [
+    "id", "student_id", "student_name", "student_email", "exam_title", "status",
+    "start_time", "submit_time", "total_score", "max_possible_score",
+]
+
+
+async def stream_exam_results(exam_id: uuid.UUID, fmt: str, session_factory=new_async_session):
+    """
+    Yields the export in chunks read from a server-side cursor,
+    so memory use does not grow with the cohort size.
+    """
+    if fmt == "csv":
+        yield ",".join(CSV_COLUMNS) + "\n"
+
+    async with session_factory() as session:
+        statement = exam_results_statement(exam_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        result = await session.stream(statement)
+        async for rows in result.partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                for row in rows:
+                    item = exam_result_row(row).model_dump(mode="json")
+                    writer.writerow([item[column] for column in CSV_COLUMNS])
+                yield buffer.getvalue()
+            else:
+                yield "".join(exam_result_row(row).model_dump_json() + "\n" for row in rows)
+
+
+@router.get("/exam/{exam_id}/export")
+async def export_exam_results(
+    exam_id: uuid.UUID,
+    fmt: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    admin: AuthUser = Depends(get_current_admin)
+):
+    """Streams every result of an exam as NDJSON or CSV."""
+    if fmt == "csv":
+        return StreamingResponse(
+            stream_exam_results(exam_id, fmt),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="exam-{exam_id}-results.csv"'}
+        )
+    return StreamingResponse(stream_exam_results(exam_id, fmt), media_type="application/x-ndjson")
+
+
+@router.get("/exam/{exam_id}/analytics", response_model=ExamAnalyticsPublic)
+async def get_exam_analytics(
+    exam_id: uuid.UUID,
+    refresh: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
+):
+    """
+    Item analysis of the exam's submitted attempts (difficulty, discrimination,
+    point-biserial, choice frequencies, score distribution), read from its
+    cached row. `stale` means results changed and the refresher has not
+    caught up yet. Computed in the request only the first time or with
+    `refresh=true`.
+    """
+    row = await session.get(ExamAnalytics, exam_id)
+    if refresh or row is None or row.report is None:
+        row = await asyncio.to_thread(refresh_exam_analytics, new_session, exam_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Exam not found")
+    return ExamAnalyticsPublic(
+        **row.report, exam_id=exam_id, computed_at=row.computed_at, stale=row.stale_since is not None
+    )
 
 
 @router.get("/{attempt_id}", response_model=AttemptReview)
-def get_attempt_review(
+async def get_attempt_review(
     attempt_id: uuid.UUID,
-    session: Session = Depends(get_session),
-    user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    user: AuthUser = Depends(get_current_user)
 ):
-    attempt = session.get(StudentExamAttempt, attempt_id)
+    attempt = await session.get(StudentExamAttempt, attempt_id)
     if not attempt:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
     if attempt.student_id != user.id and user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized to view this result")
         
-    exam = session.get(Exam, attempt.exam_id)
+    exam = await session.get(Exam, attempt.exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
-    answers_map = {a.question_id: a for a in attempt.answers}
+    answers_map = {a.question_id: a for a in await load_answers(session, attempt.id)}
     
     question_reviews = []
-    for q in exam.questions:
+    for q in await load_exam_questions(session, exam.id):
         user_ans = answers_map.get(q.id)
         question_reviews.append(QuestionReview(
             id=q.id,
@@ -279,45 +509,95 @@ def get_attempt_review(
         start_time=attempt.start_time,
         submit_time=attempt.submit_time,
         total_score=attempt.total_score,
-        max_possible_score=sum(q.max_score for q in exam.questions),
+        max_possible_score=exam.max_possible_score,
         questions=question_reviews
     )
 
 
 @router.patch("/{attempt_id}/grade/{question_id}", response_model=AttemptReview)
-def manual_grade_answer(
+async def manual_grade_answer(
     attempt_id: uuid.UUID,
     question_id: uuid.UUID,
     grade_data: GradeUpdate,
-    session: Session = Depends(get_session),
-    admin: User = Depends(get_current_admin)
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
 ):
-    statement = select(StudentAnswer).where(
-        StudentAnswer.attempt_id == attempt_id,
-        StudentAnswer.question_id == question_id
+    """Grades one answer and returns the whole review; graders working through many use POST /grading/bulk."""
+    outcome = await apply_manual_grades(
+        session, [AnswerGrade(attempt_id=attempt_id, question_id=question_id, score=grade_data.score)]
     )
-    answer = session.exec(statement).first()
-    
-    attempt = session.get(StudentExamAttempt, attempt_id)
-    if not attempt:
-        raise HTTPException(status_code=404, detail="Attempt not found")
+    if outcome.rejected:
+        detail = outcome.rejected[0].detail
+        raise HTTPException(status_code=404 if detail == "Attempt not found" else 400, detail=detail)
+    await session.commit()
+    await mark_analytics_stale(session, [attempt_id])
+    await session.commit()
 
-    if not answer:
-        answer = StudentAnswer(attempt_id=attempt_id, question_id=question_id, score_awarded=0)
-        session.add(answer)
-        session.commit()
-        session.refresh(answer)
+    return await get_attempt_review(attempt_id, session, admin)
 
-    answer.score_awarded = grade_data.score
-    answer.is_graded = True
-    
-    session.add(answer)
-    session.commit()
-    
-    new_total = sum((a.score_awarded or 0) for a in attempt.answers)
-    attempt.total_score = new_total
-    
-    session.add(attempt)
-    session.commit()
-    
-    return get_attempt_review(attempt_id, session, admin)
\ No newline at end of file
+
+@router.post("/grading/bulk", response_model=BulkGradeResult)
+async def grade_answers_bulk(
+    payload: GradeBulk,
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
+):
+    """
+    Stores many manual scores, of any attempts, in one transaction. Totals
+    move by each score's change in SQL; the response carries the new totals
+    and the grades that were rejected (unknown or unsubmitted attempt,
+    question outside the exam, score above its max), not the reviews.
+    """
+    outcome = await apply_manual_grades(session, payload.grades)
+    await session.commit()
+    if outcome.totals:
+        await mark_analytics_stale(session, list(outcome.totals))
+        await session.commit()
+    return BulkGradeResult(
+        graded_count=outcome.graded_count,
+        totals=[AttemptTotal(attempt_id=k, total_score=v) for k, v in outcome.totals.items()],
+        rejected=outcome.rejected
+    )
+
+
+@router.get("/grading/{question_id}", response_model=List[UngradedAnswer])
+async def get_grading_queue(
+    question_id: uuid.UUID,
+    after_id: Optional[uuid.UUID] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
+):
+    """
+    Answers to one question still waiting for a manual grade, across all
+    submitted attempts, in a stable order.
+    Next page: pass `after_id` = `id` of the last item.
+    """
+    statement = (
+        select(
+            StudentAnswer.id,
+            StudentAnswer.attempt_id,
+            StudentAnswer.selected_options,
+            StudentAnswer.text_answer,
+        )
+        .join(StudentExamAttempt, StudentExamAttempt.id == StudentAnswer.attempt_id)
+        .where(
+            StudentAnswer.question_id == question_id,
+            StudentAnswer.is_graded == False,
+            StudentExamAttempt.status == AttemptStatus.SUBMITTED,
+        )
+        .order_by(StudentAnswer.id)
+        .limit(limit)
+    )
+    if after_id:
+        statement = statement.where(StudentAnswer.id > after_id)
+
+    return [
+        UngradedAnswer(
+            id=row.id,
+            attempt_id=row.attempt_id,
+            selected_options=row.selected_options,
+            text_answer=row.text_answer
+        )
+        for row in (await session.exec(statement)).all()
+    ]
@@ -1,50 +1,80 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-from app.core.database import get_session
-from app.core.security import get_password_hash, verify_password, create_access_token
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.core.security import create_access_token
 from app.models.user import User
 from app.schemas.auth_schema import UserCreate, Token, UserPublic, TokenWithUser
+from app.services.password_hasher import HasherBusy, password_hasher
 
 router = APIRouter()
 
+
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many logins at once, please retry",
+        headers={"Retry-After": "2"}
+    )
+
+
 @router.post("/signup", response_model=UserPublic)
-def signup(user_in: UserCreate, session: Session = Depends(get_session)):
+async def signup(user_in: UserCreate, session: AsyncSession = Depends(get_async_session)):
     # 1. Check if user exists
     statement = select(User).where(User.email == user_in.email)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # 2. Create new user
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except HasherBusy:
+        raise hasher_busy()
+
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         role=user_in.role
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 
 @router.post("/login", response_model=TokenWithUser)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     # 1. Find user
     statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
     
     # 2. Verify password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    try:
+        valid, new_hash = await password_hasher.verify(form_data.password, user.hashed_password)
+    except HasherBusy:
+        raise hasher_busy()
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+
+    if new_hash:
+        # PASSWORD_BCRYPT_ROUNDS changed since this password was stored
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
     
     # 3. Generate Token
-    access_token = create_access_token(subject=user.id)
+    claims = {"role": user.role.value, "active": user.is_active} if settings.AUTH_TOKEN_CLAIMS else None
+    access_token = create_access_token(subject=user.id, claims=claims)
     
     # 4. Return Token AND User
     user_public = UserPublic(
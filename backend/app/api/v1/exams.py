@@ -1,95 +1,114 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from app.core.database import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
 from app.api.deps import get_current_admin, get_current_user
-from app.models.user import User, UserRole
-from app.models.exam import Exam, ExamQuestionLink
-from app.models.question import Question
+from app.models.user import UserRole
+from app.models.exam import Exam
 from app.models.attempt import StudentExamAttempt
-from app.schemas.exam_schema import ExamCreate, ExamPublic, ExamQuestionAdd, ExamUpdate
+from app.schemas.exam_schema import ExamCreate, ExamPublic, ExamQuestionAdd, ExamQuestionsResult, ExamUpdate
+from app.services.paper_cache import mark_paper_changed
+from app.services.exam_questions import append_questions, existing_question_ids, remove_questions, replace_questions
+from app.services.exam_totals import refresh_exam_totals
+from app.services.user_cache import AuthUser
 import uuid
 
 router = APIRouter()
 
 
 @router.post("/", response_model=ExamPublic)
-def create_exam(
+async def create_exam(
     exam_in: ExamCreate,
-    session: Session = Depends(get_session),
-    admin: User = Depends(get_current_admin)
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
 ):
     exam = Exam(**exam_in.model_dump())
     session.add(exam)
-    session.commit()
-    session.refresh(exam)
+    await session.commit()
+    await session.refresh(exam)
     return exam
 
-@router.post("/{exam_id}/questions", status_code=201)
-def add_questions_to_exam(
+@router.post("/{exam_id}/questions", response_model=ExamQuestionsResult, status_code=201)
+async def add_questions_to_exam(
     exam_id: uuid.UUID,
     payload: ExamQuestionAdd,
-    session: Session = Depends(get_session),
-    admin: User = Depends(get_current_admin)
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
 ):
-    exam = session.get(Exam, exam_id)
+    """
+    Appends `question_ids` after the paper's last question and takes
+    `remove_ids` off it. With `replace`, the paper becomes exactly
+    `question_ids` in that order. The number of queries does not grow
+    with the number of ids.
+    """
+    # Locks the exam row: concurrent edits of one paper would pick the same positions
+    exam = await session.get(Exam, exam_id, with_for_update=True)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
 
-    added_count = 0
-    for q_id in payload.question_ids:
-        if not session.get(Question, q_id):
-            continue 
-        existing_link = session.exec(
-            select(ExamQuestionLink).where(
-                ExamQuestionLink.exam_id == exam_id, 
-                ExamQuestionLink.question_id == q_id
-            )
-        ).first()
-        
-        if not existing_link:
-            link = ExamQuestionLink(exam_id=exam_id, question_id=q_id)
-            session.add(link)
-            added_count += 1
-            
-    session.commit()
-    return {"message": f"Added {added_count} questions to exam"}
+    question_ids = list(dict.fromkeys(payload.question_ids))
+    existing = await session.run_sync(existing_question_ids, question_ids) if question_ids else set()
+    valid_ids = [q_id for q_id in question_ids if q_id in existing]
+
+    added_count = removed_count = 0
+    if payload.replace:
+        added_count, removed_count = await session.run_sync(replace_questions, exam_id, valid_ids)
+    else:
+        if payload.remove_ids:
+            removed_count = await session.run_sync(remove_questions, exam_id, payload.remove_ids)
+        if valid_ids:
+            added_count = len(await session.run_sync(append_questions, exam_id, valid_ids))
+
+    if added_count or removed_count or payload.replace:
+        mark_paper_changed(exam)
+        session.add(exam)
+        await session.run_sync(refresh_exam_totals, [exam_id])
+    await session.commit()
+    return ExamQuestionsResult(
+        message=f"Added {added_count} questions to exam",
+        added_count=added_count,
+        removed_count=removed_count,
+        missing_ids=[q_id for q_id in question_ids if q_id not in existing],
+    )
 
 @router.patch("/{exam_id}", response_model=ExamPublic)
-def update_exam(
+async def update_exam(
     exam_id: uuid.UUID,
     exam_update: ExamUpdate,
-    session: Session = Depends(get_session),
-    admin: User = Depends(get_current_admin)
+    session: AsyncSession = Depends(get_async_session),
+    admin: AuthUser = Depends(get_current_admin)
 ):
-    exam = session.get(Exam, exam_id)
+    exam = await session.get(Exam, exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
         
     exam_data = exam_update.model_dump(exclude_unset=True)
     for key, value in exam_data.items():
         setattr(exam, key, value)
-        
+
+    # Title and publication are not in the compiled paper (it holds the
+    # questions only), so cached papers stay valid: no content_version bump
     session.add(exam)
-    session.commit()
-    session.refresh(exam)
-    return ExamPublic(**exam.model_dump(), question_count=len(exam.questions))
+    await session.commit()
+    await session.refresh(exam)
+    return ExamPublic(**exam.model_dump())
 
 @router.get("/", response_model=List[ExamPublic])
-def list_exams(
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+async def list_exams(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     query = select(Exam)
     if current_user.role != UserRole.ADMIN:
         query = query.where(Exam.is_published == True)
-    exams = session.exec(query).all()
+    exams = (await session.exec(query)).all()
     
     student_attempts = {}
     if current_user.role == UserRole.STUDENT:
-        attempts = session.exec(
+        attempts = (await session.exec(
             select(StudentExamAttempt).where(StudentExamAttempt.student_id == current_user.id)
-        ).all()
+        )).all()
         for att in attempts:
             student_attempts[att.exam_id] = att
     result = []
@@ -106,7 +125,6 @@ def list_exams(
             
         result.append(ExamPublic(
             **ex.model_dump(),
-            question_count=len(ex.questions),
             attempt_status=status,
             attempt_id=att_id
         ))
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_admin
+from app.core.database import pool_stats
+from app.services.autosave_buffer import autosave_buffer
+from app.services.deadline_sweeper import deadline_sweeper
+from app.services.exam_analytics import analytics_refresher
+from app.services.import_jobs import import_runner
+from app.services.paper_cache import paper_cache
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import AuthUser, user_cache
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics(admin: AuthUser = Depends(get_current_admin)):
+    """Runtime counters of this worker process."""
+    return {
+        "autosave": autosave_buffer.stats(),
+        "paper_cache": paper_cache.stats(),
+        "db_pool": pool_stats(),
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "question_imports": import_runner.stats(),
+        "deadline_sweeper": deadline_sweeper.stats(),
+        "analytics_refresher": analytics_refresher.stats(),
+    }
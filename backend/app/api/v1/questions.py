@@ -1,42 +1,184 @@
-from typing import List
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from sqlmodel import Session, select
-from app.core.database import get_session
+import asyncio
+import os
+import uuid
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_session, new_async_session
 from app.api.deps import get_current_admin
-from app.models.user import User
-from app.models.question import Question
-from app.schemas.question_schema import QuestionPublic
-from app.services.excel_service import parse_excel_questions
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.import_job import ImportJob
+from app.models.question import SEARCH_CONFIG, Question, QuestionType
+from app.schemas.question_schema import (
+    ImportJobPublic, QuestionPublic, QuestionUpdate, RescoreRequest, normalize_tags,
+)
+from app.services.exam_totals import refresh_exam_totals
+from app.services.import_jobs import import_runner, spool_upload
+from app.services.question_hash import question_content_hash
+from app.services.question_writer import DuplicateMode
+from app.services.rescore import rescore_questions
+from app.services.user_cache import AuthUser
 
 router = APIRouter()
 
-@router.post("/import", status_code=201)
-def import_questions(
+# Edits that change the content hash, and the ones students see on the paper
+HASHED_FIELDS = {"title", "q_type", "options", "correct_answers"}
+PAPER_FIELDS = {"title", "q_type", "options", "max_score"}
+
+@router.post("/import", response_model=ImportJobPublic, status_code=202)
+async def import_questions(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_admin) # Only Admins
+    exam_id: Optional[uuid.UUID] = None,
+    on_duplicate: DuplicateMode = "skip",
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_admin) # Only Admins
 ):
+    """
+    Queues the sheet for a background import and returns the job at once.
+    Poll GET /import/{job_id} for rows processed, failed and throughput.
+    With `exam_id`, every imported question is also added to that exam.
+    Rows matching an existing question (same content hash) are skipped, or
+    with on_duplicate=update replace its description, complexity, score and tags.
+    """
     if not file.filename.endswith('.xlsx'):
         raise HTTPException(status_code=400, detail="Only .xlsx files are allowed")
-    
-    questions, errors = parse_excel_questions(file)
-    
-    if questions:
-        session.add_all(questions)
-        session.commit()
-    
-    return {
-        "message": "Import processed",
-        "imported_count": len(questions),
-        "errors": errors
-    }
+    if exam_id and not await session.get(Exam, exam_id):
+        raise HTTPException(status_code=404, detail="Exam not found")
+
+    path = await asyncio.to_thread(spool_upload, file, settings.IMPORT_SPOOL_DIR)
+    job = ImportJob(
+        created_by=current_user.id, filename=file.filename, spool_path=path,
+        exam_id=exam_id, on_duplicate=on_duplicate
+    )
+    session.add(job)
+    try:
+        await session.commit()
+    except Exception:
+        os.remove(path)
+        raise
+
+    import_runner.notify()
+    return job
+
+@router.get("/import/{job_id}", response_model=ImportJobPublic)
+async def get_import_job(
+    job_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_admin)
+):
+    job = await session.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
 @router.get("/", response_model=List[QuestionPublic])
-def list_questions(
-    skip: int = 0, 
-    limit: int = 100, 
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_admin)
+async def list_questions(
+    after_id: Optional[uuid.UUID] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    q_type: Optional[QuestionType] = Query(default=None, alias="type"),
+    complexity: Optional[str] = None,
+    tags: List[str] = Query(default=[]),
+    search: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_admin)
+):
+    """
+    One page of the question bank in id order; every filter is indexed.
+    `tags` (repeatable) matches questions carrying all of them, `search` is a
+    full-text query over title and description ("quoted phrases", -exclusions).
+    Next page: pass `after_id` = `id` of the last item.
+    """
+    statement = select(Question).order_by(Question.id).limit(limit)
+    if after_id:
+        statement = statement.where(Question.id > after_id)
+    if q_type:
+        statement = statement.where(Question.q_type == q_type)
+    if complexity:
+        statement = statement.where(Question.complexity == complexity)
+    wanted = normalize_tags(tags)
+    if wanted:
+        statement = statement.where(Question.tags.contains(wanted))
+    if search and search.strip():
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+        statement = statement.where(Question.search_vector.op("@@")(query))
+    return (await session.exec(statement)).all()
+
+
+@router.patch("/{question_id}", response_model=QuestionPublic)
+async def update_question(
+    question_id: uuid.UUID,
+    question_update: QuestionUpdate,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_admin)
+):
+    """
+    Edits a question. A new title, type, options or answer key moves its
+    content hash: 409 when another question already has that content.
+    Exams using it get a new paper version, and their max score follows a
+    new max_score. Stored answer scores are left alone; after an answer
+    key correction, POST /rescore with the question's id.
+    """
+    question = await session.get(Question, question_id, with_for_update=True)
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    changes = question_update.model_dump(exclude_unset=True)
+    for key, value in changes.items():
+        setattr(question, key, value)
+
+    if question.content_hash is not None and changes.keys() & HASHED_FIELDS:
+        content_hash = question_content_hash(question.title, question.q_type, question.options, question.correct_answers)
+        taken = (await session.exec(
+            select(Question.id).where(Question.content_hash == content_hash, Question.id != question_id)
+        )).first()
+        if taken:
+            raise HTTPException(status_code=409, detail=f"Question {taken} has the same content")
+        question.content_hash = content_hash
+        session.add(question)
+        try:
+            # A concurrent edit to the same content passes the check too; the unique index decides
+            await session.flush()
+        except IntegrityError:
+            await session.rollback()
+            taken = (await session.exec(select(Question.id).where(Question.content_hash == content_hash))).first()
+            raise HTTPException(status_code=409, detail=f"Question {taken} has the same content")
+
+    if changes.keys() & PAPER_FIELDS:
+        exam_ids = (await session.exec(
+            select(ExamQuestionLink.exam_id).where(ExamQuestionLink.question_id == question_id)
+        )).all()
+        if exam_ids:
+            await session.flush()  # refresh_exam_totals reads the new max_score
+            await session.exec(
+                update(Exam).where(Exam.id.in_(exam_ids)).values(content_version=Exam.content_version + 1)
+            )
+            await session.run_sync(refresh_exam_totals, exam_ids)
+
+    session.add(question)
+    await session.commit()
+    await session.refresh(question)
+    return question
+
+
+async def stream_rescore(question_ids: List[uuid.UUID], session_factory=new_async_session):
+    async for progress in rescore_questions(session_factory, question_ids, settings.RESCORE_BATCH_SIZE):
+        yield progress.model_dump_json() + "\n"
+
+
+@router.post("/rescore")
+async def rescore(
+    payload: RescoreRequest,
+    current_user: AuthUser = Depends(get_current_admin)
 ):
-    statement = select(Question).offset(skip).limit(limit)
-    return session.exec(statement).all()
\ No newline at end of file
+    """
+    Regrades the submitted answers to the given questions against their
+    current answer keys and moves attempt totals by the change, in
+    committed batches. Streams NDJSON progress, one line per batch; the
+    last line (done: true) has the totals. Running it again is harmless.
+    """
+    return StreamingResponse(stream_rescore(payload.question_ids), media_type="application/x-ndjson")
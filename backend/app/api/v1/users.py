@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
+from app.api.deps import get_current_admin
+from app.models.user import User, UserRole
+from app.schemas.auth_schema import StudentImportResult
+from app.services.excel_service import parse_student_rows
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import AuthUser
+
+router = APIRouter()
+
+# 6 bound parameters per row; Postgres allows 65535 per statement
+USER_INSERT_CHUNK_SIZE = 5000
+
+
+@router.post("/import", response_model=StudentImportResult, status_code=201)
+async def import_students(
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_admin) # Only Admins
+):
+    """
+    Creates student accounts from a .csv or .xlsx file with the columns
+    email, password and full_name. Rows that fail validation or whose email
+    is already registered are reported in `errors`; the rest are imported.
+    """
+    if not file.filename.lower().endswith((".xlsx", ".csv")):
+        raise HTTPException(status_code=400, detail="Only .xlsx and .csv files are allowed")
+
+    rows, errors = await asyncio.to_thread(parse_student_rows, file)
+
+    # One query for every email of the file
+    existing = set((await session.exec(
+        select(User.email).where(User.email.in_([student.email for _, student in rows]))
+    )).all()) if rows else set()
+
+    new_rows = []
+    for row_number, student in rows:
+        if student.email in existing:
+            errors.append(f"Row {row_number}: email {student.email} is already registered")
+        else:
+            new_rows.append((row_number, student))
+
+    hashes = await password_hasher.hash_many([student.password for _, student in new_rows])
+    values = [
+        {
+            "id": uuid.uuid4(),
+            "email": student.email,
+            "hashed_password": hashed,
+            "full_name": student.full_name,
+            "role": UserRole.STUDENT,
+            "is_active": True,
+        }
+        for (_, student), hashed in zip(new_rows, hashes)
+    ]
+
+    inserted = set()
+    for start in range(0, len(values), USER_INSERT_CHUNK_SIZE):
+        stmt = (
+            insert(User)
+            .values(values[start:start + USER_INSERT_CHUNK_SIZE])
+            # Accounts created since the lookup above are skipped, not overwritten
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email)
+        )
+        inserted.update((await session.exec(stmt)).scalars().all())
+    await session.commit()
+
+    for row_number, student in new_rows:
+        if student.email not in inserted:
+            errors.append(f"Row {row_number}: email {student.email} is already registered")
+
+    return StudentImportResult(
+        message="Import processed",
+        imported_count=len(inserted),
+        errors=errors
+    )
@@ -1,5 +1,7 @@
+import os
+import tempfile
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Online Exam System"
@@ -10,6 +12,15 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str
+
+    # Connection pool, per worker process (size + overflow connections at most)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0  # seconds a request waits for a free connection
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side timeout
+    DB_ECHO: Literal["off", "info", "debug"] = "off"  # SQL logging, keep off in production
     
     # Computed Database URL
     @property
@@ -20,4 +31,57 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Authorization fields (id, role, is_active) cached per worker to skip the User query
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60  # 0 disables the cache
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Sign role and active state into new tokens and trust them without a lookup.
+    # A role change or deactivation then only takes effect when the token expires.
+    AUTH_TOKEN_CLAIMS: bool = False
+
+    # Password hashing (bcrypt) runs in a process pool, away from the event loop
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # changing it rehashes each password on its next login
+    PASSWORD_HASH_WORKERS: int = 2  # processes per worker; 0 hashes in a thread instead
+    PASSWORD_HASH_CONCURRENCY: int = 16  # hashes queued or running per worker
+    PASSWORD_HASH_WAIT_SECONDS: float = 10.0  # beyond this wait for a slot, answer 503
+    PASSWORD_BULK_HASH_WORKERS: int = 0  # processes for bulk imports; 0 uses every core
+
+    # Autosave write-behind: answers are buffered in memory and flushed in groups.
+    # Off by default, every save then commits synchronously. The in-memory buffer
+    # refuses to start with more than one worker process: a submit served by
+    # another process would grade without this one's buffered answers.
+    AUTOSAVE_WRITE_BEHIND: bool = False
+    WEB_CONCURRENCY: int = 1  # worker processes serving the app; uvicorn and gunicorn read it too
+    AUTOSAVE_FLUSH_INTERVAL_MS: int = 1000
+    AUTOSAVE_MAX_BUFFER_BYTES: int = 16 * 1024 * 1024  # saves flush inline above this
+    AUTOSAVE_FLUSH_ON_SHUTDOWN: bool = True
+
+    # Compiled exam papers served by start/resume (per worker, LRU)
+    PAPER_CACHE_MAX_ENTRIES: int = 256
+    PAPER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Background question imports: uploads are spooled here and parsed by workers.
+    # With several servers the directory must be shared between them.
+    IMPORT_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "exam-imports")
+    IMPORT_WORKERS: int = 1  # jobs run at once per worker process; 0 leaves them to other processes
+    IMPORT_BATCH_SIZE: int = 1000  # rows per committed batch
+    IMPORT_POLL_INTERVAL_SECONDS: float = 2.0
+    IMPORT_STALE_SECONDS: int = 120  # a running job without a heartbeat for this long is resumed
+    IMPORT_MAX_ERRORS: int = 1000  # row errors kept per job
+
+    # Deadline sweeper: submits and grades attempts whose time is up, in batches.
+    # Every worker runs one; an advisory lock lets one of them sweep at a time.
+    DEADLINE_SWEEP_ENABLED: bool = True
+    DEADLINE_SWEEP_INTERVAL_SECONDS: float = 5.0
+    DEADLINE_SWEEP_BATCH_SIZE: int = 200  # attempts per committed batch
+    DEADLINE_GRACE_SECONDS: int = 30  # left to in-flight submits and autosave flushes
+
+    # Rescore after an answer key correction: answers per committed batch
+    RESCORE_BATCH_SIZE: int = 5000
+
+    # Exam analytics: submits and regrades flag an exam's cached report stale,
+    # the refresher recomputes flagged exams at most once per interval
+    ANALYTICS_REFRESH_ENABLED: bool = True
+    ANALYTICS_REFRESH_INTERVAL_SECONDS: float = 15.0
+    ANALYTICS_HISTOGRAM_BINS: int = 10
+
 settings = Settings()
\ No newline at end of file
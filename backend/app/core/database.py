@@ -1,10 +1,94 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, create_engine, Session
-from app.core.config import settings
-from typing import Generator
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import Settings, settings
+from typing import AsyncGenerator, Generator
 
-# "postgresql://" is the standard prefix. 
-# Ensure settings.DATABASE_URL matches this format in config.py
-engine = create_engine(settings.DATABASE_URL, echo=True)
+
+class PoolInstrumentation:
+    """Pool mixin that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_ms_avg": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(PoolInstrumentation, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(PoolInstrumentation, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(config: Settings) -> dict:
+    """Keyword arguments shared by the sync and the async engine."""
+    connect_args = {}
+    if config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+
+    return {
+        "echo": {"off": False, "info": True, "debug": "debug"}[config.DB_ECHO],
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "connect_args": connect_args,
+    }
+
+
+def build_engine(config: Settings):
+    """Creates the application engine from the DB_* settings."""
+    return create_engine(config.DATABASE_URL, poolclass=InstrumentedQueuePool, **engine_options(config))
+
+
+def build_async_engine(config: Settings):
+    """
+    Async engine for the request path. The psycopg dialect serves both
+    engines from the same postgresql+psycopg URL.
+    """
+    return create_async_engine(config.DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **engine_options(config))
+
+
+engine = build_engine(settings)
+async_engine = build_async_engine(settings)
 
 def create_db_and_tables():
     """Creates tables in the database based on the models."""
@@ -13,4 +97,24 @@ def create_db_and_tables():
 def get_session() -> Generator[Session, None, None]:
     """Dependency to provide a database session to API endpoints."""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_session, used by the async routers."""
+    async with new_async_session() as session:
+        yield session
+
+def new_session() -> Session:
+    """Session for code running outside a request (background tasks)."""
+    return Session(engine)
+
+def new_async_session() -> AsyncSession:
+    """
+    Objects stay loaded after commit: an expired attribute would
+    need a lazy load, which async sessions cannot do implicitly.
+    """
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+def pool_stats() -> dict:
+    """Checkout and wait counters of this worker's connection pools."""
+    return {"sync": engine.pool.stats(), "async": async_engine.sync_engine.pool.stats()}
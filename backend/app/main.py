@@ -1,17 +1,50 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from app.core.config import settings
-from app.core.database import create_db_and_tables
+from app.core.database import async_engine, create_db_and_tables, new_async_session, new_session
+from app.services.autosave_buffer import autosave_buffer, check_write_behind, run_flush_loop
+from app.services.deadline_sweeper import deadline_sweeper
+from app.services.exam_analytics import analytics_refresher
+from app.services.import_jobs import import_runner
+from app.services.password_hasher import password_hasher
 
 # Import Routers
-from app.api.v1 import auth, questions, exams, attempts
+from app.api.v1 import auth, users, questions, exams, attempts, metrics
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+
+    flush_task = None
+    if settings.AUTOSAVE_WRITE_BEHIND:
+        check_write_behind(autosave_buffer, settings.WEB_CONCURRENCY)
+        flush_task = asyncio.create_task(
+            run_flush_loop(autosave_buffer, new_session, settings.AUTOSAVE_FLUSH_INTERVAL_MS)
+        )
+    # Also resumes jobs left unfinished by a previous run
+    import_runner.start(new_session)
+    if settings.DEADLINE_SWEEP_ENABLED:
+        deadline_sweeper.start(new_async_session)
+    if settings.ANALYTICS_REFRESH_ENABLED:
+        analytics_refresher.start(new_session)
+
     yield
 
+    if flush_task:
+        flush_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await flush_task
+        if settings.AUTOSAVE_FLUSH_ON_SHUTDOWN:
+            autosave_buffer.flush(new_session)
+
+    await deadline_sweeper.stop()
+    await analytics_refresher.stop()
+    await import_runner.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # specific origins (good for security)
@@ -30,9 +63,11 @@ app.add_middleware(
 
 # Register Routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
+app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(questions.router, prefix="/api/v1/questions", tags=["Questions"]) 
 app.include_router(exams.router, prefix="/api/v1/exams", tags=["Exams"])
 app.include_router(attempts.router, prefix="/api/v1/attempts", tags=["Attempts"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["Metrics"])
 
 @app.get("/")
 def read_root():
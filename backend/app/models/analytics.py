@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+from sqlalchemy import JSON, Column, Index, text
+
+class ExamAnalytics(SQLModel, table=True):
+    """
+    Item analysis of one exam as last computed (services/exam_analytics.py).
+    Submits and regrades flag it stale; the refresher recomputes flagged
+    exams in the background, so reads never wait for the computation.
+    """
+    __table_args__ = (
+        # Refresher claims: WHERE stale_since IS NOT NULL ORDER BY stale_since
+        Index("ix_examanalytics_stale_since", "stale_since", postgresql_where=text("stale_since IS NOT NULL")),
+    )
+
+    exam_id: uuid.UUID = Field(foreign_key="exam.id", primary_key=True)
+    # When results first changed after the last refresh started; NULL while current
+    stale_since: Optional[datetime] = None
+    computed_at: Optional[datetime] = None  # database time of the snapshot the report was read from
+    compute_ms: float = 0.0
+    report: Optional[dict] = Field(default=None, sa_column=Column(JSON))  # schemas/analytics_schema.ExamAnalyticsReport
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional, Any
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index, UniqueConstraint, text
 from enum import Enum
 from app.models.user import User
 from app.models.exam import Exam
@@ -13,6 +13,13 @@ class AttemptStatus(str, Enum):
     SUBMITTED = "submitted"
 
 class StudentAnswer(SQLModel, table=True):
+    # One row per (attempt, question); autosave upserts against this constraint
+    __table_args__ = (
+        UniqueConstraint("attempt_id", "question_id", name="uq_studentanswer_attempt_question"),
+        # Grader work queue: WHERE question_id = ? AND NOT is_graded ORDER BY id
+        Index("ix_studentanswer_question_graded", "question_id", "is_graded", "id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     attempt_id: uuid.UUID = Field(foreign_key="studentexamattempt.id")
     question_id: uuid.UUID = Field(foreign_key="question.id")
@@ -28,12 +35,26 @@ class StudentAnswer(SQLModel, table=True):
     is_graded: bool = Field(default=False) # For manual grading tracking
 
 class StudentExamAttempt(SQLModel, table=True):
+    __table_args__ = (
+        # One attempt per student and exam; also serves (student_id, exam_id) lookups
+        UniqueConstraint("student_id", "exam_id", name="uq_studentexamattempt_student_exam"),
+        # Results ranking and keyset pages: WHERE exam_id = ? ORDER BY total_score DESC, id DESC
+        Index("ix_studentexamattempt_exam_score", "exam_id", "total_score", "id"),
+        # Student history: WHERE student_id = ? ORDER BY start_time DESC, id DESC
+        Index("ix_studentexamattempt_student_start", "student_id", "start_time", "id"),
+        # Deadline sweeper: open attempts only, oldest deadline first
+        Index("ix_studentexamattempt_open_deadline", "deadline_at", postgresql_where=text("status = 'IN_PROGRESS'")),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     student_id: uuid.UUID = Field(foreign_key="user.id")
     exam_id: uuid.UUID = Field(foreign_key="exam.id")
     
     start_time: datetime = Field(default_factory=datetime.now)
     submit_time: Optional[datetime] = None
+    # start_time + duration, capped at the exam's end_time; the sweeper submits
+    # open attempts past it. NULL never expires.
+    deadline_at: Optional[datetime] = None
     status: AttemptStatus = Field(default=AttemptStatus.IN_PROGRESS)
     
     total_score: float = 0.0
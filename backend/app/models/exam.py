@@ -1,13 +1,20 @@
 import uuid
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from app.models.question import Question
 
 # Join Table for Many-to-Many relationship
 class ExamQuestionLink(SQLModel, table=True):
+    __table_args__ = (
+        # Papers are read in order: WHERE exam_id = ? ORDER BY position
+        Index("ix_examquestionlink_exam_position", "exam_id", "position"),
+    )
+
     exam_id: uuid.UUID = Field(foreign_key="exam.id", primary_key=True)
     question_id: uuid.UUID = Field(foreign_key="question.id", primary_key=True)
+    position: Optional[int] = None  # order on the paper, from 1; NULL sorts last
 
 class Exam(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
@@ -20,6 +27,16 @@ class Exam(SQLModel, table=True):
     duration_minutes: int # How long the student has once they start
     
     is_published: bool = Field(default=False)
+
+    # Bumped whenever the paper changes; compiled paper caches key on it
+    content_version: int = Field(default=1)
+
+    # Denormalized from the linked questions (see services/exam_totals.py)
+    question_count: int = Field(default=0)
+    max_possible_score: float = Field(default=0.0)
     
     # Relationships
-    questions: List[Question] = Relationship(link_model=ExamQuestionLink)
\ No newline at end of file
+    questions: List[Question] = Relationship(
+        link_model=ExamQuestionLink,
+        sa_relationship_kwargs={"order_by": "ExamQuestionLink.position"},
+    )
\ No newline at end of file
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from sqlmodel import Field, SQLModel
+from sqlalchemy import JSON, Column, Index
+from enum import Enum
+
+class ImportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ImportJob(SQLModel, table=True):
+    """
+    One background question import. Rows are written in committed batches;
+    rows_processed moves in the same transaction, so a job picked up again
+    after a crash resumes right after the last committed batch.
+    """
+    __table_args__ = (
+        # Workers claim: WHERE status IN (...) ORDER BY created_at
+        Index("ix_importjob_status_created", "status", "created_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    created_by: uuid.UUID = Field(foreign_key="user.id")
+    filename: str
+    spool_path: str  # uploaded file on disk, removed when the job ends
+    exam_id: Optional[uuid.UUID] = Field(default=None, foreign_key="exam.id")  # imported questions are linked to it
+    on_duplicate: str = Field(default="skip")  # question_writer.DuplicateMode: "skip" or "update"
+
+    status: ImportJobStatus = Field(default=ImportJobStatus.QUEUED)
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Set at every batch; a running job whose heartbeat is too old is claimed again
+    heartbeat_at: Optional[datetime] = None
+
+    # Progress, in data rows of the sheet
+    rows_processed: int = 0
+    rows_imported: int = 0
+    rows_skipped: int = 0  # duplicates of existing questions or of earlier rows
+    rows_updated: int = 0
+    rows_failed: int = 0
+    rows_per_second: float = 0.0  # of the current run
+
+    errors: List[str] = Field(default_factory=list, sa_column=Column(JSON))  # first IMPORT_MAX_ERRORS row errors
+    failure: Optional[str] = None  # why the whole job failed
@@ -1,7 +1,8 @@
 import uuid
 from typing import List, Optional, Any
 from sqlmodel import Field, SQLModel
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Computed, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from enum import Enum
 
 class QuestionType(str, Enum):
@@ -10,7 +11,19 @@ class QuestionType(str, Enum):
     TEXT = "text"
     IMAGE_UPLOAD = "image_upload"
 
+# Title and description as searched by GET /questions?search=
+SEARCH_CONFIG = "english"
+SEARCH_DOCUMENT = f"to_tsvector('{SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
 class Question(SQLModel, table=True):
+    # Question bank listing: keyset by id within a type or complexity, tag and text search
+    __table_args__ = (
+        Index("ix_question_q_type_id", "q_type", "id"),
+        Index("ix_question_complexity_id", "complexity", "id"),
+        Index("ix_question_tags", "tags", postgresql_using="gin"),
+        Index("ix_question_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     title: str
     description: Optional[str] = None
@@ -24,4 +37,14 @@ class Question(SQLModel, table=True):
     correct_answers: Optional[List[Any]] = Field(default=None, sa_column=Column(JSON))
     
     max_score: float = Field(default=1.0)
-    tags: Optional[str] = None  # CSV string of tags
\ No newline at end of file
+    # Lowercased, deduplicated; the schema also accepts the sheet's CSV string
+    tags: Optional[List[str]] = Field(default=None, sa_column=Column(ARRAY(String)))
+
+    # services/question_hash.py; set by the importer, which skips or updates duplicates.
+    # NULL for questions created another way and for duplicates that predate the column.
+    content_hash: Optional[str] = Field(default=None, max_length=64, unique=True, index=True)
+
+    # Generated by Postgres, never written
+    search_vector: Optional[str] = Field(
+        default=None, sa_column=Column(TSVECTOR, Computed(SEARCH_DOCUMENT, persisted=True))
+    )
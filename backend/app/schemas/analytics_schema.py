@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+import uuid
+
+# How often one choice was picked, out of all submitted attempts
+class OptionStats(BaseModel):
+    value: str  # normalized as the grader compares it (trimmed, lowercased)
+    count: int
+    share: float
+    is_key: bool  # one of the correct answers; the others are distractors
+
+class QuestionStats(BaseModel):
+    question_id: uuid.UUID
+    title: str
+    type: str
+    max_score: float
+    answered: int  # attempts with a non-empty answer
+    mean_score: float
+    difficulty: Optional[float] = None  # mean score / max score: share correct for choice questions
+    discrimination: Optional[float] = None  # upper 27% minus lower 27% by total, as a share of max score
+    point_biserial: Optional[float] = None  # correlation with the rest of the total; None without variance
+    options: List[OptionStats] = []
+
+class ScoreHistogram(BaseModel):
+    edges: List[float]  # len(counts) + 1 bin edges over [0, max possible score]
+    counts: List[int]
+
+class ExamAnalyticsReport(BaseModel):
+    attempt_count: int  # submitted attempts
+    max_possible_score: float
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, float] = {}  # "p10" ... "p90"
+    histogram: Optional[ScoreHistogram] = None
+    questions: List[QuestionStats] = []
+
+class ExamAnalyticsPublic(ExamAnalyticsReport):
+    exam_id: uuid.UUID
+    computed_at: datetime
+    stale: bool  # results changed since; a refresh is pending
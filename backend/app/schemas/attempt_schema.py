@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Any
 from datetime import datetime
 import uuid
@@ -10,6 +10,19 @@ class AnswerSave(BaseModel):
     selected_options: Optional[List[Any]] = None
     text_answer: Optional[str] = None
 
+# Payload for batched "Auto-save" (all changed answers in one request)
+class AnswerBulkSave(BaseModel):
+    answers: List[AnswerSave] = Field(min_length=1, max_length=500)
+
+class AnswerSaveResult(BaseModel):
+    question_id: uuid.UUID
+    saved: bool
+    detail: Optional[str] = None
+
+class BulkSaveResult(BaseModel):
+    saved_count: int
+    results: List[AnswerSaveResult]
+
 # Response for "Start Exam" (Includes questions but HIDES correct answers)
 class ExamPaperQuestion(BaseModel):
     id: uuid.UUID
@@ -18,16 +31,19 @@ class ExamPaperQuestion(BaseModel):
     options: Optional[List[Any]] = None
     max_score: float
 
-class AttemptState(BaseModel):
+# Per-student part of "Start Exam"; the paper itself is shared and cached
+class AttemptSession(BaseModel):
     attempt_id: uuid.UUID
     exam_title: str
     start_time: datetime
     duration_minutes: int
     remaining_seconds: float
-    questions: List[ExamPaperQuestion]
     # For resume: return previously saved answers
     saved_answers: Optional[List[dict]] = None 
 
+class AttemptState(AttemptSession):
+    questions: List[ExamPaperQuestion]
+
 class AttemptPublic(BaseModel):
     id: uuid.UUID
     exam_title: str
@@ -37,6 +53,12 @@ class AttemptPublic(BaseModel):
     total_score: float
     max_possible_score: float = 0.0 # We will compute this
 
+# Admin view of one result; student details come from the same query
+class ExamResultRow(AttemptPublic):
+    student_id: uuid.UUID
+    student_name: Optional[str] = None
+    student_email: str
+
 
 class AttemptResult(BaseModel):
     attempt_id: uuid.UUID
@@ -70,4 +92,35 @@ class AttemptReview(BaseModel):
 
 
 class GradeUpdate(BaseModel):
-    score: float
\ No newline at end of file
+    score: float = Field(ge=0)
+
+
+# Bulk manual grading: many answers of any attempts in one transaction
+class AnswerGrade(BaseModel):
+    attempt_id: uuid.UUID
+    question_id: uuid.UUID
+    score: float = Field(ge=0)
+
+class GradeBulk(BaseModel):
+    grades: List[AnswerGrade] = Field(min_length=1, max_length=5000)
+
+class GradeRejection(BaseModel):
+    attempt_id: uuid.UUID
+    question_id: uuid.UUID
+    detail: str
+
+class AttemptTotal(BaseModel):
+    attempt_id: uuid.UUID
+    total_score: float
+
+class BulkGradeResult(BaseModel):
+    graded_count: int
+    totals: List[AttemptTotal]  # new total of every attempt that was graded
+    rejected: List[GradeRejection]
+
+# Grader work queue: ungraded answers to one question, across attempts
+class UngradedAnswer(BaseModel):
+    id: uuid.UUID
+    attempt_id: uuid.UUID
+    selected_options: Optional[List[Any]] = None
+    text_answer: Optional[str] = None
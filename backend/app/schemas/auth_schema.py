@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from app.models.user import UserRole
 import uuid
 
@@ -9,6 +9,18 @@ class UserCreate(BaseModel):
     full_name: str | None = None
     role: UserRole = UserRole.STUDENT # Default to Student
 
+# One row of an admin bulk import (CSV/XLSX); always a student account
+class StudentImportRow(BaseModel):
+    email: EmailStr
+    password: str = Field(min_length=1)
+    full_name: str | None = None
+
+# Result of a bulk import, one error line per rejected row
+class StudentImportResult(BaseModel):
+    message: str
+    imported_count: int
+    errors: list[str]
+
 # What the user sends to Login
 class UserLogin(BaseModel):
     email: EmailStr
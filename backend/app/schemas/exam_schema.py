@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import List, Optional
 import uuid
@@ -20,7 +20,16 @@ class ExamCreate(BaseModel):
 
 # Input for adding questions to an exam
 class ExamQuestionAdd(BaseModel):
-    question_ids: List[uuid.UUID]
+    question_ids: List[uuid.UUID] = Field(default_factory=list, max_length=10_000)
+    remove_ids: List[uuid.UUID] = Field(default_factory=list, max_length=10_000)
+    # The paper becomes exactly question_ids, in that order (remove_ids is not needed)
+    replace: bool = False
+
+class ExamQuestionsResult(BaseModel):
+    message: str
+    added_count: int
+    removed_count: int
+    missing_ids: List[uuid.UUID]  # ids without a question, ignored
 
 class ExamUpdate(BaseModel):
     is_published: Optional[bool] = None
@@ -35,7 +44,8 @@ class ExamPublic(BaseModel):
     end_time: datetime
     duration_minutes: int
     is_published: bool
-    question_count: int = 0 # Computed field
+    question_count: int = 0
+    max_possible_score: float = 0.0
     
     attempt_status: Optional[str] = "not_attempted" # 'not_attempted', 'in_progress', 'submitted'
     attempt_id: Optional[uuid.UUID] = None
\ No newline at end of file
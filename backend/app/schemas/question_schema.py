@@ -1,9 +1,16 @@
 from pydantic import BaseModel, field_validator, Field, ConfigDict
 from typing import List, Optional, Any, Union
+from datetime import datetime
+from app.models.import_job import ImportJobStatus
 from app.models.question import QuestionType
 import uuid
 import json
 
+def normalize_tags(tags: List[Any]) -> Optional[List[str]]:
+    """Trimmed, lowercased and deduplicated in first-seen order; None when empty."""
+    seen = dict.fromkeys(t for t in (str(tag).strip().lower() for tag in tags) if t)
+    return list(seen) or None
+
 class QuestionBase(BaseModel):
     model_config = ConfigDict(populate_by_name=True) 
     # ---------------------
@@ -18,7 +25,7 @@ class QuestionBase(BaseModel):
     options: Optional[Union[List[Any], str]] = None
     correct_answers: Optional[Union[List[Any], str]] = None
     max_score: float = 1.0
-    tags: Optional[str] = None
+    tags: Optional[List[str]] = None
 
     @field_validator('options', 'correct_answers', mode='before')
     @classmethod
@@ -30,8 +37,67 @@ class QuestionBase(BaseModel):
                 return [] if not v else [v]
         return v
 
+    @field_validator('tags', mode='before')
+    @classmethod
+    def parse_tags(cls, v):
+        # Sheets carry "math, Basic"; stored as ["math", "basic"]
+        if v is None:
+            return None
+        if not isinstance(v, list):
+            v = str(v).split(',')
+        return normalize_tags(v)
+
 class QuestionCreate(QuestionBase):
     pass
 
+# Partial edit (PATCH /questions/{id}); only the fields sent change
+class QuestionUpdate(QuestionBase):
+    title: Optional[str] = None
+    complexity: Optional[str] = None
+    q_type: Optional[QuestionType] = Field(default=None, alias="type")
+    max_score: Optional[float] = None
+
+    @field_validator('title', 'complexity', 'q_type', 'max_score', mode='before')
+    @classmethod
+    def reject_null(cls, v):
+        # Optional so they can be left out; the columns are NOT NULL
+        if v is None:
+            raise ValueError("may be omitted but not null")
+        return v
+
 class QuestionPublic(QuestionBase):
-    id: uuid.UUID
\ No newline at end of file
+    id: uuid.UUID
+
+# Progress of a background import (POST /questions/import)
+class ImportJobPublic(BaseModel):
+    id: uuid.UUID
+    filename: str
+    exam_id: Optional[uuid.UUID] = None
+    on_duplicate: str
+    status: ImportJobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows_processed: int
+    rows_imported: int
+    rows_skipped: int
+    rows_updated: int
+    rows_failed: int
+    rows_per_second: float
+    errors: List[str]
+    failure: Optional[str] = None
+
+# Answer key corrections (POST /questions/rescore)
+class RescoreRequest(BaseModel):
+    question_ids: List[uuid.UUID] = Field(min_length=1, max_length=100)
+
+# Streamed after every committed batch; the last line has done set
+class RescoreProgress(BaseModel):
+    question_ids: List[uuid.UUID]
+    skipped_ids: List[uuid.UUID]  # unknown questions and text/image ones, which are graded by hand
+    answers_checked: int = 0
+    answers_changed: int = 0
+    attempts_changed: int = 0  # total_score updates; an attempt may count once per batch
+    batches: int = 0
+    answers_per_second: float = 0.0
+    done: bool = False
@@ -0,0 +1,63 @@
+import uuid
+from typing import Dict, Iterable, List
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+from app.models.attempt import StudentAnswer
+from app.schemas.attempt_schema import AnswerSave
+
+# 8 bound parameters per row; Postgres allows 65535 per statement
+UPSERT_CHUNK_SIZE = 5000
+
+
+def dedupe_answers(answers: Iterable[AnswerSave]) -> List[AnswerSave]:
+    """
+    Collapses repeated question ids to the last answer sent.
+    Postgres rejects an ON CONFLICT batch that touches the same row twice.
+    """
+    latest: Dict[uuid.UUID, AnswerSave] = {}
+    for answer in answers:
+        latest[answer.question_id] = answer
+    return list(latest.values())
+
+
+def answer_row(attempt_id: uuid.UUID, answer: AnswerSave) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "attempt_id": attempt_id,
+        "question_id": answer.question_id,
+        "selected_options": answer.selected_options,
+        "text_answer": answer.text_answer,
+        "score_awarded": 0.0,
+        "is_correct": False,
+        "is_graded": False,
+    }
+
+
+def upsert_answer_rows(session: Session, rows: List[dict]) -> int:
+    """
+    Writes answer rows (possibly of many attempts) with
+    INSERT ... ON CONFLICT (attempt_id, question_id) DO UPDATE.
+    Rows must be unique per (attempt_id, question_id).
+    Does not commit; the caller owns the transaction.
+    """
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(StudentAnswer).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StudentAnswer.attempt_id, StudentAnswer.question_id],
+            set_={
+                "selected_options": stmt.excluded.selected_options,
+                "text_answer": stmt.excluded.text_answer,
+            },
+        )
+        session.exec(stmt)
+    return len(rows)
+
+
+def upsert_answers(session: Session, attempt_id: uuid.UUID, answers: Iterable[AnswerSave]) -> int:
+    """
+    Writes many answers of one attempt with a single upsert statement.
+    Does not commit; the caller owns the transaction.
+    Returns the number of rows written.
+    """
+    rows = [answer_row(attempt_id, answer) for answer in dedupe_answers(answers)]
+    return upsert_answer_rows(session, rows)
@@ -0,0 +1,83 @@
+import uuid
+from typing import Dict, Sequence
+import numpy as np
+from sqlalchemy import Boolean, Float, Uuid, any_, func, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.attempt import StudentAnswer, StudentExamAttempt
+from app.models.exam import ExamQuestionLink
+from app.models.question import Question
+from app.services.grading_service import compile_answer_key, grade_batch
+
+
+def unnest_rows(*columns):
+    """
+    (name, type, values) columns as a derived table for UPDATE ... FROM:
+    unnest of one array parameter per column, so any number of rows stays
+    within the bind parameter limit that a VALUES list runs into.
+    """
+    arrays = [literal(data, ARRAY(type_)) for _, type_, data in columns]
+    return func.unnest(*arrays).table_valued(*(name for name, _, _ in columns)).render_derived()
+
+
+def _answers_statement(attempt_ids: Sequence[uuid.UUID]):
+    # Every answer of the attempts with its question's key, in one round trip.
+    # Answers to questions since removed from the exam do not count.
+    return (
+        select(
+            StudentAnswer.id, StudentAnswer.attempt_id, StudentAnswer.selected_options,
+            Question.id.label("question_id"), Question.q_type, Question.correct_answers, Question.max_score,
+        )
+        .join(StudentExamAttempt, StudentExamAttempt.id == StudentAnswer.attempt_id)
+        .join(ExamQuestionLink, (ExamQuestionLink.exam_id == StudentExamAttempt.exam_id)
+              & (ExamQuestionLink.question_id == StudentAnswer.question_id))
+        .join(Question, Question.id == StudentAnswer.question_id)
+        .where(StudentAnswer.attempt_id == any_(literal(list(attempt_ids), ARRAY(Uuid))))
+    )
+
+
+async def grade_attempts(session: AsyncSession, attempt_ids: Sequence[uuid.UUID]) -> Dict[uuid.UUID, float]:
+    """
+    Auto-grades attempts the caller has already claimed (status set to
+    submitted in this transaction) and stores answer scores and totals:
+    one query to load, grade_batch, one UPDATE ... FROM unnest(...) each
+    for answers and totals. Returns the total per attempt. Does not commit.
+    """
+    if not attempt_ids:
+        return {}
+    rows = (await session.exec(_answers_statement(attempt_ids))).all()
+
+    totals = dict.fromkeys(attempt_ids, 0.0)
+    if rows:
+        keys = {}
+        for row in rows:
+            if row.question_id not in keys:
+                keys[row.question_id] = compile_answer_key(row)
+        grades = grade_batch(keys, [row.question_id for row in rows], [row.selected_options for row in rows])
+
+        graded = unnest_rows(
+            ("id", Uuid, [row.id for row in rows]),
+            ("score", Float, grades.scores.tolist()),
+            ("correct", Boolean, grades.correct.tolist()),
+            ("graded", Boolean, grades.graded.tolist()),
+        )
+        await session.exec(
+            update(StudentAnswer)
+            .where(StudentAnswer.id == graded.c.id)
+            .values(score_awarded=graded.c.score, is_correct=graded.c.correct, is_graded=graded.c.graded)
+            .execution_options(synchronize_session=False)
+        )
+
+        index = {attempt_id: i for i, attempt_id in enumerate(totals)}
+        sums = np.bincount([index[row.attempt_id] for row in rows], weights=grades.scores, minlength=len(index))
+        totals = dict(zip(totals, sums.tolist()))
+
+    scored = unnest_rows(("id", Uuid, list(totals)), ("total", Float, list(totals.values())))
+    await session.exec(
+        update(StudentExamAttempt)
+        .where(StudentExamAttempt.id == scored.c.id)
+        .values(total_score=scored.c.total)
+        .execution_options(synchronize_session=False)
+    )
+    return totals
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.models.attempt import StudentExamAttempt, AttemptStatus
+from app.schemas.attempt_schema import AnswerSave
+from app.services.answer_service import answer_row, upsert_answer_rows
+
+logger = logging.getLogger(__name__)
+
+BufferKey = Tuple[uuid.UUID, uuid.UUID]  # (attempt_id, question_id)
+
+
+class AnswerBuffer(ABC):
+    """
+    Interface of a write-behind store for autosaved answers.
+    Entries are keyed by (attempt_id, question_id), last write wins.
+    Swap in another implementation (e.g. Redis) to share the buffer between workers.
+    """
+
+    # True when every worker process sees the same entries
+    shared_between_workers: bool = False
+
+    @abstractmethod
+    def put(self, attempt_id: uuid.UUID, answers: Iterable[AnswerSave]) -> bool:
+        """Buffers answers. Returns True when the buffer is over its byte limit."""
+
+    @abstractmethod
+    def flush(self, session_factory: Callable[[], Session]) -> int:
+        """Writes every buffered answer in one transaction. Returns rows written."""
+
+    @abstractmethod
+    def flush_attempt(self, attempt_id: uuid.UUID, session_factory: Callable[[], Session]) -> int:
+        """
+        Writes the buffered answers of one attempt. Returns rows written.
+        Submit calls it before claiming: when it returns, every answer of
+        the attempt buffered so far is committed, including ones a
+        concurrent flush had already taken.
+        """
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Counters for the metrics endpoint."""
+
+
+class InMemoryAnswerBuffer(AnswerBuffer):
+    """
+    Per-process buffer. With several workers each one would hold its own
+    entries and a submit served by another process would grade without
+    them, so check_write_behind refuses that setup.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Held from taking entries until their write commits or they are
+        # restored, so a flush never holds answers another one cannot see
+        self._flush_lock = threading.Lock()
+        # key -> (answer, size in bytes, sequence number of the write)
+        self._entries: Dict[BufferKey, Tuple[AnswerSave, int, int]] = {}
+        self._bytes = 0
+        self._seq = 0
+        self._counters = {
+            "answers_received": 0,
+            "coalesced_writes": 0,
+            "flushes": 0,
+            "rows_flushed": 0,
+            "flush_failures": 0,
+            "dropped_submitted": 0,
+        }
+        self._last_flush_ms = 0.0
+
+    def put(self, attempt_id: uuid.UUID, answers: Iterable[AnswerSave]) -> bool:
+        with self._lock:
+            for answer in answers:
+                key = (attempt_id, answer.question_id)
+                size = len(answer.model_dump_json())
+                self._seq += 1
+                previous = self._entries.get(key)
+                if previous:
+                    self._bytes -= previous[1]
+                    self._counters["coalesced_writes"] += 1
+                self._entries[key] = (answer, size, self._seq)
+                self._bytes += size
+                self._counters["answers_received"] += 1
+            return self._bytes > self.max_bytes
+
+    def _take(self, attempt_id: Optional[uuid.UUID] = None) -> Dict[BufferKey, Tuple[AnswerSave, int, int]]:
+        with self._lock:
+            if attempt_id is None:
+                taken, self._entries = self._entries, {}
+            else:
+                keys = [k for k in self._entries if k[0] == attempt_id]
+                taken = {k: self._entries.pop(k) for k in keys}
+            self._bytes -= sum(entry[1] for entry in taken.values())
+            return taken
+
+    def _restore(self, taken: Dict[BufferKey, Tuple[AnswerSave, int, int]]) -> None:
+        """Puts entries back after a failed flush, unless a newer write arrived meanwhile."""
+        with self._lock:
+            for key, entry in taken.items():
+                current = self._entries.get(key)
+                if current and current[2] > entry[2]:
+                    continue
+                if current:
+                    self._bytes -= current[1]
+                self._entries[key] = entry
+                self._bytes += entry[1]
+
+    def _write(self, taken: Dict[BufferKey, Tuple[AnswerSave, int, int]], session_factory: Callable[[], Session]) -> int:
+        if not taken:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            with session_factory() as session:
+                # Share-lock the attempts still in progress until the answers
+                # commit, in id order like submit. A submit claimed meanwhile
+                # holds the row: the lock waits for it, sees SUBMITTED and the
+                # answers are dropped; a later submit waits and grades them.
+                in_progress = set(session.exec(
+                    select(StudentExamAttempt.id)
+                    .where(
+                        StudentExamAttempt.id.in_({key[0] for key in taken}),
+                        StudentExamAttempt.status == AttemptStatus.IN_PROGRESS
+                    )
+                    .order_by(StudentExamAttempt.id)
+                    .with_for_update(read=True)
+                ).all())
+                rows = [
+                    answer_row(attempt_id, entry[0])
+                    for (attempt_id, _), entry in taken.items()
+                    if attempt_id in in_progress
+                ]
+                upsert_answer_rows(session, rows)
+                session.commit()
+        except Exception:
+            self._restore(taken)
+            with self._lock:
+                self._counters["flush_failures"] += 1
+            raise
+
+        with self._lock:
+            self._counters["flushes"] += 1
+            self._counters["rows_flushed"] += len(rows)
+            self._counters["dropped_submitted"] += len(taken) - len(rows)
+            self._last_flush_ms = (time.perf_counter() - started) * 1000
+        return len(rows)
+
+    def flush(self, session_factory: Callable[[], Session]) -> int:
+        with self._flush_lock:
+            return self._write(self._take(), session_factory)
+
+    def flush_attempt(self, attempt_id: uuid.UUID, session_factory: Callable[[], Session]) -> int:
+        # Waits for a flush in progress: its entries are gone from the buffer
+        # but not committed, and submit must not claim the attempt before
+        with self._flush_lock:
+            return self._write(self._take(attempt_id), session_factory)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "buffered_answers": len(self._entries),
+                "buffered_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "last_flush_ms": round(self._last_flush_ms, 2),
+            }
+
+
+autosave_buffer: AnswerBuffer = InMemoryAnswerBuffer(max_bytes=settings.AUTOSAVE_MAX_BUFFER_BYTES)
+
+
+def check_write_behind(buffer: AnswerBuffer, workers: int) -> None:
+    """Raises when the buffer would lose answers: several workers need a shared one."""
+    if workers > 1 and not buffer.shared_between_workers:
+        raise RuntimeError(
+            f"AUTOSAVE_WRITE_BEHIND with {workers} workers needs a buffer shared between them; "
+            f"{type(buffer).__name__} is per process. Run one worker or turn write-behind off."
+        )
+
+
+async def run_flush_loop(buffer: AnswerBuffer, session_factory: Callable[[], Session], interval_ms: int):
+    """Background task: flushes the buffer every `interval_ms` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_ms / 1000)
+        try:
+            await asyncio.to_thread(buffer.flush, session_factory)
+        except Exception:
+            # Entries stay buffered and are retried on the next tick
+            logger.exception("Autosave flush failed")
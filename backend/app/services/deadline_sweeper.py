@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.models.attempt import AttemptStatus, StudentExamAttempt
+from app.services.attempt_grading import grade_attempts
+from app.services.exam_analytics import mark_analytics_stale
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key shared by every worker's sweeper
+SWEEP_LOCK_KEY = 0x5EE9_DEAD
+
+
+@dataclass
+class SweptBatch:
+    closed: int
+    max_lag_seconds: float  # how long after its deadline the latest-closed attempt was submitted
+
+
+async def sweep_expired(session: AsyncSession, cutoff: datetime, batch_size: int) -> Optional[SweptBatch]:
+    """
+    Submits and grades up to `batch_size` open attempts whose deadline is at
+    or before `cutoff`, oldest first, in one transaction; submit_time is the
+    deadline. Returns None, changing nothing, while another worker holds
+    the sweep lock. Attempts locked by a concurrent submit are skipped.
+    """
+    locked = (await session.exec(select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_KEY)))).one()
+    if not locked:
+        await session.rollback()
+        return None
+
+    expired = (
+        select(StudentExamAttempt.id)
+        .where(StudentExamAttempt.status == AttemptStatus.IN_PROGRESS, StudentExamAttempt.deadline_at <= cutoff)
+        .order_by(StudentExamAttempt.deadline_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    closed = (await session.exec(
+        update(StudentExamAttempt)
+        .where(StudentExamAttempt.id.in_(expired.scalar_subquery()))
+        .values(status=AttemptStatus.SUBMITTED, submit_time=StudentExamAttempt.deadline_at)
+        .returning(StudentExamAttempt.id, StudentExamAttempt.deadline_at)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    await grade_attempts(session, [row.id for row in closed])
+    await session.commit()
+    if closed:
+        await mark_analytics_stale(session, [row.id for row in closed])
+        await session.commit()
+
+    now = datetime.now()
+    lag = max(((now - row.deadline_at).total_seconds() for row in closed), default=0.0)
+    return SweptBatch(closed=len(closed), max_lag_seconds=lag)
+
+
+class DeadlineSweeper:
+    """
+    Background task that closes attempts whose time ran out, so results do
+    not depend on the client calling /submit. Each tick drains every expired
+    attempt in batches, then sleeps `interval`. All workers run one; the
+    advisory lock makes the others skip the tick.
+    """
+
+    def __init__(self, interval: float, batch_size: int, grace_seconds: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.grace_seconds = grace_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._counters = {"swept": 0, "batches": 0, "ticks": 0, "lock_busy": 0, "failures": 0}
+        self._last = {"attempts_per_second": 0.0, "last_batch_ms": 0.0, "last_lag_seconds": 0.0, "max_lag_seconds": 0.0}
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self) -> None:
+        """The batch in progress commits first."""
+        if self._task is None:
+            return
+        self._stop.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def drain(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """Sweeps until no expired attempt is left (or the lock is busy); returns the number closed."""
+        with self._lock:
+            self._counters["ticks"] += 1
+        drained, started = 0, time.perf_counter()
+        while not self._stop or not self._stop.is_set():
+            cutoff = datetime.now() - timedelta(seconds=self.grace_seconds)
+            batch_started = time.perf_counter()
+            async with session_factory() as session:
+                batch = await sweep_expired(session, cutoff, self.batch_size)
+            if batch is None:
+                with self._lock:
+                    self._counters["lock_busy"] += 1
+                break
+            drained += batch.closed
+            if batch.closed:
+                with self._lock:
+                    self._counters["swept"] += batch.closed
+                    self._counters["batches"] += 1
+                    self._last["last_batch_ms"] = round((time.perf_counter() - batch_started) * 1000, 1)
+                    self._last["last_lag_seconds"] = round(batch.max_lag_seconds, 1)
+                    self._last["max_lag_seconds"] = max(self._last["max_lag_seconds"], self._last["last_lag_seconds"])
+            if batch.closed < self.batch_size:
+                break
+        if drained:
+            with self._lock:
+                self._last["attempts_per_second"] = round(drained / (time.perf_counter() - started), 1)
+        return drained
+
+    async def _run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.drain(session_factory)
+            except Exception:
+                logger.exception("Deadline sweep failed")
+                with self._lock:
+                    self._counters["failures"] += 1
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                **self._last,
+                "running": self._task is not None,
+                "batch_size": self.batch_size,
+                "grace_seconds": self.grace_seconds,
+            }
+
+
+deadline_sweeper = DeadlineSweeper(
+    interval=settings.DEADLINE_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.DEADLINE_SWEEP_BATCH_SIZE,
+    grace_seconds=settings.DEADLINE_GRACE_SECONDS,
+)
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import Text, Uuid, any_, func, literal, or_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.models.analytics import ExamAnalytics
+from app.models.attempt import AttemptStatus, StudentAnswer, StudentExamAttempt
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question
+from app.schemas.analytics_schema import ExamAnalyticsReport, OptionStats, QuestionStats, ScoreHistogram
+from app.services.grading_service import normalize_choice
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+# Kelley's upper and lower groups for the discrimination index
+GROUP_SHARE = 0.27
+
+
+async def mark_analytics_stale(session: AsyncSession, attempt_ids: Sequence[uuid.UUID]) -> None:
+    """
+    Flags the cached analytics of the attempts' exams for a refresh. Run it
+    in a transaction of its own once the change has committed: a refresh
+    clears the flag before it reads, and a flag already set is not touched
+    (no row lock during a submit storm), so a mark made before the commit
+    could be cleared by a refresh that does not see the change.
+    Does not commit; the caller owns the transaction.
+    """
+    exam_ids = select(StudentExamAttempt.exam_id).where(
+        StudentExamAttempt.id == any_(literal(list(attempt_ids), ARRAY(Uuid)))
+    )
+    await session.exec(
+        update(ExamAnalytics)
+        .where(ExamAnalytics.exam_id.in_(exam_ids), ExamAnalytics.stale_since.is_(None))
+        .values(stale_since=func.localtimestamp())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _submitted(exam_id: uuid.UUID):
+    return (StudentExamAttempt.exam_id == exam_id) & (StudentExamAttempt.status == AttemptStatus.SUBMITTED)
+
+
+def _numbered_attempts(exam_id: uuid.UUID):
+    # Submitted attempts numbered from 0 in id order, the order totals are read in
+    return (
+        select(StudentExamAttempt.id, (func.row_number().over(order_by=StudentExamAttempt.id) - 1).label("number"))
+        .where(_submitted(exam_id))
+        .subquery("attempts")
+    )
+
+
+def _item_scores_statement(exam_id: uuid.UUID):
+    # Per question on the paper: the numbers of the attempts that have an
+    # answer row and, in the same order (both aggregates see the rows
+    # together), their scores. Unsorted, so Postgres only hashes.
+    attempts = _numbered_attempts(exam_id)
+    return (
+        select(
+            StudentAnswer.question_id,
+            func.array_agg(attempts.c.number).label("attempts"),
+            func.array_agg(func.coalesce(StudentAnswer.score_awarded, 0.0)).label("scores"),
+        )
+        .join(attempts, attempts.c.id == StudentAnswer.attempt_id)
+        .join(ExamQuestionLink, (ExamQuestionLink.exam_id == exam_id)
+              & (ExamQuestionLink.question_id == StudentAnswer.question_id))
+        .group_by(StudentAnswer.question_id)
+    )
+
+
+def _selections_statement(exam_id: uuid.UUID):
+    # How often each distinct answer shape was sent per question: the
+    # selection as stored and whether there is text. Grouping on the JSON
+    # text saves parsing every answer; the few distinct selections are
+    # parsed and split into choices in Python.
+    selection = StudentAnswer.selected_options.cast(Text)
+    wrote = func.coalesce(func.btrim(StudentAnswer.text_answer) != "", False)
+    return (
+        select(StudentAnswer.question_id, selection.label("selection"), wrote.label("wrote"), func.count().label("count"))
+        .join(StudentExamAttempt, StudentExamAttempt.id == StudentAnswer.attempt_id)
+        .join(ExamQuestionLink, (ExamQuestionLink.exam_id == StudentExamAttempt.exam_id)
+              & (ExamQuestionLink.question_id == StudentAnswer.question_id))
+        .where(_submitted(exam_id))
+        .group_by(StudentAnswer.question_id, selection, wrote)
+    )
+
+
+def _round(value: float) -> float:
+    return round(float(value), 4)
+
+
+def _correlation(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+    if len(x) < 2 or not x.std() or not y.std():
+        return None
+    return _round(np.corrcoef(x, y)[0, 1])
+
+
+def _option_stats(question: Question, counts: Dict[str, int], attempts: int) -> List[OptionStats]:
+    keys = {normalize_choice(a) for a in question.correct_answers or []}
+    listed = [normalize_choice(o) for o in question.options or [] if not isinstance(o, dict)]
+    # The paper's options in order, then anything else students sent, most picked first
+    values = dict.fromkeys([*listed, *sorted(counts, key=lambda v: (-counts[v], v))])
+    return [
+        OptionStats(
+            value=value,
+            count=counts.get(value, 0),
+            share=_round(counts.get(value, 0) / attempts) if attempts else 0.0,
+            is_key=value in keys,
+        )
+        for value in values
+    ]
+
+
+def compute_report(session: Session, exam: Exam) -> ExamAnalyticsReport:
+    """
+    Item analysis of the submitted attempts of `exam`: score distribution,
+    and per question difficulty, discrimination (upper minus lower 27% by
+    total), point-biserial correlation with the rest score and choice
+    frequencies. SQL aggregates the answers; NumPy does the statistics.
+    Run it in a REPEATABLE READ transaction so its queries agree.
+    """
+    questions = session.exec(
+        select(Question)
+        .join(ExamQuestionLink, ExamQuestionLink.question_id == Question.id)
+        .where(ExamQuestionLink.exam_id == exam.id)
+        .order_by(ExamQuestionLink.position)
+    ).all()
+    totals = np.array(session.exec(
+        select(StudentExamAttempt.total_score).where(_submitted(exam.id)).order_by(StudentExamAttempt.id)
+    ).all(), dtype=float)
+    items = {row.question_id: row for row in session.exec(_item_scores_statement(exam.id)).all()}
+    choices: Dict[uuid.UUID, Counter] = defaultdict(Counter)
+    answered: Counter = Counter()
+    for row in session.exec(_selections_statement(exam.id)).all():
+        selection = json.loads(row.selection) if row.selection is not None else None
+        if not isinstance(selection, list):
+            selection = []
+        for value in set(map(normalize_choice, selection)):
+            choices[row.question_id][value] += row.count
+        if selection or row.wrote:
+            answered[row.question_id] += row.count
+
+    attempts = len(totals)
+    report = ExamAnalyticsReport(attempt_count=attempts, max_possible_score=exam.max_possible_score)
+    if attempts:
+        top = max(exam.max_possible_score, totals.max()) or 1.0
+        counts, edges = np.histogram(totals, bins=settings.ANALYTICS_HISTOGRAM_BINS, range=(0.0, top))
+        report.mean, report.std = _round(totals.mean()), _round(totals.std())
+        report.min, report.max = _round(totals.min()), _round(totals.max())
+        report.percentiles = {f"p{p}": _round(v) for p, v in zip(PERCENTILES, np.percentile(totals, PERCENTILES))}
+        report.histogram = ScoreHistogram(edges=[_round(e) for e in edges], counts=counts.tolist())
+
+    order = np.argsort(totals, kind="stable")
+    group = max(1, round(GROUP_SHARE * attempts))
+    lower, upper = order[:group], order[-group:]
+    for q in questions:
+        row = items.get(q.id)
+        scores = np.zeros(attempts)
+        if row:
+            scores[np.asarray(row.attempts, dtype=np.intp)] = row.scores
+        stats = QuestionStats(
+            question_id=q.id, title=q.title, type=q.q_type.value, max_score=q.max_score,
+            answered=answered[q.id],
+            mean_score=_round(scores.mean()) if attempts else 0.0,
+            options=_option_stats(q, choices.get(q.id, {}), attempts),
+        )
+        if attempts and q.max_score:
+            stats.difficulty = _round(scores.mean() / q.max_score)
+            stats.discrimination = _round((scores[upper].mean() - scores[lower].mean()) / q.max_score)
+            stats.point_biserial = _correlation(scores, totals - scores)
+        report.questions.append(stats)
+    return report
+
+
+def _recompute(session_factory: Callable[[], Session], exam_id: uuid.UUID) -> Optional[ExamAnalytics]:
+    """Computes the report of a claimed exam and stores it unless a newer one got there first."""
+    started = time.perf_counter()
+    try:
+        with session_factory() as session:
+            session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            snapshot_at = session.exec(select(func.localtimestamp())).one()
+            exam = session.get(Exam, exam_id)
+            report = compute_report(session, exam)
+    except Exception:
+        # Left for the next refresh
+        with session_factory() as session:
+            session.exec(
+                update(ExamAnalytics)
+                .where(ExamAnalytics.exam_id == exam_id, ExamAnalytics.stale_since.is_(None))
+                .values(stale_since=func.localtimestamp())
+            )
+            session.commit()
+        raise
+
+    with session_factory() as session:
+        session.exec(
+            update(ExamAnalytics)
+            .where(
+                ExamAnalytics.exam_id == exam_id,
+                or_(ExamAnalytics.computed_at.is_(None), ExamAnalytics.computed_at < snapshot_at),
+            )
+            .values(
+                report=report.model_dump(mode="json"),
+                computed_at=snapshot_at,
+                compute_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+        )
+        session.commit()
+        return session.get(ExamAnalytics, exam_id)
+
+
+def refresh_exam_analytics(session_factory: Callable[[], Session], exam_id: uuid.UUID) -> Optional[ExamAnalytics]:
+    """
+    Recomputes and stores the analytics of one exam now; None when the exam
+    does not exist. The stale flag is cleared in a transaction of its own
+    before the report is read from a later snapshot: a change committed
+    before that snapshot is in the report, any later one flags it again.
+    """
+    with session_factory() as session:
+        if session.get(Exam, exam_id) is None:
+            return None
+        stmt = insert(ExamAnalytics).values(exam_id=exam_id, stale_since=None)
+        session.exec(stmt.on_conflict_do_update(index_elements=[ExamAnalytics.exam_id], set_={"stale_since": None}))
+        session.commit()
+    return _recompute(session_factory, exam_id)
+
+
+def claim_stale(session_factory: Callable[[], Session]) -> Optional[uuid.UUID]:
+    """Clears the flag of the exam stale the longest and returns its id; SKIP LOCKED spreads exams over workers."""
+    with session_factory() as session:
+        oldest = (
+            select(ExamAnalytics.exam_id)
+            .where(ExamAnalytics.stale_since.is_not(None))
+            .order_by(ExamAnalytics.stale_since)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        exam_id = session.exec(
+            update(ExamAnalytics)
+            .where(ExamAnalytics.exam_id == oldest)
+            .values(stale_since=None)
+            .returning(ExamAnalytics.exam_id)
+        ).scalar_one_or_none()
+        session.commit()
+        return exam_id
+
+
+class AnalyticsRefresher:
+    """
+    Background task that recomputes the analytics of exams flagged stale
+    by submits and regrades, in a thread so the event loop keeps serving.
+    Each exam is recomputed at most once per `interval`, however many
+    attempts were submitted meanwhile.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._counters = {"refreshed": 0, "ticks": 0, "failures": 0}
+        self._last = {"last_compute_ms": 0.0, "last_attempt_count": 0}
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self) -> None:
+        """The exam being recomputed is stored first."""
+        if self._task is None:
+            return
+        self._stop.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def refresh_stale(self, session_factory: Callable[[], Session]) -> int:
+        """Recomputes every stale exam; returns how many."""
+        with self._lock:
+            self._counters["ticks"] += 1
+        refreshed = 0
+        while not self._stop or not self._stop.is_set():
+            exam_id = claim_stale(session_factory)
+            if exam_id is None:
+                break
+            try:
+                row = _recompute(session_factory, exam_id)
+            except Exception:
+                logger.exception("Analytics refresh of exam %s failed", exam_id)
+                with self._lock:
+                    self._counters["failures"] += 1
+                break
+            refreshed += 1
+            with self._lock:
+                self._counters["refreshed"] += 1
+                self._last["last_compute_ms"] = row.compute_ms
+                self._last["last_attempt_count"] = row.report["attempt_count"]
+        return refreshed
+
+    async def _run(self, session_factory: Callable[[], Session]) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.to_thread(self.refresh_stale, session_factory)
+            except Exception:
+                logger.exception("Analytics refresh failed")
+                with self._lock:
+                    self._counters["failures"] += 1
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, **self._last, "running": self._task is not None}
+
+
+analytics_refresher = AnalyticsRefresher(interval=settings.ANALYTICS_REFRESH_INTERVAL_SECONDS)
@@ -0,0 +1,87 @@
+import uuid
+from typing import List, Sequence, Set, Tuple
+from sqlalchemy import ARRAY, Uuid, all_, any_, delete, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+from app.models.exam import ExamQuestionLink
+from app.models.question import Question
+
+# Set-based edits of an exam's paper: a constant number of statements for any
+# number of ids. None of them commits, touches Exam.content_version or the
+# totals; callers do that in the same transaction (see add_questions_to_exam).
+
+
+def _array(question_ids: Sequence[uuid.UUID]):
+    # One uuid[] parameter, however many ids
+    return literal(list(question_ids), ARRAY(Uuid))
+
+
+def _ordered(question_ids: Sequence[uuid.UUID]):
+    """The ids as a table of (question_id, ord), ord counting from 1 in list order."""
+    return (
+        func.unnest(_array(question_ids))
+        .table_valued("question_id", with_ordinality="ord")
+        .render_derived()
+    )
+
+
+def existing_question_ids(session: Session, question_ids: Sequence[uuid.UUID]) -> Set[uuid.UUID]:
+    return set(session.exec(
+        select(Question.id).where(Question.id == any_(_array(question_ids)))
+    ).all())
+
+
+def append_questions(session: Session, exam_id: uuid.UUID, question_ids: Sequence[uuid.UUID]) -> List[uuid.UUID]:
+    """
+    Links questions after the exam's last position, in list order. Ones
+    already on the exam keep their place. Returns the newly linked ids.
+    """
+    ids = _ordered(question_ids)
+    last = (
+        select(func.coalesce(func.max(ExamQuestionLink.position), 0))
+        .where(ExamQuestionLink.exam_id == exam_id)
+        .scalar_subquery()
+    )
+    stmt = (
+        insert(ExamQuestionLink)
+        .from_select(["exam_id", "question_id", "position"], select(literal(exam_id, Uuid), ids.c.question_id, last + ids.c.ord))
+        .on_conflict_do_nothing()
+        .returning(ExamQuestionLink.question_id)
+    )
+    return session.exec(stmt).scalars().all()
+
+
+def replace_questions(session: Session, exam_id: uuid.UUID, question_ids: Sequence[uuid.UUID]) -> Tuple[int, int]:
+    """
+    Makes the paper exactly `question_ids`, in that order: unlisted links are
+    removed, listed ones (re)numbered 1..n. Returns (added, removed).
+    """
+    removed = session.exec(
+        delete(ExamQuestionLink)
+        .where(
+            ExamQuestionLink.exam_id == exam_id,
+            ExamQuestionLink.question_id != all_(_array(question_ids)),
+        )
+        .returning(ExamQuestionLink.question_id)
+    ).all()
+
+    ids = _ordered(question_ids)
+    stmt = insert(ExamQuestionLink).from_select(
+        ["exam_id", "question_id", "position"], select(literal(exam_id, Uuid), ids.c.question_id, ids.c.ord)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExamQuestionLink.exam_id, ExamQuestionLink.question_id],
+        set_={"position": stmt.excluded.position},
+    ).returning(literal_column("xmax = 0").label("inserted"))
+    added = sum(1 for inserted in session.exec(stmt).scalars() if inserted)
+    return added, len(removed)
+
+
+def remove_questions(session: Session, exam_id: uuid.UUID, question_ids: Sequence[uuid.UUID]) -> int:
+    result = session.exec(
+        delete(ExamQuestionLink).where(
+            ExamQuestionLink.exam_id == exam_id,
+            ExamQuestionLink.question_id == any_(_array(question_ids)),
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,44 @@
+import uuid
+from typing import Iterable, Optional
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question
+
+
+def refresh_exam_totals(session: Session, exam_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+    """
+    Recomputes Exam.question_count and Exam.max_possible_score from the link table.
+    Call it in the same transaction that changes ExamQuestionLink rows (or a
+    question's max_score) so readers never see a stale total.
+    Passing no ids recomputes every exam.
+    Does not commit; the caller owns the transaction.
+    """
+    question_count = (
+        select(func.count())
+        .select_from(ExamQuestionLink)
+        .where(ExamQuestionLink.exam_id == Exam.id)
+        .scalar_subquery()
+    )
+    max_possible_score = (
+        select(func.coalesce(func.sum(Question.max_score), 0.0))
+        .select_from(ExamQuestionLink)
+        .join(Question, Question.id == ExamQuestionLink.question_id)
+        .where(ExamQuestionLink.exam_id == Exam.id)
+        .scalar_subquery()
+    )
+
+    stmt = update(Exam).values(question_count=question_count, max_possible_score=max_possible_score)
+    if exam_ids is not None:
+        stmt = stmt.where(Exam.id.in_(list(exam_ids)))
+    session.exec(stmt)
+
+
+if __name__ == "__main__":
+    # Repair command for existing data: python -m app.services.exam_totals
+    from app.core.database import engine
+
+    with Session(engine) as session:
+        refresh_exam_totals(session)
+        session.commit()
+    print("Recomputed question counts and max scores for all exams")
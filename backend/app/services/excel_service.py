@@ -1,50 +1,173 @@
+import contextlib
+import itertools
+from dataclasses import dataclass
 import pandas as pd
-from typing import List, Tuple
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+from pydantic import TypeAdapter, ValidationError
+from typing import Iterator, List, Tuple
 from fastapi import UploadFile, HTTPException
-from app.schemas.question_schema import QuestionCreate
+from app.schemas.auth_schema import StudentImportRow
+from app.schemas.question_schema import QuestionBase, QuestionCreate
 from app.models.question import Question
 
-def parse_excel_questions(file: UploadFile) -> Tuple[List[Question], List[str]]:
+def read_table(file: UploadFile) -> pd.DataFrame:
+    """Reads an uploaded .csv or .xlsx file into a DataFrame (all cells as text)."""
+    try:
+        if file.filename.lower().endswith(".csv"):
+            return pd.read_csv(file.file, dtype=str)
+        return pd.read_excel(file.file, dtype=str)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid file: {str(e)}")
+
+# Rows validated and converted per batch; bounds memory for any sheet size
+QUESTION_BATCH_SIZE = 1000
+
+_question_batch_adapter = TypeAdapter(List[QuestionCreate])
+
+
+@dataclass
+class QuestionBatch:
+    questions: List[QuestionCreate]  # validated rows, ready for question_writer
+    errors: List[str]
+    last_row: int  # spreadsheet row number of the last row read (header is row 1)
+
+
+def _excel_cell(value):
+    # Same conversions as pandas' openpyxl reader: empty -> "", 2.0 -> 2
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+@contextlib.contextmanager
+def _open_sheet(source) -> Iterator[Tuple[list, Iterator[list]]]:
     """
-    Parses an uploaded Excel file and returns a list of Question models.
-    Returns: (valid_questions, error_logs)
+    Opens the first sheet in read-only mode; gives (header, data rows).
+    Blank rows are held back until a later row has data, so trailing blank
+    rows are dropped like pd.read_excel does.
     """
     try:
-        # Read the uploaded Excel file into a Pandas DataFrame
-        df = pd.read_excel(file.file)
+        workbook = load_workbook(source, read_only=True, data_only=True)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid Excel file: {str(e)}")
 
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_excel_cell(v) for v in next(rows, ())]
+        width = len(header)
+
+        def data_rows():
+            blank = []
+            for values in rows:
+                row = [_excel_cell(v) for v in values[:width]]
+                if all(v == "" for v in row):
+                    blank.append(row)
+                    continue
+                yield from blank
+                blank.clear()
+                yield row
+
+        yield header, data_rows()
+    finally:
+        workbook.close()
+
+
+def _question_records(header: list, rows: List[list]) -> List[dict]:
+    """Column-wise cleanup of one chunk: type inference, NaN -> None, JSON columns parsed."""
+    # TextParser is what pd.read_excel runs on the sheet, so values match the old import
+    df = TextParser([header] + rows, header=0, skip_blank_lines=False).read()
+    df = df.astype(object).where(pd.notnull(df), None)
+    for column in ("options", "correct_answers"):
+        if column in df:
+            df[column] = df[column].map(QuestionBase.parse_json_fields)
+    return df.to_dict("records")
+
+
+def _to_question(q_data: QuestionCreate) -> Question:
+    return Question(
+        title=q_data.title,
+        description=q_data.description,
+        complexity=q_data.complexity,
+        q_type=q_data.q_type,
+        options=q_data.options,
+        correct_answers=q_data.correct_answers,
+        max_score=q_data.max_score,
+        tags=q_data.tags
+    )
+
+
+def _validate_chunk(header: list, chunk: List[list], first_row: int, last_row: int) -> QuestionBatch:
+    records = _question_records(header, chunk)
+    try:
+        # Fast path: the whole chunk is valid
+        return QuestionBatch(_question_batch_adapter.validate_python(records), [], last_row)
+    except ValidationError:
+        pass
+
+    # Row by row, for the same messages as before
+    questions, errors = [], []
+    for offset, record in enumerate(records):
+        try:
+            questions.append(QuestionCreate(**record))
+        except Exception as e:
+            errors.append(f"Row {first_row + offset}: {str(e)}")
+    return QuestionBatch(questions, errors, last_row)
+
+
+def iter_question_batches(source, batch_size: int = QUESTION_BATCH_SIZE, skip_rows: int = 0) -> Iterator[QuestionBatch]:
+    """
+    Streams an .xlsx question sheet (path or binary file object) in batches of
+    `batch_size` rows, so memory stays flat for any sheet size.
+    Errors use the spreadsheet row number: "Row {n}: ...".
+    `skip_rows` data rows are read but not validated (resuming an import).
+    """
+    with _open_sheet(source) as (header, rows):
+        rows = itertools.islice(rows, skip_rows, None)
+        row_number = 1 + skip_rows
+        for chunk in iter(lambda: list(itertools.islice(rows, batch_size)), []):
+            first_row = row_number + 1
+            row_number += len(chunk)
+            yield _validate_chunk(header, chunk, first_row, row_number)
+
+
+def parse_excel_questions(file: UploadFile) -> Tuple[List[Question], List[str]]:
+    """
+    Parses an uploaded Excel file and returns a list of Question models.
+    Returns: (valid_questions, error_logs)
+    """
     valid_questions = []
     errors = []
+    for batch in iter_question_batches(file.file):
+        valid_questions.extend(_to_question(q) for q in batch.questions)
+        errors.extend(batch.errors)
+    return valid_questions, errors
+
 
-    # Iterate through each row in the DataFrame
-    for index, row in df.iterrows():
+def parse_student_rows(file: UploadFile) -> Tuple[List[Tuple[int, StudentImportRow]], List[str]]:
+    """
+    Parses an uploaded CSV/XLSX of students (email, password, full_name).
+    Returns: (valid rows with their spreadsheet row number, error_logs)
+    A repeated email keeps its first row; later ones are reported.
+    """
+    df = read_table(file)
+    df = df.where(pd.notnull(df), None)
+
+    valid_rows = []
+    errors = []
+    seen = set()
+    for index, row_dict in enumerate(df.to_dict("records")):
         try:
-            # 1. Clean up NaN values (replace with None for Pydantic compatibility)
-            row_dict = row.where(pd.notnull(row), None).to_dict()
-            
-            # 2. Validate the row data using the Pydantic Schema
-            # This handles JSON parsing for 'options' and 'correct_answers' automatically via the validator
-            # It also maps the 'type' column from Excel to 'q_type' in the object
-            q_data = QuestionCreate(**row_dict)
-            
-            # 3. Convert the validated data to the Database Model
-            db_question = Question(
-                title=q_data.title,
-                description=q_data.description,
-                complexity=q_data.complexity,
-                q_type=q_data.q_type,
-                options=q_data.options,
-                correct_answers=q_data.correct_answers,
-                max_score=q_data.max_score,
-                tags=q_data.tags
-            )
-            
-            valid_questions.append(db_question)
-            
+            student = StudentImportRow(**row_dict)
         except Exception as e:
-
             errors.append(f"Row {index + 2}: {str(e)}")
+            continue
+        if student.email in seen:
+            errors.append(f"Row {index + 2}: duplicate email {student.email} in file")
+            continue
+        seen.add(student.email)
+        valid_rows.append((index + 2, student))
 
-    return valid_questions, errors
\ No newline at end of file
+    return valid_rows, errors
@@ -1,28 +1,122 @@
-from typing import List
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import numpy as np
 from app.models.question import Question, QuestionType
 from app.models.attempt import StudentAnswer
 
-def grade_answer(question: Question, answer: StudentAnswer) -> float:
+AUTO_GRADED = (QuestionType.SINGLE_CHOICE, QuestionType.MULTI_CHOICE)
+
+
+def normalize_choice(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+@dataclass(frozen=True)
+class AnswerKey:
     """
-    Calculates score for a single question.
+    A question compiled for grading: its correct answers normalized once,
+    each given a column of the selection matrix. Column `len(columns)`
+    collects every selection that is not a correct answer.
+    """
+    max_score: float
+    auto_graded: bool
+    columns: Dict[str, int]
+
+
+def compile_answer_key(question: Question) -> AnswerKey:
+    correct = dict.fromkeys(normalize_choice(x) for x in (question.correct_answers or []))
+    return AnswerKey(
+        max_score=question.max_score,
+        auto_graded=question.q_type in AUTO_GRADED,
+        columns={value: i for i, value in enumerate(correct)},
+    )
+
+
+def grade_selections(key: AnswerKey, selections: Sequence[Optional[List[Any]]]) -> np.ndarray:
+    """
+    Scores of many answers to one question. An answer earns max_score when
+    its set of selections equals the set of correct answers, else 0; text
+    and image questions score 0 until graded by hand.
     """
-    # 1. Text / Image questions need manual review (score 0 for now)
-    if question.q_type in [QuestionType.TEXT, QuestionType.IMAGE_UPLOAD]:
-        return 0.0
+    if not key.auto_graded or not selections:
+        return np.zeros(len(selections))
 
-    # 2. Objective Questions
-    if not answer.selected_options:
-        return 0.0
+    width = len(key.columns)
+    rows, cols = [], []
+    for row, selected in enumerate(selections):
+        for value in selected or ():
+            rows.append(row)
+            cols.append(key.columns.get(normalize_choice(value), width))
+    chosen = np.zeros((len(selections), width + 1), dtype=bool)
+    chosen[rows, cols] = True
 
+    expected = np.zeros(width + 1, dtype=bool)
+    expected[:width] = True
+    # An empty answer is wrong even when the key is empty
+    correct = (chosen == expected).all(axis=1) & chosen.any(axis=1)
+    return np.where(correct, key.max_score, 0.0)
 
-    def normalize(val):
-        return str(val).strip().lower()
 
-    correct_set = set(normalize(x) for x in (question.correct_answers or []))
-    student_set = set(normalize(x) for x in (answer.selected_options or []))
+@dataclass
+class Grades:
+    """Results of grade_batch, one entry per answer in input order."""
+    scores: np.ndarray
+    correct: np.ndarray  # score == max_score
+    graded: np.ndarray  # False for answers waiting for a manual grade
 
-    # Exact match required for full points
-    if correct_set == student_set:
-        return question.max_score
-    
-    return 0.0
\ No newline at end of file
+
+def grade_batch(
+    keys: Mapping[uuid.UUID, AnswerKey],
+    question_ids: Sequence[uuid.UUID],
+    selections: Sequence[Optional[List[Any]]],
+) -> Grades:
+    """
+    Grades many answers (of any number of attempts) against compiled keys.
+    Identical selections to the same question are graded once: a regrade of
+    thousands of attempts reduces to a few distinct answers per question,
+    which are scored together per question with grade_selections.
+    """
+    patterns: Dict[tuple, int] = {}
+    distinct: Dict[uuid.UUID, List[Any]] = {}  # question -> its distinct selections, in code order
+    codes = np.empty(len(question_ids), dtype=np.intp)
+    for i, (question_id, selected) in enumerate(zip(question_ids, selections)):
+        # repr tells 1, 1.0 and True apart (they normalize differently) and takes unhashable values
+        pattern = (question_id, repr(selected))
+        code = patterns.get(pattern)
+        if code is None:
+            code = patterns[pattern] = len(patterns)
+            distinct.setdefault(question_id, []).append((code, selected))
+        codes[i] = code
+
+    scores = np.zeros(len(patterns))
+    correct = np.zeros(len(patterns), dtype=bool)
+    graded = np.zeros(len(patterns), dtype=bool)
+    for question_id, group in distinct.items():
+        key = keys[question_id]
+        at = np.fromiter((code for code, _ in group), dtype=np.intp, count=len(group))
+        scores[at] = grade_selections(key, [selected for _, selected in group])
+        correct[at] = scores[at] == key.max_score
+        graded[at] = key.auto_graded
+    return Grades(scores=scores[codes], correct=correct[codes], graded=graded[codes])
+
+
+def grade_answers(keys: Mapping[uuid.UUID, AnswerKey], answers: Sequence[StudentAnswer]) -> Grades:
+    """grade_batch over loaded answers, writing score_awarded, is_correct and is_graded back."""
+    grades = grade_batch(keys, [a.question_id for a in answers], [a.selected_options for a in answers])
+    for answer, score, correct, graded in zip(
+        answers, grades.scores.tolist(), grades.correct.tolist(), grades.graded.tolist()
+    ):
+        answer.score_awarded = score
+        answer.is_correct = correct
+        # Text/Image answers wait for a manual grade
+        answer.is_graded = graded
+    return grades
+
+
+def grade_answer(question: Question, answer: StudentAnswer) -> float:
+    """
+    Calculates score for a single question.
+    Compiles the key on every call; grade many answers with compile_answer_key and grade_batch.
+    """
+    return float(grade_selections(compile_answer_key(question), [answer.selected_options])[0])
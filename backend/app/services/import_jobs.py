@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.services.exam_questions import append_questions
+from app.services.exam_totals import refresh_exam_totals
+from app.services.excel_service import iter_question_batches
+from app.services.paper_cache import paper_cache
+from app.services.question_writer import write_questions
+
+logger = logging.getLogger(__name__)
+
+
+def spool_upload(file: UploadFile, spool_dir: str) -> str:
+    """Copies an upload to `spool_dir` under a fresh name and returns the path."""
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{uuid.uuid4().hex}.xlsx")
+    file.file.seek(0)
+    with open(path, "wb") as spooled:
+        shutil.copyfileobj(file.file, spooled, 1024 * 1024)
+    return path
+
+
+def claim_job(session_factory: Callable[[], Session], stale_seconds: int) -> Optional[uuid.UUID]:
+    """
+    Marks the oldest queued job, or a running one whose worker stopped
+    sending heartbeats, as running and returns its id. SKIP LOCKED lets
+    several workers and processes claim from the same table.
+    """
+    now = datetime.now()
+    with session_factory() as session:
+        job = session.exec(
+            select(ImportJob)
+            .where(or_(
+                ImportJob.status == ImportJobStatus.QUEUED,
+                and_(
+                    ImportJob.status == ImportJobStatus.RUNNING,
+                    ImportJob.heartbeat_at < now - timedelta(seconds=stale_seconds),
+                ),
+            ))
+            .order_by(ImportJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            return None
+        job.status = ImportJobStatus.RUNNING
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        session.add(job)
+        session.commit()
+        return job.id
+
+
+def _finish(session_factory, job_id: uuid.UUID, rows_processed: int, **values) -> bool:
+    """Updates the job if this run still owns it (its checkpoint did not move)."""
+    with session_factory() as session:
+        result = session.exec(
+            update(ImportJob)
+            .where(
+                ImportJob.id == job_id,
+                ImportJob.status == ImportJobStatus.RUNNING,
+                ImportJob.rows_processed == rows_processed,
+            )
+            .values(**values)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+
+def _remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _mark_papers_changed(session: Session, exam_ids: Set[uuid.UUID]) -> None:
+    # Same bookkeeping as add_questions_to_exam, in the batch's transaction
+    session.exec(update(Exam).where(Exam.id.in_(exam_ids)).values(content_version=Exam.content_version + 1))
+    refresh_exam_totals(session, exam_ids)
+
+
+def run_import_job(
+    job_id: uuid.UUID,
+    session_factory: Callable[[], Session],
+    batch_size: int = settings.IMPORT_BATCH_SIZE,
+    max_errors: int = settings.IMPORT_MAX_ERRORS,
+    stop: Optional[threading.Event] = None,
+) -> str:
+    """
+    Imports a claimed job from its spooled file, starting after the rows it
+    already processed. Each batch is written by question_writer (duplicates
+    skipped or updated per the job's on_duplicate) and committed together
+    with the job's progress, so a crash loses at most the batch in
+    flight and never imports a row twice.
+
+    Returns "completed", "failed", "interrupted" (stop was set; the job is
+    queued again) or "lost" (another worker took the job over).
+    """
+    with session_factory() as session:
+        job = session.get(ImportJob, job_id)
+        path, exam_id, on_duplicate = job.spool_path, job.exam_id, job.on_duplicate
+        done, errors = job.rows_processed, list(job.errors)
+
+    started = time.perf_counter()
+    rows_this_run = 0
+    try:
+        for batch in iter_question_batches(path, batch_size, skip_rows=done):
+            rows = batch.last_row - 1 - done  # header is row 1
+            rows_this_run += rows
+            kept = batch.errors[:max(0, max_errors - len(errors))]
+            with session_factory() as session:
+                written = write_questions(session, batch.questions, on_duplicate)
+                changed = set()
+                if exam_id and written.ids and append_questions(session, exam_id, list(dict.fromkeys(written.ids))):
+                    changed.add(exam_id)
+                if written.updated_ids:
+                    # A new max score changes the papers and totals of exams using the question
+                    changed.update(session.exec(
+                        select(ExamQuestionLink.exam_id)
+                        .where(ExamQuestionLink.question_id.in_(written.updated_ids))
+                        .distinct()
+                    ).all())
+                if changed:
+                    _mark_papers_changed(session, changed)
+
+                values = dict(
+                    rows_processed=done + rows,
+                    rows_imported=ImportJob.rows_imported + written.inserted,
+                    rows_skipped=ImportJob.rows_skipped + written.skipped,
+                    rows_updated=ImportJob.rows_updated + written.updated,
+                    rows_failed=ImportJob.rows_failed + len(batch.errors),
+                    rows_per_second=rows_this_run / max(time.perf_counter() - started, 1e-6),
+                    heartbeat_at=datetime.now(),
+                )
+                if kept:
+                    errors.extend(kept)
+                    values["errors"] = errors
+                # The checkpoint doubles as an ownership check
+                result = session.exec(
+                    update(ImportJob)
+                    .where(
+                        ImportJob.id == job_id,
+                        ImportJob.status == ImportJobStatus.RUNNING,
+                        ImportJob.rows_processed == done,
+                    )
+                    .values(**values)
+                )
+                if result.rowcount != 1:
+                    session.rollback()
+                    return "lost"
+                session.commit()
+            for changed_exam_id in changed:
+                paper_cache.invalidate(changed_exam_id)
+            done += rows
+
+            if stop is not None and stop.is_set():
+                requeued = _finish(session_factory, job_id, done, status=ImportJobStatus.QUEUED)
+                return "interrupted" if requeued else "lost"
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            failure = e.detail  # unreadable workbook
+        else:
+            logger.exception("Import job %s failed", job_id)
+            failure = str(e)
+        if not _finish(
+            session_factory, job_id, done,
+            status=ImportJobStatus.FAILED, failure=failure, finished_at=datetime.now(),
+        ):
+            return "lost"
+        _remove_spool(path)
+        return "failed"
+
+    if not _finish(session_factory, job_id, done, status=ImportJobStatus.COMPLETED, finished_at=datetime.now()):
+        return "lost"
+    _remove_spool(path)
+    return "completed"
+
+
+class ImportJobRunner:
+    """
+    In-process worker pool for import jobs. The importjob table is the queue,
+    so jobs survive restarts and any process running a runner can take them.
+    Jobs run in threads (parsing and inserting block); `notify` wakes an idle
+    worker after an upload, otherwise workers poll every `poll_interval`.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, stale_seconds: int, batch_size: int, max_errors: int):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._counters = {"completed": 0, "failed": 0, "interrupted": 0, "lost": 0}
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        self._stop.clear()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(session_factory)) for _ in range(self.workers)]
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Running jobs stop after their current batch and go back to the queue."""
+        self._stop.set()
+        self.notify()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, session_factory: Callable[[], Session]) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id = await asyncio.to_thread(claim_job, session_factory, self.stale_seconds)
+            except Exception:
+                logger.exception("Claiming an import job failed")
+                job_id = None
+
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            with self._lock:
+                self._running += 1
+            try:
+                outcome = await asyncio.to_thread(
+                    run_import_job, job_id, session_factory, self.batch_size, self.max_errors, self._stop
+                )
+            except Exception:
+                # Could not even record the failure; the job is resumed once stale
+                logger.exception("Import job %s crashed", job_id)
+                outcome = "lost"
+            finally:
+                with self._lock:
+                    self._running -= 1
+            with self._lock:
+                self._counters[outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "running": self._running, "workers": self.workers}
+
+
+import_runner = ImportJobRunner(
+    workers=settings.IMPORT_WORKERS,
+    poll_interval=settings.IMPORT_POLL_INTERVAL_SECONDS,
+    stale_seconds=settings.IMPORT_STALE_SECONDS,
+    batch_size=settings.IMPORT_BATCH_SIZE,
+    max_errors=settings.IMPORT_MAX_ERRORS,
+)
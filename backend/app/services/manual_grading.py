@@ -0,0 +1,127 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import Boolean, Float, Uuid, any_, literal, true, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.attempt import AttemptStatus, StudentAnswer, StudentExamAttempt
+from app.models.exam import ExamQuestionLink
+from app.models.question import Question
+from app.schemas.attempt_schema import AnswerGrade, GradeRejection
+from app.services.attempt_grading import unnest_rows
+
+
+@dataclass
+class ManualGrades:
+    totals: Dict[uuid.UUID, float] = field(default_factory=dict)  # new total per graded attempt
+    graded_count: int = 0
+    rejected: List[GradeRejection] = field(default_factory=list)
+
+
+def dedupe_grades(grades: Iterable[AnswerGrade]) -> List[AnswerGrade]:
+    """Keeps the last score sent for each (attempt, question); an upsert may touch a row once."""
+    latest: Dict[Tuple[uuid.UUID, uuid.UUID], AnswerGrade] = {}
+    for grade in grades:
+        latest[grade.attempt_id, grade.question_id] = grade
+    return list(latest.values())
+
+
+def _rejection(row) -> str:
+    if row.status is None:
+        return "Attempt not found"
+    if row.status != AttemptStatus.SUBMITTED:
+        return "Attempt is not submitted"
+    if row.max_score is None:
+        return "Question is not part of this exam"
+    if row.score > row.max_score:
+        return "Score exceeds the question's max score"
+    return ""
+
+
+async def apply_manual_grades(session: AsyncSession, grades: Iterable[AnswerGrade]) -> ManualGrades:
+    """
+    Stores hand-given scores for answers of submitted attempts and moves
+    each attempt's total_score by the change (new score - old score), in a
+    fixed number of statements whatever the batch size. Answers a student
+    left blank are created. Grades for unknown or open attempts, questions
+    outside the exam or above its max score are returned as rejected.
+    Does not commit; the caller owns the transaction.
+    """
+    grades = dedupe_grades(grades)
+    result = ManualGrades()
+    if not grades:
+        return result
+
+    # Submit, the deadline sweeper and other graders lock the attempt row
+    # first too; holding it keeps the old scores read below current.
+    attempt_ids = sorted({g.attempt_id for g in grades})
+    await session.exec(
+        select(StudentExamAttempt.id)
+        .where(StudentExamAttempt.id == any_(literal(attempt_ids, ARRAY(Uuid))))
+        .order_by(StudentExamAttempt.id)
+        .with_for_update()
+    )
+
+    requested = unnest_rows(
+        ("attempt_id", Uuid, [g.attempt_id for g in grades]),
+        ("question_id", Uuid, [g.question_id for g in grades]),
+        ("score", Float, [g.score for g in grades]),
+    )
+    rows = (await session.exec(
+        select(
+            requested.c.attempt_id, requested.c.question_id, requested.c.score,
+            StudentExamAttempt.status, Question.max_score, StudentAnswer.score_awarded.label("old_score"),
+        )
+        .select_from(requested)
+        .outerjoin(StudentExamAttempt, StudentExamAttempt.id == requested.c.attempt_id)
+        .outerjoin(ExamQuestionLink, (ExamQuestionLink.exam_id == StudentExamAttempt.exam_id)
+                   & (ExamQuestionLink.question_id == requested.c.question_id))
+        .outerjoin(Question, Question.id == ExamQuestionLink.question_id)
+        .outerjoin(StudentAnswer, (StudentAnswer.attempt_id == requested.c.attempt_id)
+                   & (StudentAnswer.question_id == requested.c.question_id))
+    )).all()
+
+    accepted, deltas = [], {}
+    for row in rows:
+        detail = _rejection(row)
+        if detail:
+            result.rejected.append(GradeRejection(attempt_id=row.attempt_id, question_id=row.question_id, detail=detail))
+            continue
+        accepted.append(row)
+        deltas[row.attempt_id] = deltas.get(row.attempt_id, 0.0) + row.score - (row.old_score or 0.0)
+    if not accepted:
+        return result
+
+    graded = unnest_rows(
+        ("id", Uuid, [uuid.uuid4() for _ in accepted]),
+        ("attempt_id", Uuid, [row.attempt_id for row in accepted]),
+        ("question_id", Uuid, [row.question_id for row in accepted]),
+        ("score", Float, [row.score for row in accepted]),
+        ("correct", Boolean, [row.score == row.max_score for row in accepted]),
+    )
+    upsert = insert(StudentAnswer).from_select(
+        ["id", "attempt_id", "question_id", "score_awarded", "is_correct", "is_graded"],
+        select(graded.c.id, graded.c.attempt_id, graded.c.question_id, graded.c.score, graded.c.correct, true()),
+    )
+    await session.exec(upsert.on_conflict_do_update(
+        index_elements=[StudentAnswer.attempt_id, StudentAnswer.question_id],
+        set_={
+            "score_awarded": upsert.excluded.score_awarded,
+            "is_correct": upsert.excluded.is_correct,
+            "is_graded": True,
+        },
+    ))
+
+    changes = unnest_rows(("id", Uuid, list(deltas)), ("delta", Float, list(deltas.values())))
+    totals = (await session.exec(
+        update(StudentExamAttempt)
+        .where(StudentExamAttempt.id == changes.c.id)
+        .values(total_score=StudentExamAttempt.total_score + changes.c.delta)
+        .returning(StudentExamAttempt.id, StudentExamAttempt.total_score)
+        .execution_options(synchronize_session=False)
+    )).all()
+
+    result.totals = {row.id: row.total_score for row in totals}
+    result.graded_count = len(accepted)
+    return result
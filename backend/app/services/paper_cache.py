@@ -0,0 +1,117 @@
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+from pydantic import TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.models.exam import Exam
+from app.schemas.attempt_schema import ExamPaperQuestion
+
+_paper_adapter = TypeAdapter(List[ExamPaperQuestion])
+
+
+@dataclass(frozen=True)
+class CompiledPaper:
+    """The student-facing paper of one exam version, already serialized."""
+    version: int
+    questions_json: bytes  # JSON array of ExamPaperQuestion, correct answers stripped
+
+
+def compile_paper(exam: Exam) -> CompiledPaper:
+    questions = [
+        ExamPaperQuestion(
+            id=q.id,
+            title=q.title,
+            type=q.q_type,
+            options=q.options,
+            max_score=q.max_score
+        )
+        for q in exam.questions
+    ]
+    return CompiledPaper(
+        version=exam.content_version,
+        questions_json=_paper_adapter.dump_json(questions),
+    )
+
+
+class PaperCache:
+    """
+    LRU cache of compiled papers, bounded by entry count and total bytes.
+    An entry only matches the exam's current content_version, so a version
+    bump made by another worker invalidates this worker's copy too.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._papers: "OrderedDict[uuid.UUID, CompiledPaper]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, exam_id: uuid.UUID, version: int) -> Optional[CompiledPaper]:
+        with self._lock:
+            paper = self._papers.get(exam_id)
+            if paper is None or paper.version != version:
+                self._counters["misses"] += 1
+                return None
+            self._papers.move_to_end(exam_id)
+            self._counters["hits"] += 1
+            return paper
+
+    def put(self, exam_id: uuid.UUID, paper: CompiledPaper) -> None:
+        size = len(paper.questions_json)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(exam_id)
+            self._papers[exam_id] = paper
+            self._bytes += size
+            while len(self._papers) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._papers.popitem(last=False)
+                self._bytes -= len(evicted.questions_json)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, exam_id: uuid.UUID) -> None:
+        with self._lock:
+            self._discard(exam_id)
+
+    def _discard(self, exam_id: uuid.UUID) -> None:
+        paper = self._papers.pop(exam_id, None)
+        if paper is not None:
+            self._bytes -= len(paper.questions_json)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._papers),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+paper_cache = PaperCache(
+    max_entries=settings.PAPER_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PAPER_CACHE_MAX_BYTES,
+)
+
+
+async def get_compiled_paper(session: AsyncSession, exam: Exam) -> CompiledPaper:
+    """Returns the cached paper of `exam`, loading its questions and compiling it on a miss."""
+    paper = paper_cache.get(exam.id, exam.content_version)
+    if paper is None:
+        await session.refresh(exam, ["questions"])
+        paper = compile_paper(exam)
+        paper_cache.put(exam.id, paper)
+    return paper
+
+
+def mark_paper_changed(exam: Exam) -> None:
+    """Call inside the transaction that changes an exam's paper."""
+    # SQL-side increment, concurrent edits cannot reuse a version
+    exam.content_version = Exam.content_version + 1
+    paper_cache.invalidate(exam.id)
@@ -0,0 +1,153 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.security import password_context
+
+
+class HasherBusy(Exception):
+    """No hashing slot became free within the configured wait."""
+
+
+# Run inside the pool processes; module level so they can be pickled
+def _hash(password: str, rounds: int) -> str:
+    return password_context(rounds).hash(password)
+
+
+def _hash_batch(passwords: List[str], rounds: int) -> List[str]:
+    context = password_context(rounds)
+    return [context.hash(password) for password in passwords]
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return password_context(rounds).verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small process pool so logins neither block the event
+    loop nor compete with request threads for the GIL. At most `concurrency`
+    hashes are queued or running per worker; callers beyond that wait up to
+    `wait_seconds` for a slot and then get HasherBusy.
+    """
+
+    def __init__(self, rounds: int, workers: int, concurrency: int, wait_seconds: float, bulk_workers: int = 0):
+        self.rounds = rounds
+        self.workers = workers
+        self.bulk_workers = bulk_workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.wait_seconds = wait_seconds
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # asyncio primitives belong to one loop; tests run several
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._in_flight = 0
+        self._counters = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0}
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None  # the loop's default thread pool
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs an event loop and threads.
+                # Spawned processes re-import the entry script, which needs
+                # the usual `if __name__ == "__main__":` guard (uvicorn/gunicorn have it).
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.concurrency)
+
+        try:
+            await asyncio.wait_for(slots.acquire(), self.wait_seconds)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise HasherBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor(), fn, *args)
+        except BrokenProcessPool:
+            # A pool process died; start a fresh pool on the next call
+            self.shutdown()
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash, password, self.rounds)
+        with self._lock:
+            self._counters["hashed"] += 1
+        return hashed
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored cost is outdated."""
+        valid, new_hash = await self._run(_verify_and_update, password, hashed, self.rounds)
+        with self._lock:
+            self._counters["verified"] += 1
+            if new_hash:
+                self._counters["rehashed"] += 1
+        return valid, new_hash
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hashes a batch (bulk provisioning) across `bulk_workers` processes of
+        a temporary pool, so the login pool and its slots stay available.
+        Results keep the order of `passwords`.
+        """
+        if not passwords:
+            return []
+        workers = min(self.bulk_workers, len(passwords))
+        # A few chunks per process keeps them busy without per-password pickling
+        size = -(-len(passwords) // (workers * 4))
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _hash_batch, chunk, self.rounds) for chunk in chunks
+            ))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            self._counters["hashed"] += len(passwords)
+        return [hashed for batch in results for hashed in batch]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "in_flight": self._in_flight,
+                "workers": self.workers,
+                "concurrency": self.concurrency,
+                "rounds": self.rounds,
+            }
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    concurrency=settings.PASSWORD_HASH_CONCURRENCY,
+    wait_seconds=settings.PASSWORD_HASH_WAIT_SECONDS,
+    bulk_workers=settings.PASSWORD_BULK_HASH_WORKERS,
+)
@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing import Any, Optional
+from app.models.question import QuestionType
+
+
+def _normalize(value: Any) -> Any:
+    # Case and whitespace differences do not make a new question; 2.0 == 2
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def question_content_hash(title: str, q_type: QuestionType, options: Optional[list], correct_answers: Optional[list]) -> str:
+    """
+    SHA-256 over the normalized title, type, options and correct answers;
+    the Question.content_hash the importer deduplicates on. Option order
+    counts (students see it), the order of correct answers does not.
+    """
+    answers = sorted((_normalize(a) for a in correct_answers or []), key=_canonical)
+    payload = [_normalize(title), QuestionType(q_type).value, _normalize(options or []), answers]
+    return hashlib.sha256(_canonical(payload).encode()).hexdigest()
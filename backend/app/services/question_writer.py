@@ -0,0 +1,110 @@
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Literal, Sequence
+from sqlalchemy import column, literal_column, or_, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+from app.models.question import Question
+from app.schemas.question_schema import QuestionCreate
+from app.services.question_hash import question_content_hash
+
+DuplicateMode = Literal["skip", "update"]
+
+COLUMNS = ["id", "title", "description", "complexity", "q_type", "options", "correct_answers", "max_score", "tags", "content_hash"]
+# What "update" may change on an existing question; the rest is its content hash
+UPDATABLE = ["description", "complexity", "max_score", "tags"]
+
+# Rows are COPYed here first, then merged into question with one INSERT ... ON CONFLICT
+CREATE_STAGING = (
+    f"CREATE TEMP TABLE IF NOT EXISTS question_import ON COMMIT DROP AS "
+    f"SELECT {', '.join(COLUMNS)} FROM question WITH NO DATA"
+)
+COPY_STAGING = f"COPY question_import ({', '.join(COLUMNS)}) FROM STDIN"
+_staging = table("question_import", *(column(name) for name in COLUMNS))
+
+
+@dataclass
+class WriteResult:
+    ids: List[uuid.UUID]  # one per input row; a duplicate gets the id of the question it matches
+    inserted: int = 0
+    skipped: int = 0  # duplicates left as they were
+    updated: int = 0
+    updated_ids: List[uuid.UUID] = field(default_factory=list)
+
+
+def _json(value):
+    return None if value is None else json.dumps(value)
+
+
+def _copy_cursor(session: Session):
+    # The psycopg connection under the session, inside its current transaction
+    return session.connection().connection.driver_connection.cursor()
+
+
+def write_questions(session: Session, questions: Sequence[QuestionCreate], on_duplicate: DuplicateMode = "skip") -> WriteResult:
+    """
+    Writes validated questions with COPY instead of an ORM INSERT per row.
+    Questions whose content hash already exists (in the bank or earlier in
+    `questions`) are skipped, or with on_duplicate="update" have their
+    description, complexity, max score and tags replaced.
+    Ids of new rows are generated here. Runs in the session's transaction;
+    the caller commits.
+    """
+    hashes = [question_content_hash(q.title, q.q_type, q.options, q.correct_answers) for q in questions]
+    first = {}
+    for q, content_hash in zip(questions, hashes):
+        first.setdefault(content_hash, q)
+    result = WriteResult(ids=[], skipped=len(questions) - len(first))
+    if not first:
+        return result
+
+    session.exec(text(CREATE_STAGING))
+    session.exec(text("TRUNCATE question_import"))
+    with _copy_cursor(session) as cursor, cursor.copy(COPY_STAGING) as copy:
+        for content_hash, q in first.items():
+            copy.write_row((
+                uuid.uuid4(),
+                q.title,
+                q.description,
+                q.complexity,
+                q.q_type.name,  # the enum column stores member names
+                _json(q.options),
+                _json(q.correct_answers),
+                q.max_score,
+                q.tags,
+                content_hash,
+            ))
+
+    # One statement checks the whole batch against the unique hash index
+    stmt = insert(Question).from_select(COLUMNS, select(_staging))
+    if on_duplicate == "update":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Question.content_hash],
+            set_={name: stmt.excluded[name] for name in UPDATABLE},
+            # Unchanged rows are left alone (and not returned)
+            where=or_(*(Question.__table__.c[name].is_distinct_from(stmt.excluded[name]) for name in UPDATABLE)),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Question.content_hash])
+    written = session.exec(stmt.returning(
+        Question.id, Question.content_hash, literal_column("xmax = 0").label("inserted")
+    )).all()
+
+    ids = {}
+    for question_id, content_hash, inserted in written:
+        ids[content_hash] = question_id
+        if inserted:
+            result.inserted += 1
+        else:
+            result.updated += 1
+            result.updated_ids.append(question_id)
+    untouched = [h for h in first if h not in ids]
+    if untouched:
+        ids.update(session.exec(
+            select(Question.content_hash, Question.id).where(Question.content_hash.in_(untouched))
+        ).all())
+        result.skipped += len(untouched)
+
+    result.ids = [ids[content_hash] for content_hash in hashes]
+    return result
@@ -0,0 +1,147 @@
+import time
+import uuid
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Boolean, Float, Uuid, any_, func, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.attempt import AttemptStatus, StudentAnswer, StudentExamAttempt
+from app.models.exam import ExamQuestionLink
+from app.models.question import Question
+from app.schemas.question_schema import RescoreProgress
+from app.services.attempt_grading import unnest_rows
+from app.services.exam_analytics import mark_analytics_stale
+from app.services.grading_service import AnswerKey, compile_answer_key, grade_batch
+
+
+def _page_statement(question_id: uuid.UUID, after: Optional[Tuple[bool, uuid.UUID]], limit: int):
+    # The page is cut from ix_studentanswer_question_graded (question_id = ?
+    # ORDER BY is_graded, id) before any join, so the keyset moves over every
+    # answer. Only answers of submitted attempts to questions still on their
+    # exam count: open attempts are graded at submit with the current key.
+    page = (
+        select(
+            StudentAnswer.id, StudentAnswer.attempt_id, StudentAnswer.selected_options,
+            StudentAnswer.score_awarded, StudentAnswer.is_correct, StudentAnswer.is_graded,
+        )
+        .where(StudentAnswer.question_id == question_id)
+        .order_by(StudentAnswer.is_graded, StudentAnswer.id)
+        .limit(limit)
+    )
+    if after is not None:
+        page = page.where(tuple_(StudentAnswer.is_graded, StudentAnswer.id) > tuple_(*after))
+    page = page.subquery()
+    counts = (StudentExamAttempt.status == AttemptStatus.SUBMITTED) & ExamQuestionLink.question_id.is_not(None)
+    return (
+        select(page, counts.label("counts"))
+        .join(StudentExamAttempt, StudentExamAttempt.id == page.c.attempt_id)
+        .outerjoin(ExamQuestionLink, (ExamQuestionLink.exam_id == StudentExamAttempt.exam_id)
+                   & (ExamQuestionLink.question_id == question_id))
+        .order_by(page.c.is_graded, page.c.id)
+    )
+
+
+async def _rescore_page(
+    session: AsyncSession, question_id: uuid.UUID, key: AnswerKey, rows
+) -> Tuple[int, List[uuid.UUID]]:
+    """Writes the grades of `rows` that changed and moves their attempts' totals; returns (answers, attempt ids)."""
+    grades = grade_batch({question_id: key}, [question_id] * len(rows), [row.selected_options for row in rows])
+    changed = [
+        (row, score, correct)
+        for row, score, correct in zip(rows, grades.scores.tolist(), grades.correct.tolist())
+        if (score, correct, True) != (row.score_awarded, row.is_correct, row.is_graded)
+    ]
+    if not changed:
+        return 0, []
+
+    # Same lock order as submit and the graders: attempts first, by id
+    attempt_ids = sorted({row.attempt_id for row, _, _ in changed})
+    await session.exec(
+        select(StudentExamAttempt.id)
+        .where(StudentExamAttempt.id == any_(literal(attempt_ids, ARRAY(Uuid))))
+        .order_by(StudentExamAttempt.id)
+        .with_for_update()
+    )
+
+    # An answer graded by hand since the page was read keeps its new score
+    graded = unnest_rows(
+        ("id", Uuid, [row.id for row, _, _ in changed]),
+        ("old_score", Float, [row.score_awarded for row, _, _ in changed]),
+        ("score", Float, [score for _, score, _ in changed]),
+        ("correct", Boolean, [correct for _, _, correct in changed]),
+    )
+    written = (
+        update(StudentAnswer)
+        .where(StudentAnswer.id == graded.c.id, StudentAnswer.score_awarded == graded.c.old_score)
+        .values(score_awarded=graded.c.score, is_correct=graded.c.correct, is_graded=True)
+        .returning(StudentAnswer.attempt_id, (graded.c.score - graded.c.old_score).label("delta"))
+        .cte("written")
+    )
+    deltas = (
+        select(written.c.attempt_id, func.sum(written.c.delta).label("delta"), func.count().label("answers"))
+        .group_by(written.c.attempt_id)
+        .subquery()
+    )
+    totals = (await session.exec(
+        update(StudentExamAttempt)
+        .where(StudentExamAttempt.id == deltas.c.attempt_id)
+        .values(total_score=StudentExamAttempt.total_score + deltas.c.delta)
+        .returning(StudentExamAttempt.id, deltas.c.answers)
+        .execution_options(synchronize_session=False)
+    )).all()
+    return sum(row.answers for row in totals), [row.id for row in totals]
+
+
+async def _answer_keys(session: AsyncSession, question_ids: Sequence[uuid.UUID]) -> Dict[uuid.UUID, AnswerKey]:
+    questions = (await session.exec(select(Question).where(Question.id.in_(question_ids)))).all()
+    return {q.id: key for q in questions if (key := compile_answer_key(q)).auto_graded}
+
+
+async def rescore_questions(
+    session_factory: Callable[[], AsyncSession],
+    question_ids: Sequence[uuid.UUID],
+    batch_size: int,
+) -> AsyncIterator[RescoreProgress]:
+    """
+    Regrades the submitted answers to `question_ids` against their current
+    answer keys, e.g. after a key correction, and moves each attempt's
+    total_score by the change. Pages of `batch_size` answers are read
+    through the (question_id, is_graded, id) index and committed one by
+    one, so only the rows of the page in flight are locked; unchanged
+    answers are not written. Safe to run again: a second run changes nothing.
+    Yields the progress after every batch.
+    """
+    question_ids = list(dict.fromkeys(question_ids))
+    async with session_factory() as session:
+        keys = await _answer_keys(session, question_ids)
+    progress = RescoreProgress(
+        question_ids=[q_id for q_id in question_ids if q_id in keys],
+        skipped_ids=[q_id for q_id in question_ids if q_id not in keys],
+    )
+
+    started = time.perf_counter()
+    for question_id in progress.question_ids:
+        after = None
+        while True:
+            async with session_factory() as session:
+                rows = (await session.exec(_page_statement(question_id, after, batch_size))).all()
+                if not rows:
+                    break
+                counted = [row for row in rows if row.counts]
+                answers, attempt_ids = await _rescore_page(session, question_id, keys[question_id], counted)
+                await session.commit()
+                if attempt_ids:
+                    await mark_analytics_stale(session, attempt_ids)
+                    await session.commit()
+            # Rows moved from ungraded to graded come round again, unchanged
+            after = (rows[-1].is_graded, rows[-1].id)
+            progress.answers_checked += len(counted)
+            progress.answers_changed += answers
+            progress.attempts_changed += len(attempt_ids)
+            progress.batches += 1
+            progress.answers_per_second = round(progress.answers_checked / (time.perf_counter() - started), 1)
+            yield progress
+            if len(rows) < batch_size:
+                break
+    progress.done = True
+    yield progress
@@ -0,0 +1,116 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """The fields authorization needs, detached from any session."""
+    id: uuid.UUID
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthUser":
+        return cls(id=user.id, role=user.role, is_active=user.is_active)
+
+
+class UserCache:
+    """
+    Per-process TTL + LRU cache of AuthUser keyed by user id.
+    Changes made through the ORM in this process invalidate the entry
+    (see the listeners below); other workers pick them up within the TTL.
+    A ttl_seconds of 0 disables the cache.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # user id -> (user, expiry on the monotonic clock)
+        self._users: "OrderedDict[uuid.UUID, tuple[AuthUser, float]]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, user_id: uuid.UUID) -> Optional[AuthUser]:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if entry[1] <= time.monotonic():
+                del self._users[user_id]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._users.move_to_end(user_id)
+            self._counters["hits"] += 1
+            return entry[0]
+
+    def put(self, user: AuthUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._users[user.id] = (user, time.monotonic() + self.ttl_seconds)
+            self._users.move_to_end(user.id)
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            if self._users.pop(user_id, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._users),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+user_cache = UserCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+_PENDING_KEY = "auth_user_changes"
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User):
+    # Only ORM flushes are seen here; bulk UPDATE statements must invalidate themselves
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        user_cache.invalidate(target.id)
+        # A request may cache the old row again before this commit lands
+        state.session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User):
+    user_cache.invalidate(target.id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_committed(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,121 @@
+"""
+Exam analytics: full recompute vs. reading the cached report.
+
+Seeds a published exam with --questions single choice questions (key "A")
+and --attempts submitted, graded attempts (one student each, every question
+answered A-D at random) into the database configured by the POSTGRES_*
+variables. Then computes the item analysis --computes times and reads the
+cached report --reads times through GET /attempts/exam/{id}/analytics,
+printing milliseconds per call. Routes are called in-process, so no server
+is needed.
+
+    python -m helper.bench_analytics --attempts 50000 --questions 20
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.api.v1.attempts import get_exam_analytics
+from app.core.database import async_engine, new_async_session, new_session
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.models.user import UserRole
+from app.services.exam_analytics import refresh_exam_analytics
+from app.services.exam_totals import refresh_exam_totals
+from app.services.user_cache import AuthUser
+
+SEED_ATTEMPTS = """
+WITH students AS (
+    INSERT INTO "user" (id, email, hashed_password, role, is_active)
+    SELECT gen_random_uuid(), 'analytics-' || :run || '-' || n || '@example.com', '!', 'STUDENT', true
+    FROM generate_series(1, :attempts) AS n
+    RETURNING id
+)
+INSERT INTO studentexamattempt (id, student_id, exam_id, start_time, submit_time, deadline_at, status, total_score)
+SELECT gen_random_uuid(), id, :exam_id, :start, :start, :start, 'SUBMITTED', 0 FROM students
+"""
+SEED_ANSWERS = """
+INSERT INTO studentanswer (id, attempt_id, question_id, selected_options, score_awarded, is_correct, is_graded)
+SELECT gen_random_uuid(), attempt_id, question_id, json_build_array(pick), (pick = 'A')::int, pick = 'A', true
+FROM (
+    SELECT a.id AS attempt_id, l.question_id, (ARRAY['A', 'B', 'C', 'D'])[1 + floor(random() * 4)::int] AS pick
+    FROM studentexamattempt a JOIN examquestionlink l ON l.exam_id = a.exam_id
+    WHERE a.exam_id = :exam_id
+) answers
+"""
+SEED_TOTALS = """
+UPDATE studentexamattempt a SET total_score = s.total
+FROM (SELECT attempt_id, sum(score_awarded) AS total FROM studentanswer GROUP BY attempt_id) s
+WHERE s.attempt_id = a.id AND a.exam_id = :exam_id
+"""
+
+
+def seed(attempts: int, question_count: int) -> uuid.UUID:
+    with new_session() as session:
+        now = datetime.now()
+        exam = Exam(
+            title=f"Analytics benchmark {now:%Y-%m-%d %H:%M:%S}",
+            start_time=now - timedelta(hours=2), end_time=now - timedelta(minutes=30),
+            duration_minutes=60, is_published=True,
+        )
+        questions = [
+            Question(title=f"Q{i}", type=QuestionType.SINGLE_CHOICE, options=["A", "B", "C", "D"], correct_answers=["A"])
+            for i in range(question_count)
+        ]
+        session.add(exam)
+        session.add_all(questions)
+        session.flush()
+        session.add_all(
+            ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position)
+            for position, q in enumerate(questions, start=1)
+        )
+        refresh_exam_totals(session, [exam.id])
+        params = {"run": uuid.uuid4().hex[:8], "attempts": attempts, "exam_id": exam.id, "start": now - timedelta(hours=2)}
+        session.exec(text(SEED_ATTEMPTS).bindparams(**params))
+        session.exec(text(SEED_ANSWERS).bindparams(exam_id=exam.id))
+        session.exec(text(SEED_TOTALS).bindparams(exam_id=exam.id))
+        session.exec(text("ANALYZE studentexamattempt"))
+        session.exec(text("ANALYZE studentanswer"))
+        session.commit()
+        return exam.id
+
+
+async def read(exam_id: uuid.UUID, reads: int) -> None:
+    admin = AuthUser(id=uuid.uuid4(), role=UserRole.ADMIN, is_active=True)
+    timings = []
+    for _ in range(reads):
+        started = time.perf_counter()
+        async with new_async_session() as session:
+            report = await get_exam_analytics(exam_id, False, session, admin)
+        timings.append((time.perf_counter() - started) * 1000)
+    await async_engine.dispose()
+    print(
+        f"cached read  {reads:>4} reads   median {statistics.median(timings):7.2f} ms  "
+        f"max {max(timings):7.2f} ms  ({len(report.questions)} questions, stale={report.stale})"
+    )
+
+
+def main(args):
+    started = time.perf_counter()
+    exam_id = seed(args.attempts, args.questions)
+    print(f"seeded {args.attempts} attempts x {args.questions} answers in {time.perf_counter() - started:.1f} s")
+    for _ in range(args.computes):
+        started = time.perf_counter()
+        row = refresh_exam_analytics(new_session, exam_id)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"recompute    {row.report['attempt_count']:>6} attempts  {elapsed:8.1f} ms  (report {row.compute_ms:.1f} ms)")
+    asyncio.run(read(exam_id, args.reads))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=50000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--computes", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=200)
+    main(parser.parse_args())
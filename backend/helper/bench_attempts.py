@@ -0,0 +1,150 @@
+"""
+Load test for the exam start, autosave and submit endpoints.
+
+Seeds a published exam and one student per client straight into the
+database configured by the POSTGRES_* variables, then drives a running
+server over HTTP and prints p50/p99 latency and requests per second.
+Every student finally submits twice at once, as timer and student do.
+Run it once against the sync routers and once against the async ones
+(same server flags, same database) to compare.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python -m helper.bench_attempts --url http://127.0.0.1:8000 --clients 1000
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+import httpx
+from app.core.database import new_session
+from app.core.security import create_access_token
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.models.user import User
+from app.services.exam_totals import refresh_exam_totals
+
+
+def seed(clients: int, question_count: int):
+    """Creates one exam and `clients` students; returns (exam_id, question_ids, tokens)."""
+    with new_session() as session:
+        exam = Exam(
+            title=f"Benchmark {datetime.now():%Y-%m-%d %H:%M:%S}",
+            start_time=datetime.now() - timedelta(hours=1),
+            end_time=datetime.now() + timedelta(hours=3),
+            duration_minutes=120,
+            is_published=True,
+        )
+        questions = [
+            Question(title=f"Q{i}", type=QuestionType.SINGLE_CHOICE, options=["A", "B", "C", "D"], correct_answers=["A"])
+            for i in range(question_count)
+        ]
+        run_id = uuid.uuid4().hex[:8]
+        # The password is never checked: tokens are minted directly
+        students = [
+            User(email=f"bench-{run_id}-{i}@example.com", hashed_password="!")
+            for i in range(clients)
+        ]
+        session.add(exam)
+        session.add_all(questions)
+        session.add_all(students)
+        session.flush()
+        session.add_all(
+            ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position)
+            for position, q in enumerate(questions, start=1)
+        )
+        refresh_exam_totals(session, [exam.id])
+        session.commit()
+        return exam.id, [q.id for q in questions], [create_access_token(s.id) for s in students]
+
+
+def report(name: str, latencies: list, errors: int, elapsed: float):
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"{name:>6}: every request failed ({errors} errors)")
+        return
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(
+        f"{name:>6}: {len(latencies)} ok, {errors} errors, "
+        f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, {len(latencies) / elapsed:.0f} req/s"
+    )
+
+
+async def run_phase(name: str, calls: list) -> list:
+    """Fires every call at once; returns the responses (None for failures)."""
+    latencies, errors = [], 0
+
+    async def timed(call):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            response = await call()
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors += 1
+            return None
+        latencies.append(time.perf_counter() - started)
+        return response
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(timed(call) for call in calls))
+    report(name, latencies, errors, time.perf_counter() - started)
+    return responses
+
+
+async def main(args):
+    exam_id, question_ids, tokens = seed(args.clients, args.questions)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        def start(token):
+            return lambda: client.post(f"/api/v1/attempts/start/{exam_id}", headers={"Authorization": f"Bearer {token}"})
+
+        # The first start creates the attempts, the second one resumes them
+        responses = await run_phase("start", [start(token) for token in tokens])
+        await run_phase("resume", [start(token) for token in tokens])
+        attempts = [
+            (token, response.json()["attempt_id"])
+            for token, response in zip(tokens, responses)
+            if response is not None
+        ]
+
+        def save(token, attempt_id, i):
+            payload = {"question_id": str(question_ids[i % len(question_ids)]), "selected_options": ["A"]}
+            return lambda: client.post(
+                f"/api/v1/attempts/{attempt_id}/save",
+                json=payload,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        for round_number in range(args.rounds):
+            await run_phase("save", [
+                save(token, attempt_id, round_number)
+                for token, attempt_id in attempts
+            ])
+
+        def submit(token, attempt_id):
+            return lambda: client.post(
+                f"/api/v1/attempts/{attempt_id}/submit", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        # Exam end: the client timer and the student submit together
+        await run_phase("submit", [
+            submit(token, attempt_id)
+            for token, attempt_id in attempts
+            for _ in range(2)
+        ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=1000, help="concurrent students")
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3, help="autosave rounds, one save per client each")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Deadline sweeper drain rate.
+
+Seeds a published exam with --questions single choice questions and
+--attempts expired, unsubmitted attempts (one student each, every question
+answered) into the database configured by the POSTGRES_* variables, then
+drains them with DeadlineSweeper.drain as the background task would and
+prints attempts per second for each batch size.
+
+    python -m helper.bench_deadline_sweep --attempts 10000 --questions 20 --batch-sizes 50 200 1000
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.core.database import async_engine, new_async_session, new_session
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.services.deadline_sweeper import DeadlineSweeper
+from app.services.exam_totals import refresh_exam_totals
+
+SEED_ATTEMPTS = """
+WITH students AS (
+    INSERT INTO "user" (id, email, hashed_password, role, is_active)
+    SELECT gen_random_uuid(), 'sweep-' || :run || '-' || n || '@example.com', '!', 'STUDENT', true
+    FROM generate_series(1, :attempts) AS n
+    RETURNING id
+)
+INSERT INTO studentexamattempt (id, student_id, exam_id, start_time, deadline_at, status, total_score)
+SELECT gen_random_uuid(), id, :exam_id, :start, :deadline, 'IN_PROGRESS', 0 FROM students
+"""
+SEED_ANSWERS = """
+INSERT INTO studentanswer (id, attempt_id, question_id, selected_options, score_awarded, is_correct, is_graded)
+SELECT gen_random_uuid(), a.id, l.question_id,
+       CASE WHEN random() < 0.6 THEN '["A"]' ELSE '["B"]' END::json, 0, false, false
+FROM studentexamattempt a JOIN examquestionlink l ON l.exam_id = a.exam_id
+WHERE a.exam_id = :exam_id
+"""
+
+
+def seed(attempts: int, question_count: int) -> uuid.UUID:
+    with new_session() as session:
+        now = datetime.now()
+        exam = Exam(
+            title=f"Sweep benchmark {now:%Y-%m-%d %H:%M:%S}",
+            start_time=now - timedelta(hours=2), end_time=now - timedelta(minutes=30),
+            duration_minutes=60, is_published=True,
+        )
+        questions = [
+            Question(title=f"Q{i}", type=QuestionType.SINGLE_CHOICE, options=["A", "B", "C", "D"], correct_answers=["A"])
+            for i in range(question_count)
+        ]
+        session.add(exam)
+        session.add_all(questions)
+        session.flush()
+        session.add_all(
+            ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position)
+            for position, q in enumerate(questions, start=1)
+        )
+        refresh_exam_totals(session, [exam.id])
+        params = {
+            "run": uuid.uuid4().hex[:8], "attempts": attempts, "exam_id": exam.id,
+            "start": now - timedelta(hours=2), "deadline": exam.end_time,
+        }
+        session.exec(text(SEED_ATTEMPTS).bindparams(**params))
+        session.exec(text(SEED_ANSWERS).bindparams(exam_id=exam.id))
+        session.exec(text("ANALYZE studentexamattempt"))
+        session.exec(text("ANALYZE studentanswer"))
+        session.commit()
+        return exam.id
+
+
+async def drain(batch_size: int) -> None:
+    sweeper = DeadlineSweeper(interval=1, batch_size=batch_size, grace_seconds=0)
+    closed = await sweeper.drain(new_async_session)
+    await async_engine.dispose()  # the next asyncio.run gets a new event loop
+    stats = sweeper.stats()
+    print(
+        f"batch {batch_size:>5}: {closed} attempts, {stats['batches']} batches, "
+        f"{stats['attempts_per_second']:.0f} attempts/s, last batch {stats['last_batch_ms']:.0f} ms"
+    )
+
+
+def main(args):
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        seed(args.attempts, args.questions)
+        print(f"seeded {args.attempts} attempts x {args.questions} answers in {time.perf_counter() - started:.1f} s")
+        asyncio.run(drain(batch_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=10000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[50, 200, 1000])
+    main(parser.parse_args())
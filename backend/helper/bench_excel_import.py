@@ -0,0 +1,86 @@
+"""
+Question sheet parsing: streamed batches vs. the former read_excel + iterrows loop.
+
+Generates sheets of valid questions and prints wall time, rows per second
+and the peak Python allocation (tracemalloc, measured in a separate run)
+for both parsers. No database needed.
+
+    python -m helper.bench_excel_import --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from openpyxl import Workbook
+from app.models.question import Question
+from app.schemas.question_schema import QuestionCreate
+from app.services.excel_service import iter_question_batches
+
+COLUMNS = ["title", "description", "complexity", "type", "options", "correct_answers", "max_score", "tags"]
+
+
+def write_sheet(path: str, rows: int):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+    for i in range(rows):
+        sheet.append([
+            f"Question {i}", "Generated", "Class 1", "single_choice",
+            json.dumps(["A", "B", "C", "D"]), json.dumps(["A"]), 1.0, "bench",
+        ])
+    workbook.save(path)
+
+
+def legacy_parse(path: str):
+    """The import loop before streaming: whole sheet in memory, one Series per row."""
+    df = pd.read_excel(path)
+    questions, errors = [], []
+    for index, row in df.iterrows():
+        try:
+            q_data = QuestionCreate(**row.where(pd.notnull(row), None).to_dict())
+            questions.append(Question(
+                title=q_data.title, description=q_data.description, complexity=q_data.complexity,
+                q_type=q_data.q_type, options=q_data.options, correct_answers=q_data.correct_answers,
+                max_score=q_data.max_score, tags=q_data.tags,
+            ))
+        except Exception as e:
+            errors.append(f"Row {index + 2}: {str(e)}")
+    return len(questions)
+
+
+def streamed_parse(path: str):
+    # Questions are dropped after each batch, as an importer that writes them would
+    return sum(len(batch.questions) for batch in iter_question_batches(path))
+
+
+def measure(parse, path: str, rows: int, name: str):
+    started = time.perf_counter()
+    parsed = parse(path)
+    elapsed = time.perf_counter() - started
+    assert parsed == rows, f"{name}: parsed {parsed} of {rows} rows"
+
+    tracemalloc.start()
+    parse(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{rows:>7} rows  {name:<8} {elapsed:8.2f} s  {rows / elapsed:9.0f} rows/s  peak {peak / 2**20:7.1f} MiB")
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            path = os.path.join(tmp, f"questions-{rows}.xlsx")
+            write_sheet(path, rows)
+            if not args.skip_legacy:
+                measure(legacy_parse, path, rows, "legacy")
+            measure(streamed_parse, path, rows, "streamed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--skip-legacy", action="store_true", help="only run the streamed parser")
+    main(parser.parse_args())
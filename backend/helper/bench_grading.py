@@ -0,0 +1,73 @@
+"""
+Grading throughput: grade_answer per answer vs. compiled keys + grade_batch.
+
+Builds --attempts x --questions in-memory answers (a regrade of one exam;
+half single choice, half multi choice, about 60% correct) and grades them
+both ways, checking that the scores agree. No database needed.
+
+    python -m helper.bench_grading --attempts 20000 --questions 50
+"""
+import argparse
+import random
+import time
+import uuid
+from app.models.attempt import StudentAnswer
+from app.models.question import Question, QuestionType
+from app.services.grading_service import compile_answer_key, grade_answer, grade_batch
+
+OPTIONS = ["A", "B", "C", "D", "E"]
+
+
+def make_questions(count: int, rng: random.Random):
+    questions = []
+    for i in range(count):
+        if i % 2:
+            q_type, correct = QuestionType.MULTI_CHOICE, rng.sample(OPTIONS, rng.randint(2, 3))
+        else:
+            q_type, correct = QuestionType.SINGLE_CHOICE, [rng.choice(OPTIONS)]
+        questions.append(Question(
+            id=uuid.uuid4(), title=f"Q{i}", type=q_type, options=OPTIONS, correct_answers=correct, max_score=2.0
+        ))
+    return questions
+
+
+def make_answers(questions, attempts: int, rng: random.Random):
+    answers = []
+    for _ in range(attempts):
+        attempt_id = uuid.uuid4()
+        for q in questions:
+            selected = list(q.correct_answers) if rng.random() < 0.6 else rng.sample(OPTIONS, len(q.correct_answers))
+            rng.shuffle(selected)
+            answers.append(StudentAnswer(attempt_id=attempt_id, question_id=q.id, selected_options=selected))
+    return answers
+
+
+def main(args):
+    rng = random.Random(11)
+    questions = make_questions(args.questions, rng)
+    answers = make_answers(questions, args.attempts, rng)
+    by_id = {q.id: q for q in questions}
+    print(f"{len(answers)} answers ({args.attempts} attempts x {args.questions} questions)")
+
+    started = time.perf_counter()
+    per_answer = [grade_answer(by_id[a.question_id], a) for a in answers]
+    elapsed = time.perf_counter() - started
+    print(f"grade_answer  {elapsed:7.2f} s  {len(answers) / elapsed:10.0f} answers/s")
+
+    # A regrade loads the two columns, not ORM objects
+    question_ids = [a.question_id for a in answers]
+    selections = [a.selected_options for a in answers]
+    started = time.perf_counter()
+    keys = {q.id: compile_answer_key(q) for q in questions}
+    grades = grade_batch(keys, question_ids, selections)
+    batched = time.perf_counter() - started
+    print(f"grade_batch   {batched:7.2f} s  {len(answers) / batched:10.0f} answers/s  ({elapsed / batched:.1f}x)")
+
+    assert grades.scores.tolist() == per_answer, "batched scores differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=50)
+    main(parser.parse_args())
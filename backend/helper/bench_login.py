@@ -0,0 +1,100 @@
+"""
+Login storm vs. autosave latency.
+
+Keeps a fixed set of students autosaving in a loop, first alone and then
+while a burst of logins hits the server, and prints autosave p50/p99 for
+both phases plus the login throughput. Compare runs with different
+PASSWORD_HASH_WORKERS / PASSWORD_BCRYPT_ROUNDS on the server.
+
+    uvicorn app.main:app --port 8000
+    python -m helper.bench_login --url http://127.0.0.1:8000 --savers 200 --logins 500
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+import httpx
+from app.core.config import settings
+from app.core.database import new_session
+from app.core.security import password_context
+from app.models.user import User
+from helper.bench_attempts import report, run_phase, seed
+
+PASSWORD = "bench-password"
+
+
+def seed_login_users(count: int) -> list:
+    """Creates `count` users sharing one password hashed at the configured cost."""
+    hashed = password_context(settings.PASSWORD_BCRYPT_ROUNDS).hash(PASSWORD)
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"login-{run_id}-{i}@example.com" for i in range(count)]
+    with new_session() as session:
+        session.add_all(User(email=email, hashed_password=hashed) for email in emails)
+        session.commit()
+    return emails
+
+
+async def autosave_until(client, savers: list, question_id: str, stop: asyncio.Event) -> list:
+    """Every saver saves in a loop until `stop` is set; returns the latencies."""
+    latencies = []
+
+    async def loop(token, attempt_id):
+        headers = {"Authorization": f"Bearer {token}"}
+        payload = {"question_id": question_id, "selected_options": ["A"]}
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"/api/v1/attempts/{attempt_id}/save", json=payload, headers=headers)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(loop(token, attempt_id) for token, attempt_id in savers))
+    return latencies
+
+
+async def measure_autosave(name: str, client, savers: list, question_id: str, seconds: float):
+    stop = asyncio.Event()
+    task = asyncio.create_task(autosave_until(client, savers, question_id, stop))
+    await asyncio.sleep(seconds)
+    stop.set()
+    report(name, await task, 0, seconds)
+
+
+async def main(args):
+    exam_id, question_ids, tokens = seed(args.savers, 1)
+    emails = seed_login_users(args.logins)
+    limits = httpx.Limits(max_connections=args.savers + args.logins)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        responses = await run_phase("start", [
+            (lambda token=token: client.post(f"/api/v1/attempts/start/{exam_id}", headers={"Authorization": f"Bearer {token}"}))
+            for token in tokens
+        ])
+        savers = [(token, r.json()["attempt_id"]) for token, r in zip(tokens, responses) if r is not None]
+        question_id = str(question_ids[0])
+
+        await measure_autosave("save (idle)", client, savers, question_id, args.seconds)
+
+        stop = asyncio.Event()
+        saving = asyncio.create_task(autosave_until(client, savers, question_id, stop))
+        started = time.perf_counter()
+        await run_phase("login", [
+            (lambda email=email: client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD}))
+            for email in emails
+        ])
+        stop.set()
+        report("save (logins)", await saving, 0, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--savers", type=int, default=200, help="students autosaving in a loop")
+    parser.add_argument("--logins", type=int, default=500, help="logins fired at once")
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of the idle autosave phase")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,129 @@
+"""
+Manual grading throughput: PATCH one answer at a time vs. the grader queue
+plus POST /grading/bulk.
+
+Seeds a published exam with --questions single choice questions and one
+essay question, and --attempts submitted attempts with an ungraded essay
+each, into the database configured by the POSTGRES_* variables. Then grades
+--single essays through the per-answer route and the rest by paging the
+queue and posting --batch-size grades at a time, printing essays per second.
+Routes are called in-process, so no server is needed.
+
+    python -m helper.bench_manual_grading --attempts 3000 --questions 20 --batch-size 500
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.api.v1.attempts import get_grading_queue, grade_answers_bulk, manual_grade_answer
+from app.core.database import async_engine, new_async_session, new_session
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.models.user import UserRole
+from app.schemas.attempt_schema import AnswerGrade, GradeBulk, GradeUpdate
+from app.services.exam_totals import refresh_exam_totals
+from app.services.user_cache import AuthUser
+
+SEED_ATTEMPTS = """
+WITH students AS (
+    INSERT INTO "user" (id, email, hashed_password, role, is_active)
+    SELECT gen_random_uuid(), 'grading-' || :run || '-' || n || '@example.com', '!', 'STUDENT', true
+    FROM generate_series(1, :attempts) AS n
+    RETURNING id
+)
+INSERT INTO studentexamattempt (id, student_id, exam_id, start_time, submit_time, deadline_at, status, total_score)
+SELECT gen_random_uuid(), id, :exam_id, :start, :start, :start, 'SUBMITTED', 0 FROM students
+"""
+# Choice answers come graded; the essay waits for a grader
+SEED_ANSWERS = """
+INSERT INTO studentanswer (id, attempt_id, question_id, selected_options, text_answer, score_awarded, is_correct, is_graded)
+SELECT gen_random_uuid(), a.id, l.question_id,
+       CASE WHEN l.question_id = :essay_id THEN NULL ELSE '["A"]'::json END,
+       CASE WHEN l.question_id = :essay_id THEN 'An essay of some length' END,
+       CASE WHEN l.question_id = :essay_id THEN 0 ELSE 1 END,
+       l.question_id <> :essay_id, l.question_id <> :essay_id
+FROM studentexamattempt a JOIN examquestionlink l ON l.exam_id = a.exam_id
+WHERE a.exam_id = :exam_id
+"""
+
+
+def seed(attempts: int, question_count: int) -> uuid.UUID:
+    """Returns the essay question's id."""
+    with new_session() as session:
+        now = datetime.now()
+        exam = Exam(
+            title=f"Grading benchmark {now:%Y-%m-%d %H:%M:%S}",
+            start_time=now - timedelta(hours=2), end_time=now + timedelta(hours=1),
+            duration_minutes=60, is_published=True,
+        )
+        questions = [
+            Question(title=f"Q{i}", type=QuestionType.SINGLE_CHOICE, options=["A", "B", "C", "D"], correct_answers=["A"])
+            for i in range(question_count)
+        ]
+        essay = Question(title="Essay", type=QuestionType.TEXT, max_score=10.0)
+        session.add(exam)
+        session.add_all([*questions, essay])
+        session.flush()
+        session.add_all(
+            ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position)
+            for position, q in enumerate([*questions, essay], start=1)
+        )
+        refresh_exam_totals(session, [exam.id])
+        params = {"run": uuid.uuid4().hex[:8], "attempts": attempts, "exam_id": exam.id, "start": now - timedelta(hours=1)}
+        session.exec(text(SEED_ATTEMPTS).bindparams(**params))
+        session.exec(text(SEED_ANSWERS).bindparams(exam_id=exam.id, essay_id=essay.id))
+        session.exec(text("ANALYZE studentexamattempt"))
+        session.exec(text("ANALYZE studentanswer"))
+        session.commit()
+        return essay.id
+
+
+async def grade(essay_id: uuid.UUID, single: int, batch_size: int) -> None:
+    grader = AuthUser(id=uuid.uuid4(), role=UserRole.ADMIN, is_active=True)
+    rng = random.Random(5)
+
+    async with new_async_session() as session:
+        page = await get_grading_queue(essay_id, None, single, session, grader)
+    started = time.perf_counter()
+    for answer in page:
+        async with new_async_session() as session:
+            await manual_grade_answer(answer.attempt_id, essay_id, GradeUpdate(score=rng.randint(0, 10)), session, grader)
+    elapsed = time.perf_counter() - started
+    if page:
+        print(f"PATCH per answer  {len(page):>6} essays  {elapsed:7.2f} s  {len(page) / elapsed:8.0f} essays/s")
+
+    # Graded answers leave the queue, so every round reads its first page
+    graded, started = 0, time.perf_counter()
+    while True:
+        async with new_async_session() as session:
+            page = await get_grading_queue(essay_id, None, batch_size, session, grader)
+            if not page:
+                break
+            payload = GradeBulk(grades=[
+                AnswerGrade(attempt_id=a.attempt_id, question_id=essay_id, score=rng.randint(0, 10)) for a in page
+            ])
+            graded += (await grade_answers_bulk(payload, session, grader)).graded_count
+    elapsed = time.perf_counter() - started
+    print(f"queue + bulk      {graded:>6} essays  {elapsed:7.2f} s  {graded / elapsed:8.0f} essays/s  (batch {batch_size})")
+    await async_engine.dispose()
+
+
+def main(args):
+    started = time.perf_counter()
+    essay_id = seed(args.attempts, args.questions)
+    print(f"seeded {args.attempts} attempts x {args.questions + 1} answers in {time.perf_counter() - started:.1f} s")
+    asyncio.run(grade(essay_id, min(args.single, args.attempts), args.batch_size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=3000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--single", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=500)
+    main(parser.parse_args())
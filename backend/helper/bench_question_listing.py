@@ -0,0 +1,123 @@
+"""
+Question bank listing latency at scale.
+
+Seeds --rows questions (with COPY, as the importer writes them) into the
+database configured by the POSTGRES_* variables, then times each kind of
+GET /questions page through the route function and prints p50/p99. The
+OFFSET query the endpoint used to run is timed for the same deep page.
+The seeded rows are deleted afterwards.
+
+    python -m helper.bench_question_listing --rows 500000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+from sqlalchemy import delete, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.v1.questions import list_questions
+from app.core.database import async_engine, new_session
+from app.models.question import Question, QuestionType
+from app.schemas.question_schema import QuestionCreate
+from app.services.question_writer import write_questions
+
+WORDS = (
+    "cell energy force motion plant water light atom number equation triangle angle "
+    "history river mountain language grammar poem market trade climate volcano"
+).split()
+TAGS = ["math", "physics", "biology", "chemistry", "history", "geography", "english", "economics"]
+COMPLEXITIES = ["Class 1", "Class 2", "Class 3", "Easy", "Medium", "Hard"]
+
+
+def make_rows(count: int, tag: str, rng: random.Random):
+    for i in range(count):
+        yield QuestionCreate(
+            title=f"{' '.join(rng.choices(WORDS, k=5))} {i}",
+            description=" ".join(rng.choices(WORDS, k=12)),
+            complexity=rng.choice(COMPLEXITIES),
+            type=rng.choice(list(QuestionType)),
+            options=["A", "B", "C", "D"], correct_answers=["A"],
+            tags=[tag, *rng.sample(TAGS, 2)],
+        )
+
+
+def seed(count: int, tag: str, batch_size: int = 5000):
+    rows = make_rows(count, tag, random.Random(7))
+    while batch := list(itertools.islice(rows, batch_size)):
+        with new_session() as session:
+            write_questions(session, batch)
+            session.commit()
+    with new_session() as session:
+        session.exec(text("ANALYZE question"))
+        session.commit()
+
+
+async def deep_id(session: AsyncSession, offset: int):
+    return (await session.exec(select(Question.id).order_by(Question.id).offset(offset).limit(1))).one()
+
+
+async def measure(name: str, run, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSession(async_engine) as session:
+            started = time.perf_counter()
+            rows = await run(session)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:<28} {len(rows):>5} rows  p50 {statistics.median(timings):7.1f} ms  p99 {p99:7.1f} ms")
+
+
+def page(**filters):
+    params = dict(after_id=None, limit=100, q_type=None, complexity=None, tags=[], search=None)
+    params.update(filters)
+    return lambda session: list_questions(**params, session=session, current_user=None)
+
+
+async def run(args):
+    async with AsyncSession(async_engine) as session:
+        deep = await deep_id(session, args.rows - 200)
+
+    async def offset_page(session):
+        statement = select(Question).order_by(Question.id).offset(args.rows - 200).limit(100)
+        return (await session.exec(statement)).all()
+
+    cases = {
+        "first page": page(),
+        "deep page (after_id)": page(after_id=deep),
+        "deep page (OFFSET)": offset_page,
+        "type": page(q_type=QuestionType.TEXT),
+        "complexity + type": page(complexity="Hard", q_type=QuestionType.MULTI_CHOICE),
+        "complexity, deep": page(complexity="Hard", after_id=deep),
+        "tag": page(tags=["physics"]),
+        "two tags": page(tags=["physics", "history"]),
+        "search, common word": page(search="energy"),
+        "search, phrase": page(search='"plant water"'),
+        "search + tag + complexity": page(search="volcano -river", tags=["math"], complexity="Easy"),
+    }
+    for name, case in cases.items():
+        await measure(name, case, args.repeat)
+    await async_engine.dispose()
+
+
+def main(args):
+    tag = f"bench-{time.time_ns()}"
+    started = time.perf_counter()
+    seed(args.rows, tag)
+    print(f"seeded {args.rows} questions in {time.perf_counter() - started:.1f} s")
+    try:
+        asyncio.run(run(args))
+    finally:
+        with new_session() as session:
+            session.exec(delete(Question).where(Question.tags.contains([tag])))
+            session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
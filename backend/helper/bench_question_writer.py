@@ -0,0 +1,73 @@
+"""
+Writing imported questions: ORM add_all vs. COPY (question_writer).
+
+Writes the same validated rows both ways into the database configured by
+the POSTGRES_* variables, in batches of --batch-size rows with one commit
+per batch (as an import job does), and prints rows per second. The COPY
+writer then gets the same rows again, which are all skipped as
+duplicates (a re-uploaded sheet). The inserted rows are deleted afterwards.
+
+    python -m helper.bench_question_writer --rows 100000 --batch-size 1000
+"""
+import argparse
+import time
+from sqlalchemy import delete
+from app.core.database import new_session
+from app.models.question import Question
+from app.schemas.question_schema import QuestionCreate
+from app.services.excel_service import _to_question
+from app.services.question_writer import write_questions
+
+
+def make_rows(count: int, tag: str):
+    return [
+        QuestionCreate(
+            title=f"Question {i}", description="Generated", complexity="Class 1", type="single_choice",
+            options=["A", "B", "C", "D"], correct_answers=["A"], max_score=1.0, tags=tag,
+        )
+        for i in range(count)
+    ]
+
+
+def orm_write(session, rows):
+    session.add_all(_to_question(q) for q in rows)
+
+
+def copy_write(session, rows):
+    write_questions(session, rows)
+
+
+def cleanup(tag: str):
+    with new_session() as session:
+        session.exec(delete(Question).where(Question.tags.contains([tag])))
+        session.commit()
+
+
+def measure(name: str, write, rows, batch_size: int):
+    started = time.perf_counter()
+    for start in range(0, len(rows), batch_size):
+        with new_session() as session:
+            write(session, rows[start:start + batch_size])
+            session.commit()
+    elapsed = time.perf_counter() - started
+    print(f"{len(rows):>7} rows  {name:<10} {elapsed:8.2f} s  {len(rows) / elapsed:9.0f} rows/s")
+
+
+def main(args):
+    tag = f"bench-{time.time_ns()}"
+    rows = make_rows(args.rows, tag)
+    if not args.skip_orm:
+        # ORM rows carry no content hash; remove them so COPY starts from the same bank
+        measure("orm", orm_write, rows, args.batch_size)
+        cleanup(tag)
+    measure("copy", copy_write, rows, args.batch_size)
+    measure("duplicates", copy_write, rows, args.batch_size)
+    cleanup(tag)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--skip-orm", action="store_true", help="only run the COPY writer")
+    main(parser.parse_args())
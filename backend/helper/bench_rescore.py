@@ -0,0 +1,119 @@
+"""
+Rescore after an answer key correction.
+
+Seeds a published exam with --questions single choice questions (key "A")
+and --attempts submitted, graded attempts (one student each, every question
+answered, about half of them "B") into the database configured by the
+POSTGRES_* variables. Then moves one question's key to "B" and rescores it
+with each batch size, flipping the key back in between, and prints answers
+per second. A second rescore with nothing to change is timed as well.
+
+    python -m helper.bench_rescore --attempts 50000 --questions 20 --batch-sizes 1000 5000 20000
+
+Use a throwaway database: the seeded rows are not removed.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import text, update
+from app.core.database import async_engine, new_async_session, new_session
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.services.exam_totals import refresh_exam_totals
+from app.services.rescore import rescore_questions
+
+SEED_ATTEMPTS = """
+WITH students AS (
+    INSERT INTO "user" (id, email, hashed_password, role, is_active)
+    SELECT gen_random_uuid(), 'rescore-' || :run || '-' || n || '@example.com', '!', 'STUDENT', true
+    FROM generate_series(1, :attempts) AS n
+    RETURNING id
+)
+INSERT INTO studentexamattempt (id, student_id, exam_id, start_time, submit_time, deadline_at, status, total_score)
+SELECT gen_random_uuid(), id, :exam_id, :start, :start, :start, 'SUBMITTED', 0 FROM students
+"""
+SEED_ANSWERS = """
+INSERT INTO studentanswer (id, attempt_id, question_id, selected_options, score_awarded, is_correct, is_graded)
+SELECT gen_random_uuid(), attempt_id, question_id, json_build_array(pick), (pick = 'A')::int, pick = 'A', true
+FROM (
+    SELECT a.id AS attempt_id, l.question_id, CASE WHEN random() < 0.5 THEN 'A' ELSE 'B' END AS pick
+    FROM studentexamattempt a JOIN examquestionlink l ON l.exam_id = a.exam_id
+    WHERE a.exam_id = :exam_id
+) answers
+"""
+SEED_TOTALS = """
+UPDATE studentexamattempt a SET total_score = s.total
+FROM (SELECT attempt_id, sum(score_awarded) AS total FROM studentanswer GROUP BY attempt_id) s
+WHERE s.attempt_id = a.id AND a.exam_id = :exam_id
+"""
+
+
+def seed(attempts: int, question_count: int) -> uuid.UUID:
+    """Returns the id of the question whose key gets corrected."""
+    with new_session() as session:
+        now = datetime.now()
+        exam = Exam(
+            title=f"Rescore benchmark {now:%Y-%m-%d %H:%M:%S}",
+            start_time=now - timedelta(hours=2), end_time=now - timedelta(minutes=30),
+            duration_minutes=60, is_published=True,
+        )
+        questions = [
+            Question(title=f"Q{i}", type=QuestionType.SINGLE_CHOICE, options=["A", "B", "C", "D"], correct_answers=["A"])
+            for i in range(question_count)
+        ]
+        session.add(exam)
+        session.add_all(questions)
+        session.flush()
+        session.add_all(
+            ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position)
+            for position, q in enumerate(questions, start=1)
+        )
+        refresh_exam_totals(session, [exam.id])
+        params = {"run": uuid.uuid4().hex[:8], "attempts": attempts, "exam_id": exam.id, "start": now - timedelta(hours=2)}
+        session.exec(text(SEED_ATTEMPTS).bindparams(**params))
+        session.exec(text(SEED_ANSWERS).bindparams(exam_id=exam.id))
+        session.exec(text(SEED_TOTALS).bindparams(exam_id=exam.id))
+        session.exec(text("ANALYZE studentexamattempt"))
+        session.exec(text("ANALYZE studentanswer"))
+        session.commit()
+        return questions[0].id
+
+
+def set_key(question_id: uuid.UUID, key: str) -> None:
+    with new_session() as session:
+        session.exec(update(Question).where(Question.id == question_id).values(correct_answers=[key]))
+        session.commit()
+
+
+async def rescore(question_id: uuid.UUID, batch_size: int, label: str) -> None:
+    started = time.perf_counter()
+    async for progress in rescore_questions(new_async_session, [question_id], batch_size):
+        pass
+    elapsed = time.perf_counter() - started
+    await async_engine.dispose()  # the next asyncio.run gets a new event loop
+    print(
+        f"{label:<10} batch {batch_size:>6}: {progress.answers_checked} checked, {progress.answers_changed} changed, "
+        f"{progress.attempts_changed} totals, {progress.batches} batches, {elapsed:6.2f} s, "
+        f"{progress.answers_checked / elapsed:8.0f} answers/s"
+    )
+
+
+def main(args):
+    started = time.perf_counter()
+    question_id = seed(args.attempts, args.questions)
+    print(f"seeded {args.attempts} attempts x {args.questions} answers in {time.perf_counter() - started:.1f} s")
+    keys = ["B", "A"]
+    for i, batch_size in enumerate(args.batch_sizes):
+        set_key(question_id, keys[i % 2])
+        asyncio.run(rescore(question_id, batch_size, "corrected"))
+        asyncio.run(rescore(question_id, batch_size, "unchanged"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=50000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    main(parser.parse_args())
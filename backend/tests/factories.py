@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.user import User
+from app.models.exam import Exam, ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.models.attempt import StudentExamAttempt
+from app.services.exam_totals import refresh_exam_totals
+
+
+def create_question(session, title="Q", q_type=QuestionType.SINGLE_CHOICE, correct_answers=("A",), max_score=1.0):
+    question = Question(
+        title=title,
+        type=q_type,
+        options=["A", "B", "C"],
+        correct_answers=list(correct_answers),
+        max_score=max_score,
+    )
+    session.add(question)
+    session.commit()
+    return question
+
+
+def create_exam_with_questions(session, count=3):
+    """Helper to create a published exam with `count` single choice questions"""
+    exam = Exam(
+        title="Math",
+        start_time=datetime.now() - timedelta(hours=1),
+        end_time=datetime.now() + timedelta(hours=1),
+        duration_minutes=60,
+        is_published=True,
+    )
+    session.add(exam)
+    session.commit()
+    questions = [create_question(session, title=f"Q{i}") for i in range(count)]
+    for position, q in enumerate(questions, start=1):
+        session.add(ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position))
+    refresh_exam_totals(session, [exam.id])
+    session.commit()
+    return exam, questions
+
+
+def create_student(session, email="student@example.com"):
+    student = User(email=email, hashed_password="x")
+    session.add(student)
+    session.commit()
+    return student
+
+
+def create_attempt(session, exam, student):
+    attempt = StudentExamAttempt(student_id=student.id, exam_id=exam.id)
+    attempt.deadline_at = min(attempt.start_time + timedelta(minutes=exam.duration_minutes), exam.end_time)
+    session.add(attempt)
+    session.commit()
+    return attempt
+
+
+def run_async(async_engine, call):
+    """Runs `call(async_session)` (e.g. an async route) on a fresh event loop"""
+    async def main():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await call(session)
+    return asyncio.run(main())
+
+
+@contextmanager
+def count_queries(engine):
+    """Counts the SQL statements sent to the database inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from sqlmodel import Session
+from app.api.v1.attempts import get_exam_analytics, submit_exam
+from app.models.attempt import StudentAnswer
+from app.services.exam_analytics import AnalyticsRefresher, refresh_exam_analytics
+from tests.factories import create_attempt, create_exam_with_questions, create_student, run_async
+
+
+def submit_answers(session, async_engine, exam, questions, picks, email):
+    """Starts and submits an attempt answering questions[i] with picks[i] (None leaves it unanswered)"""
+    student = create_student(session, email)
+    attempt = create_attempt(session, exam, student)
+    session.add_all(
+        StudentAnswer(attempt_id=attempt.id, question_id=q.id, selected_options=[pick])
+        for q, pick in zip(questions, picks) if pick is not None
+    )
+    session.commit()
+    session.refresh(student)
+    session.expunge(student)
+    return run_async(async_engine, lambda db: submit_exam(attempt.id, db, student))
+
+
+def test_report_item_analysis(session, db_engine, async_engine):
+    exam, questions = create_exam_with_questions(session)  # key "A" each, 1 point
+    picks = [[" a", "A", "A"], ["A", "A", "B"], ["A", "B", "C"], ["B", "B", None]]
+    for i, row in enumerate(picks):
+        submit_answers(session, async_engine, exam, questions, row, f"s{i}@example.com")
+
+    report = refresh_exam_analytics(lambda: Session(db_engine), exam.id).report
+    assert report["attempt_count"] == 4 and report["max_possible_score"] == 3.0
+    assert (report["mean"], report["min"], report["max"]) == (1.5, 0.0, 3.0)
+    assert report["percentiles"]["p50"] == 1.5
+    assert sum(report["histogram"]["counts"]) == 4 and report["histogram"]["edges"][-1] == 3.0
+
+    totals = np.array([3.0, 2.0, 1.0, 0.0])
+    first, second, third = report["questions"]
+    assert [q["question_id"] for q in report["questions"]] == [str(q.id) for q in questions]
+    assert [q["difficulty"] for q in report["questions"]] == [0.75, 0.5, 0.25]
+    # Upper and lower group: the best and the worst attempt
+    assert [q["discrimination"] for q in report["questions"]] == [1.0, 1.0, 1.0]
+    item = np.array([1.0, 1.0, 1.0, 0.0])
+    assert first["point_biserial"] == pytest.approx(np.corrcoef(item, totals - item)[0, 1], abs=1e-4)
+    assert (first["answered"], third["answered"]) == (4, 3)
+
+    options = {o["value"]: (o["count"], o["share"], o["is_key"]) for o in first["options"]}
+    assert options == {"a": (3, 0.75, True), "b": (1, 0.25, False), "c": (0, 0.0, False)}
+    assert [(o["value"], o["count"]) for o in third["options"]] == [("a", 1), ("b", 1), ("c", 1)]
+    assert second["mean_score"] == 0.5
+
+
+def test_submit_flags_analytics_until_the_refresher_runs(session, db_engine, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    submit_answers(session, async_engine, exam, questions, ["A", "B", "A"], "first@example.com")
+
+    def analytics():
+        return run_async(async_engine, lambda db: get_exam_analytics(exam.id, False, db, None))
+
+    refresh_exam_analytics(lambda: Session(db_engine), exam.id)
+    cached = analytics()
+    assert (cached.attempt_count, cached.stale) == (1, False)
+
+    submit_answers(session, async_engine, exam, questions, ["A", "A", "A"], "second@example.com")
+    stale = analytics()
+    assert (stale.attempt_count, stale.stale, stale.computed_at) == (1, True, cached.computed_at)
+
+    refresher = AnalyticsRefresher(interval=1)
+    assert refresher.refresh_stale(lambda: Session(db_engine)) == 1
+    assert refresher.refresh_stale(lambda: Session(db_engine)) == 0
+    current = analytics()
+    assert (current.attempt_count, current.stale, current.mean) == (2, False, 2.5)
+    assert current.computed_at > cached.computed_at
+    assert refresher.stats()["refreshed"] == 1
@@ -0,0 +1,323 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.attempt import StudentAnswer, StudentExamAttempt, AttemptStatus
+from app.models.exam import ExamQuestionLink
+from app.models.question import QuestionType
+from app.schemas.attempt_schema import AnswerSave, AnswerBulkSave, AnswerGrade, GradeBulk
+from app.schemas.exam_schema import ExamQuestionAdd
+from app.api.v1.attempts import (
+    start_or_resume_exam, save_answer, save_answers_bulk, get_my_attempts,
+    get_exam_results, stream_exam_results, submit_exam, grade_answers_bulk, get_grading_queue,
+)
+from app.api.v1.exams import add_questions_to_exam
+from tests.factories import (
+    count_queries, create_exam_with_questions, create_student, create_attempt, create_question, run_async,
+)
+
+
+def test_bulk_save_upserts_answers(session, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    student = create_student(session)
+    attempt = create_attempt(session, exam, student)
+
+    # An earlier single save is overwritten by the bulk save
+    single = AnswerSave(question_id=questions[0].id, selected_options=["B"])
+    run_async(async_engine, lambda db: save_answer(attempt.id, single, db, student))
+
+    payload = AnswerBulkSave(answers=[
+        AnswerSave(question_id=questions[0].id, selected_options=["A"]),
+        AnswerSave(question_id=questions[1].id, selected_options=["B"]),
+    ])
+    result = run_async(async_engine, lambda db: save_answers_bulk(attempt.id, payload, db, student))
+
+    assert result.saved_count == 2
+    assert all(r.saved for r in result.results)
+
+    answers = session.exec(
+        select(StudentAnswer).where(StudentAnswer.attempt_id == attempt.id)
+    ).all()
+    by_question = {a.question_id: a.selected_options for a in answers}
+    assert len(answers) == 2
+    assert by_question[questions[0].id] == ["A"]
+    assert by_question[questions[1].id] == ["B"]
+
+
+def test_bulk_save_rejects_foreign_questions(session, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    student = create_student(session)
+    attempt = create_attempt(session, exam, student)
+    unknown_id = uuid4()
+
+    payload = AnswerBulkSave(answers=[
+        AnswerSave(question_id=questions[0].id, selected_options=["B"]),
+        AnswerSave(question_id=questions[0].id, selected_options=["A"]),  # last write wins
+        AnswerSave(question_id=unknown_id, selected_options=["A"]),
+    ])
+    result = run_async(async_engine, lambda db: save_answers_bulk(attempt.id, payload, db, student))
+
+    assert result.saved_count == 1
+    assert [(r.question_id, r.saved) for r in result.results] == [
+        (questions[0].id, True),
+        (unknown_id, False),
+    ]
+    answer = session.exec(
+        select(StudentAnswer).where(StudentAnswer.attempt_id == attempt.id)
+    ).one()
+    assert answer.selected_options == ["A"]
+
+
+def test_start_serves_cached_paper_until_exam_changes(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=2)
+    student = create_student(session)
+
+    def start():
+        return json.loads(run_async(async_engine, lambda db: start_or_resume_exam(exam.id, db, student)).body)
+
+    state = start()
+    assert {q["id"] for q in state["questions"]} == {str(q.id) for q in questions}
+    assert "correct_answers" not in state["questions"][0]
+    assert state["saved_answers"] == []
+
+    extra = create_question(session, title="Extra")
+    payload = ExamQuestionAdd(question_ids=[extra.id])
+    run_async(async_engine, lambda db: add_questions_to_exam(exam.id, payload, db, None))
+
+    state = start()
+    assert len(state["questions"]) == 3
+
+
+def test_start_counts_down_to_exam_end(session, async_engine):
+    exam, _ = create_exam_with_questions(session)
+    exam.end_time = datetime.now() + timedelta(minutes=10)  # before the 60 minutes are up
+    session.add(exam)
+    session.commit()
+    student = create_student(session)
+
+    state = json.loads(run_async(async_engine, lambda db: start_or_resume_exam(exam.id, db, student)).body)
+
+    attempt = session.get(StudentExamAttempt, state["attempt_id"])
+    assert attempt.deadline_at == exam.end_time
+    assert 590 < state["remaining_seconds"] <= 600
+
+
+def create_history(session, student, count):
+    """Helper: one attempt per new exam, one minute apart"""
+    started = datetime.now() - timedelta(days=1)
+    for i in range(count):
+        exam, _ = create_exam_with_questions(session, count=2)
+        session.add(StudentExamAttempt(
+            student_id=student.id,
+            exam_id=exam.id,
+            start_time=started + timedelta(minutes=i),
+            status=AttemptStatus.SUBMITTED if i % 2 else AttemptStatus.IN_PROGRESS,
+        ))
+    session.commit()
+
+
+def test_history_query_count_is_constant(session, async_engine):
+    few, many = create_student(session, "few@example.com"), create_student(session, "many@example.com")
+    create_history(session, few, 2)
+    create_history(session, many, 20)
+
+    counts = []
+    for student in (few, many):
+        session.refresh(student)  # the request already has its user loaded
+        with count_queries(async_engine.sync_engine) as statements:
+            history = run_async(async_engine, lambda db: get_my_attempts(None, None, None, 100, db, student))
+        counts.append(len(statements))
+        assert all(item.max_possible_score == 2.0 for item in history)
+
+    assert counts == [1, 1]
+
+
+def test_history_keyset_pagination_and_status_filter(session, async_engine):
+    student = create_student(session)
+    create_history(session, student, 5)
+
+    def history(*args):
+        return run_async(async_engine, lambda db: get_my_attempts(*args, db, student))
+
+    first_page = history(None, None, None, 2)
+    last = first_page[-1]
+    rest = history(None, last.start_time, last.id, 100)
+
+    all_items = first_page + rest
+    assert len(all_items) == 5
+    assert [a.start_time for a in all_items] == sorted((a.start_time for a in all_items), reverse=True)
+
+    submitted = history(AttemptStatus.SUBMITTED, None, None, 100)
+    assert len(submitted) == 2
+    assert all(a.status == AttemptStatus.SUBMITTED for a in submitted)
+
+
+def create_results(session, exam, scores):
+    """Helper: one submitted attempt per score, each by a new student"""
+    for i, score in enumerate(scores):
+        student = create_student(session, f"s{i}@example.com")
+        student.full_name = f"Student {i}"
+        session.add(StudentExamAttempt(
+            student_id=student.id, exam_id=exam.id,
+            status=AttemptStatus.SUBMITTED, total_score=score,
+        ))
+    session.commit()
+
+
+def test_exam_results_keyset_pages(session, async_engine):
+    exam, _ = create_exam_with_questions(session)
+    create_results(session, exam, [3.0, 1.0, 2.0, 2.0, 0.0])
+
+    pages, after_score, after_id = [], None, None
+    while True:
+        page = run_async(async_engine, lambda db: get_exam_results(exam.id, after_score, after_id, 2, db, None))
+        if not page:
+            break
+        pages.append(page)
+        after_score, after_id = page[-1].total_score, page[-1].id
+
+    rows = [row for page in pages for row in page]
+    assert [r.total_score for r in rows] == [3.0, 2.0, 2.0, 1.0, 0.0]
+    assert len({r.id for r in rows}) == 5
+    assert rows[0].student_email.endswith("@example.com")
+
+
+def test_exam_results_export_streams_csv_and_ndjson(session, async_engine):
+    exam, _ = create_exam_with_questions(session)
+    create_results(session, exam, [1.0, 2.0])
+
+    def export(fmt):
+        async def collect():
+            chunks = stream_exam_results(exam.id, fmt, lambda: AsyncSession(async_engine))
+            return "".join([chunk async for chunk in chunks])
+        return asyncio.run(collect()).splitlines()
+
+    csv_lines = export("csv")
+    assert csv_lines[0].startswith("id,student_id,student_name,student_email")
+    assert len(csv_lines) == 3
+
+    ndjson = export("ndjson")
+    assert [json.loads(line)["total_score"] for line in ndjson] == [2.0, 1.0]
+
+
+def test_parallel_starts_create_one_attempt(session, async_engine):
+    exam, _ = create_exam_with_questions(session)
+    student = create_student(session)
+    session.refresh(student)
+    session.expunge(student)
+
+    async def start():
+        # One session (and connection) per concurrent request
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            response = await start_or_resume_exam(exam.id, db, student)
+            return json.loads(response.body)["attempt_id"]
+
+    async def start_all(workers):
+        return await asyncio.gather(*(start() for _ in range(workers)))
+
+    attempt_ids = asyncio.run(start_all(16))
+
+    assert len(set(attempt_ids)) == 1
+    count = session.exec(
+        select(func.count()).select_from(StudentExamAttempt).where(StudentExamAttempt.exam_id == exam.id)
+    ).one()
+    assert count == 1
+
+
+def test_concurrent_submits_grade_once(session, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    student = create_student(session)
+    attempt = create_attempt(session, exam, student)
+    stray = create_question(session, title="Not on the exam")
+    session.add_all([
+        StudentAnswer(attempt_id=attempt.id, question_id=questions[0].id, selected_options=["a"]),
+        StudentAnswer(attempt_id=attempt.id, question_id=questions[1].id, selected_options=["B"]),
+        StudentAnswer(attempt_id=attempt.id, question_id=stray.id, selected_options=["A"]),
+    ])
+    session.commit()
+    session.refresh(student)
+    session.expunge(student)
+
+    async def submit():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            return await submit_exam(attempt.id, db, student)
+
+    async def submit_all(workers):
+        return await asyncio.gather(*(submit() for _ in range(workers)))
+
+    with count_queries(async_engine.sync_engine) as statements:
+        results = asyncio.run(submit_all(8))
+
+    assert {(r.status, r.total_score, r.max_possible_score) for r in results} == {(AttemptStatus.SUBMITTED, 1.0, 3.0)}
+    # One submit claims and grades (claim, load, two write-backs) and flags the
+    # exam's analytics stale; the others read the result
+    assert len([s for s in statements if s.lstrip().startswith("UPDATE")]) == 8 + 3
+    assert len(statements) == 8 + 3 + 7 + 1
+
+    session.expire_all()
+    answers = {a.question_id: a for a in session.exec(select(StudentAnswer)).all()}
+    assert (answers[questions[0].id].score_awarded, answers[questions[0].id].is_correct) == (1.0, True)
+    assert (answers[questions[1].id].score_awarded, answers[questions[1].id].is_graded) == (0.0, True)
+    assert not answers[stray.id].is_graded
+    assert session.get(StudentExamAttempt, attempt.id).total_score == 1.0
+
+
+def test_bulk_grading_moves_totals_by_the_change(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=1)
+    essays = [create_question(session, title=f"Essay {i}", q_type=QuestionType.TEXT, max_score=5.0) for i in range(2)]
+    for position, q in enumerate(essays, start=2):
+        session.add(ExamQuestionLink(exam_id=exam.id, question_id=q.id, position=position))
+    stray = create_question(session, title="Not on the exam")
+    first, second, late = (create_student(session, f"s{i}@example.com") for i in range(3))
+    attempts = [create_attempt(session, exam, s) for s in (first, second, late)]
+    for attempt, total in zip(attempts[:2], (1.0, 0.0)):
+        attempt.status, attempt.total_score = AttemptStatus.SUBMITTED, total
+    session.add_all([
+        StudentAnswer(attempt_id=attempts[0].id, question_id=questions[0].id, score_awarded=1.0, is_graded=True),
+        StudentAnswer(attempt_id=attempts[0].id, question_id=essays[0].id, text_answer="Because"),
+        StudentAnswer(attempt_id=attempts[2].id, question_id=essays[0].id, text_answer="Still writing"),
+    ])
+    session.commit()
+    first_id, second_id, late_id = (a.id for a in attempts)
+    essay_id, blank_id = essays[0].id, essays[1].id
+
+    # Only answers of submitted attempts wait for a grade
+    queue = run_async(async_engine, lambda db: get_grading_queue(essay_id, None, 100, db, first))
+    assert [(a.attempt_id, a.text_answer) for a in queue] == [(first_id, "Because")]
+
+    payload = GradeBulk(grades=[
+        AnswerGrade(attempt_id=first_id, question_id=essay_id, score=4.0),
+        AnswerGrade(attempt_id=first_id, question_id=essay_id, score=5.0),  # last write wins
+        AnswerGrade(attempt_id=second_id, question_id=blank_id, score=3.0),  # left blank: created
+        AnswerGrade(attempt_id=second_id, question_id=essay_id, score=6.0),
+        AnswerGrade(attempt_id=first_id, question_id=stray.id, score=1.0),
+        AnswerGrade(attempt_id=late_id, question_id=essay_id, score=1.0),
+        AnswerGrade(attempt_id=uuid4(), question_id=essay_id, score=1.0),
+    ])
+    with count_queries(async_engine.sync_engine) as statements:
+        result = run_async(async_engine, lambda db: grade_answers_bulk(payload, db, first))
+
+    # Lock, load, upsert, totals; then the analytics flag
+    assert len(statements) == 5
+    assert result.graded_count == 2
+    assert {(t.attempt_id, t.total_score) for t in result.totals} == {(first_id, 6.0), (second_id, 3.0)}
+    assert sorted(r.detail for r in result.rejected) == [
+        "Attempt is not submitted", "Attempt not found",
+        "Question is not part of this exam", "Score exceeds the question's max score",
+    ]
+
+    # A regrade moves the total by the difference
+    payload = GradeBulk(grades=[AnswerGrade(attempt_id=first_id, question_id=essay_id, score=2.0)])
+    result = run_async(async_engine, lambda db: grade_answers_bulk(payload, db, first))
+    assert [(t.attempt_id, t.total_score) for t in result.totals] == [(first_id, 3.0)]
+
+    session.expire_all()
+    assert session.get(StudentExamAttempt, late_id).total_score == 0.0
+    answer = session.exec(select(StudentAnswer).where(
+        StudentAnswer.attempt_id == second_id, StudentAnswer.question_id == blank_id
+    )).one()
+    assert (answer.score_awarded, answer.is_graded, answer.is_correct) == (3.0, True, False)
+    assert run_async(async_engine, lambda db: get_grading_queue(essay_id, None, 100, db, first)) == []
@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+from uuid import uuid4
+from sqlmodel import Session, select
+from app.api.v1.attempts import submit_exam
+from app.models.attempt import StudentAnswer, AttemptStatus
+from app.schemas.attempt_schema import AnswerSave
+from app.services.autosave_buffer import AnswerBuffer, InMemoryAnswerBuffer, check_write_behind
+from tests.factories import create_exam_with_questions, create_student, create_attempt, run_async
+
+
+def test_last_write_wins_and_counts_coalesced():
+    buffer = InMemoryAnswerBuffer(max_bytes=1024 * 1024)
+    attempt_id, question_id = uuid4(), uuid4()
+
+    buffer.put(attempt_id, [AnswerSave(question_id=question_id, selected_options=["A"])])
+    buffer.put(attempt_id, [AnswerSave(question_id=question_id, selected_options=["B"])])
+
+    stats = buffer.stats()
+    assert stats["answers_received"] == 2
+    assert stats["coalesced_writes"] == 1
+    assert stats["buffered_answers"] == 1
+
+
+def test_put_reports_byte_limit():
+    buffer = InMemoryAnswerBuffer(max_bytes=100)
+    over = buffer.put(uuid4(), [AnswerSave(question_id=uuid4(), text_answer="x" * 200)])
+    assert over is True
+
+
+def test_failed_flush_keeps_answers():
+    buffer = InMemoryAnswerBuffer(max_bytes=1024 * 1024)
+    buffer.put(uuid4(), [AnswerSave(question_id=uuid4(), selected_options=["A"])])
+
+    def broken_session():
+        raise ConnectionError("database is down")
+
+    with pytest.raises(ConnectionError):
+        buffer.flush(broken_session)
+
+    stats = buffer.stats()
+    assert stats["buffered_answers"] == 1
+    assert stats["flush_failures"] == 1
+
+
+def test_flush_writes_in_progress_attempts_only(session, db_engine):
+    exam, questions = create_exam_with_questions(session)
+    active = create_attempt(session, exam, create_student(session, "a@example.com"))
+    finished = create_attempt(session, exam, create_student(session, "b@example.com"))
+    finished.status = AttemptStatus.SUBMITTED
+    session.add(finished)
+    session.commit()
+
+    buffer = InMemoryAnswerBuffer(max_bytes=1024 * 1024)
+    for attempt in (active, finished):
+        buffer.put(attempt.id, [AnswerSave(question_id=q.id, selected_options=["A"]) for q in questions])
+
+    written = buffer.flush(lambda: Session(db_engine))
+
+    assert written == len(questions)
+    assert buffer.stats()["dropped_submitted"] == len(questions)
+    rows = session.exec(select(StudentAnswer)).all()
+    assert {r.attempt_id for r in rows} == {active.id}
+
+
+def test_submit_grades_answers_a_stalled_flush_has_taken(session, db_engine, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    student = create_student(session)
+    attempt = create_attempt(session, exam, student)
+    session.refresh(student)
+    session.expunge(student)
+    buffer = InMemoryAnswerBuffer(max_bytes=1024 * 1024)
+    buffer.put(attempt.id, [AnswerSave(question_id=questions[0].id, selected_options=["A"])])
+
+    connected = threading.Event()
+
+    def pool_wait():
+        connected.wait()  # the periodic flush waits for a pooled connection
+        return Session(db_engine)
+
+    flusher = threading.Thread(target=buffer.flush, args=(pool_wait,))
+    flusher.start()
+    while buffer.stats()["buffered_answers"]:
+        time.sleep(0.01)
+
+    # What submit does with write-behind on: flush the attempt, then claim and grade
+    results = []
+    submitter = threading.Thread(target=lambda: (
+        buffer.flush_attempt(attempt.id, lambda: Session(db_engine)),
+        results.append(run_async(async_engine, lambda db: submit_exam(attempt.id, db, student))),
+    ))
+    submitter.start()
+    submitter.join(0.5)
+    waited = submitter.is_alive()
+    connected.set()
+    flusher.join()
+    submitter.join()
+
+    assert waited  # for the taken answer to commit
+
+    assert results[0].total_score == 1.0
+    assert buffer.stats()["dropped_submitted"] == 0
+    answer, = session.exec(select(StudentAnswer)).all()
+    assert (answer.selected_options, answer.is_graded) == (["A"], True)
+
+
+def test_write_behind_needs_a_shared_buffer_with_several_workers():
+    buffer = InMemoryAnswerBuffer(max_bytes=1024)
+    check_write_behind(buffer, workers=1)
+    with pytest.raises(RuntimeError):
+        check_write_behind(buffer, workers=4)
+
+    class Partial(AnswerBuffer):
+        def put(self, attempt_id, answers):
+            return False
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.attempt import AttemptStatus, StudentAnswer
+from app.services.deadline_sweeper import SWEEP_LOCK_KEY, DeadlineSweeper, sweep_expired
+from tests.factories import create_attempt, create_exam_with_questions, create_student, run_async
+
+
+def create_attempts(session, exam, questions, deadlines):
+    """One attempt per deadline, each answering the first question correctly"""
+    attempts = []
+    for deadline in deadlines:
+        attempt = create_attempt(session, exam, create_student(session, f"{uuid4().hex}@example.com"))
+        attempt.deadline_at = deadline
+        session.add(StudentAnswer(attempt_id=attempt.id, question_id=questions[0].id, selected_options=["A"]))
+        attempts.append(attempt)
+    session.commit()
+    return attempts
+
+
+def test_sweeper_submits_and_grades_expired_attempts(session, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    now = datetime.now()
+    expired = create_attempts(session, exam, questions, [now - timedelta(minutes=m) for m in (3, 2, 1)])
+    running, = create_attempts(session, exam, questions, [now + timedelta(minutes=5)])
+
+    batch = run_async(async_engine, lambda db: sweep_expired(db, now, 2))
+    assert batch.closed == 2 and batch.max_lag_seconds >= 120
+    batch = run_async(async_engine, lambda db: sweep_expired(db, now, 2))
+    assert batch.closed == 1
+
+    for attempt in expired + [running]:
+        session.refresh(attempt)
+    assert [a.status for a in expired] == [AttemptStatus.SUBMITTED] * 3
+    assert [a.submit_time for a in expired] == [a.deadline_at for a in expired]
+    assert [a.total_score for a in expired] == [1.0] * 3
+    assert (running.status, running.total_score) == (AttemptStatus.IN_PROGRESS, 0.0)
+    assert run_async(async_engine, lambda db: sweep_expired(db, now, 2)).closed == 0
+
+
+def test_sweeper_skips_tick_while_another_worker_sweeps(session, async_engine):
+    exam, questions = create_exam_with_questions(session)
+    attempt, = create_attempts(session, exam, questions, [datetime.now() - timedelta(minutes=10)])
+    sweeper = DeadlineSweeper(interval=1, batch_size=10, grace_seconds=0)
+
+    async def drain_while_locked():
+        async with AsyncSession(async_engine) as other:
+            await other.exec(select(func.pg_advisory_xact_lock(SWEEP_LOCK_KEY)))
+            blocked = await sweeper.drain(lambda: AsyncSession(async_engine))
+        return blocked, await sweeper.drain(lambda: AsyncSession(async_engine))
+
+    assert asyncio.run(drain_while_locked()) == (0, 1)
+    stats = sweeper.stats()
+    assert (stats["lock_busy"], stats["swept"], stats["batches"]) == (1, 1, 1)
+    session.refresh(attempt)
+    assert attempt.status == AttemptStatus.SUBMITTED
@@ -0,0 +1,83 @@
+import uuid
+from sqlmodel import update
+from app.models.exam import Exam
+from app.models.user import UserRole
+from app.schemas.exam_schema import ExamQuestionAdd, ExamUpdate
+from app.api.v1.attempts import load_exam_questions
+from app.api.v1.exams import add_questions_to_exam, list_exams, update_exam
+from app.services.exam_totals import refresh_exam_totals
+from tests.factories import count_queries, create_exam_with_questions, create_question, create_student, run_async
+
+
+def test_adding_questions_updates_totals(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=2)
+    essay = create_question(session, title="Essay", max_score=5.0)
+
+    payload = ExamQuestionAdd(question_ids=[essay.id, questions[0].id])
+    run_async(async_engine, lambda db: add_questions_to_exam(exam.id, payload, db, None))
+
+    session.refresh(exam)
+    assert exam.question_count == 3
+    assert exam.max_possible_score == 7.0
+
+
+def test_list_exams_uses_stored_count(session, async_engine):
+    exam, _ = create_exam_with_questions(session, count=4)
+    admin = create_student(session, "admin@example.com")
+    admin.role = UserRole.ADMIN
+
+    listed = run_async(async_engine, lambda db: list_exams(db, admin))
+
+    assert [(e.id, e.question_count, e.max_possible_score) for e in listed] == [(exam.id, 4, 4.0)]
+
+
+def test_recompute_repairs_stale_totals(session):
+    exam, _ = create_exam_with_questions(session, count=3)
+    session.exec(update(Exam).values(question_count=0, max_possible_score=0.0))
+    session.commit()
+
+    refresh_exam_totals(session)
+    session.commit()
+
+    session.refresh(exam)
+    assert (exam.question_count, exam.max_possible_score) == (3, 3.0)
+
+
+def test_paper_edits_are_ordered_and_set_based(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=2)
+    extra = [create_question(session, title=f"Extra {i}") for i in range(300)]
+    missing = uuid.uuid4()
+
+    payload = ExamQuestionAdd(question_ids=[e.id for e in extra] + [questions[0].id, missing])
+    with count_queries(async_engine.sync_engine) as statements:
+        result = run_async(async_engine, lambda db: add_questions_to_exam(exam.id, payload, db, None))
+
+    assert (result.added_count, result.missing_ids) == (300, [missing])
+    assert len(statements) <= 8  # lock, validate, insert, version, totals; not one per id
+    paper = run_async(async_engine, lambda db: load_exam_questions(db, exam.id))
+    assert [q.id for q in paper[-300:]] == [e.id for e in extra]  # appended in request order
+
+    # Reorder to [extra 1, question 1, extra 0]; everything else leaves the paper
+    payload = ExamQuestionAdd(question_ids=[extra[1].id, questions[1].id, extra[0].id], replace=True)
+    result = run_async(async_engine, lambda db: add_questions_to_exam(exam.id, payload, db, None))
+    assert (result.added_count, result.removed_count) == (0, 299)
+    paper = run_async(async_engine, lambda db: load_exam_questions(db, exam.id))
+    assert [q.id for q in paper] == [extra[1].id, questions[1].id, extra[0].id]
+
+    payload = ExamQuestionAdd(remove_ids=[questions[1].id])
+    result = run_async(async_engine, lambda db: add_questions_to_exam(exam.id, payload, db, None))
+    assert result.removed_count == 1
+    session.refresh(exam)
+    assert (exam.question_count, exam.max_possible_score) == (2, 2.0)
+
+
+def test_title_and_publish_edits_keep_cached_papers(session, async_engine):
+    exam, _ = create_exam_with_questions(session)
+    version = exam.content_version
+
+    edit = ExamUpdate(title="Algebra", is_published=False)
+    updated = run_async(async_engine, lambda db: update_exam(exam.id, edit, db, None))
+
+    assert (updated.title, updated.is_published) == ("Algebra", False)
+    session.refresh(exam)
+    assert exam.content_version == version
@@ -3,7 +3,7 @@ import pandas as pd
 import json
 from io import BytesIO
 from fastapi import UploadFile
-from app.services.excel_service import parse_excel_questions
+from app.services.excel_service import iter_question_batches, parse_excel_questions, parse_student_rows
 from app.models.question import QuestionType
 
 def create_mock_excel_file(data):
@@ -26,7 +26,7 @@ def test_parse_valid_excel():
         "options": json.dumps(["3", "4", "5"]),
         "correct_answers": json.dumps(["4"]),
         "max_score": 1.0,
-        "tags": "math"
+        "tags": "Math, basic,math"
     }]
     
     # Create mock UploadFile
@@ -41,6 +41,7 @@ def test_parse_valid_excel():
     assert questions[0].title == "What is 2+2?"
     assert questions[0].q_type == QuestionType.SINGLE_CHOICE
     assert questions[0].options == ["3", "4", "5"]
+    assert questions[0].tags == ["math", "basic"]
 
 def test_parse_invalid_row():
     # Data missing required 'title'
@@ -57,4 +58,39 @@ def test_parse_invalid_row():
     
     assert len(questions) == 0
     assert len(errors) == 1
-    assert "validation error" in errors[0]
\ No newline at end of file
+    assert "validation error" in errors[0]
+
+def test_parse_student_csv():
+    csv_data = (
+        "email,password,full_name\n"
+        "a@example.com,123456,Ann\n"
+        "not-an-email,pw,Bob\n"
+        "a@example.com,other,Ann again\n"
+        "c@example.com,pw,\n"
+    ).encode()
+    upload_file = UploadFile(filename="students.csv", file=BytesIO(csv_data))
+
+    rows, errors = parse_student_rows(upload_file)
+
+    assert [(row_number, s.email) for row_number, s in rows] == [(2, "a@example.com"), (5, "c@example.com")]
+    assert rows[0][1].password == "123456"  # numeric cells stay text
+    assert rows[1][1].full_name is None
+    assert errors[0].startswith("Row 3:")
+    assert errors[1] == "Row 4: duplicate email a@example.com in file"
+
+def test_streamed_batches_keep_row_numbers():
+    valid = {"title": "Q", "complexity": "Easy", "type": "text", "options": "[]", "correct_answers": "[]", "max_score": 1.0}
+    data = [valid, dict(valid, type="bogus"), {}, valid, dict(valid, title=None), valid]
+    file_buffer = create_mock_excel_file(data)
+
+    batches = list(iter_question_batches(file_buffer, batch_size=2))
+
+    assert [b.last_row for b in batches] == [3, 5, 7]
+    errors = [e for b in batches for e in b.errors]
+    assert [e.split(":")[0] for e in errors] == ["Row 3", "Row 4", "Row 6"]
+    assert sum(len(b.questions) for b in batches) == 3
+
+    # Resuming after the first batch only reads the rows that follow it
+    file_buffer.seek(0)
+    resumed = list(iter_question_batches(file_buffer, batch_size=2, skip_rows=2))
+    assert [b.last_row for b in resumed] == [5, 7]
@@ -2,7 +2,7 @@ import pytest
 from uuid import uuid4
 from app.models.question import Question, QuestionType
 from app.models.attempt import StudentAnswer
-from app.services.grading_service import grade_answer
+from app.services.grading_service import compile_answer_key, grade_answer, grade_answers
 
 def test_grade_single_choice_correct():
     question = Question(
@@ -70,5 +70,31 @@ def test_grade_text_question():
     answer = StudentAnswer(attempt_id=uuid4(), question_id=uuid4(), text_answer="This is my essay")
     
     score = grade_answer(question, answer)
-    score = grade_answer(question, answer)
-    assert score == 0.0
\ No newline at end of file
+    assert score == 0.0
+
+
+def test_grade_batch_matches_grade_answer():
+    single = Question(title="S", type=QuestionType.SINGLE_CHOICE, correct_answers=[" A "], max_score=1.0)
+    multi = Question(title="M", type=QuestionType.MULTI_CHOICE, correct_answers=["a", 2], max_score=3.0)
+    no_key = Question(title="N", type=QuestionType.SINGLE_CHOICE, correct_answers=[], max_score=1.0)
+    essay = Question(title="E", type=QuestionType.TEXT, correct_answers=[], max_score=5.0)
+    selections = [
+        (single, [["a"], ["A", "a"], ["B"], ["A", "B"], [], None, [{"id": 1}]]),
+        (multi, [[2, "A"], ["2.0", "a"], ["a"], ["A", "2", "c"], [2.0, "a"], ["a", "2", "2"]]),
+        (no_key, [["A"], []]),
+        (essay, [None, ["A"]]),
+    ]
+    questions = {question.id: question for question, _ in selections}
+    answers = [
+        StudentAnswer(attempt_id=uuid4(), question_id=question.id, selected_options=selected)
+        for question, group in selections for selected in group
+    ]
+    expected = [grade_answer(questions[a.question_id], a) for a in answers]
+    assert expected == [1, 1, 0, 0, 0, 0, 0, 3, 0, 0, 0, 0, 3, 0, 0, 0, 0]
+
+    keys = {question_id: compile_answer_key(q) for question_id, q in questions.items()}
+    grades = grade_answers(keys, answers)
+    assert grades.scores.tolist() == expected
+    assert [a.score_awarded for a in answers] == expected
+    assert [a.is_correct for a in answers] == [score > 0 for score in expected]
+    assert [a.is_graded for a in answers] == [a.question_id != essay.id for a in answers]
@@ -0,0 +1,149 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from io import BytesIO
+import pandas as pd
+from fastapi import UploadFile
+from sqlmodel import Session, func, select
+from app.api.v1.questions import get_import_job, import_questions
+from app.core.config import settings
+from app.models.exam import Exam
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.models.question import Question
+from app.models.user import UserRole
+from app.services.import_jobs import claim_job, run_import_job
+from tests.factories import create_exam_with_questions, create_student, run_async
+
+VALID = {"title": "Q", "complexity": "Easy", "type": "text", "options": "[]", "correct_answers": "[]", "max_score": 1.0}
+
+
+def valid_rows(count, **changes):
+    return [dict(VALID, title=f"Q{i}", **changes) for i in range(count)]
+
+
+def write_sheet(path, rows):
+    pd.DataFrame(rows).to_excel(path, index=False)
+    return path
+
+
+def create_admin(session):
+    admin = create_student(session, "admin@example.com")
+    admin.role = UserRole.ADMIN
+    session.add(admin)
+    session.commit()
+    return admin
+
+
+def question_count(session):
+    return session.exec(select(func.count()).select_from(Question)).one()
+
+
+def test_import_runs_in_committed_batches(session, db_engine, async_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_SPOOL_DIR", str(tmp_path / "spool"))
+    admin = create_admin(session)
+    sheet = BytesIO()
+    q0, q1, q2 = valid_rows(3)
+    write_sheet(sheet, [q0, dict(VALID, type="bogus"), q1, q2, q0])
+    upload = UploadFile(filename="bank.xlsx", file=sheet)
+
+    job = run_async(async_engine, lambda db: import_questions(upload, session=db, current_user=admin))
+    assert job.status == ImportJobStatus.QUEUED
+    assert os.path.exists(job.spool_path)
+
+    factory = lambda: Session(db_engine)
+    assert claim_job(factory, stale_seconds=60) == job.id
+    assert claim_job(factory, stale_seconds=60) is None  # running and fresh
+
+    assert run_import_job(job.id, factory, batch_size=2) == "completed"
+
+    status = run_async(async_engine, lambda db: get_import_job(job.id, db, admin))
+    assert status.status == ImportJobStatus.COMPLETED
+    assert (status.rows_processed, status.rows_imported, status.rows_failed) == (5, 3, 1)
+    assert status.rows_skipped == 1  # q0 again
+    assert status.errors[0].startswith("Row 3:")
+    assert status.rows_per_second > 0
+    assert question_count(session) == 3
+    assert not os.path.exists(job.spool_path)
+
+
+def test_stale_job_resumes_after_last_batch(session, db_engine, tmp_path):
+    admin = create_admin(session)
+    q0, q1, q2 = valid_rows(3)
+    path = write_sheet(tmp_path / "bank.xlsx", [q0, q1, dict(VALID, title=None), q2])
+    # A worker died after committing the first two rows
+    job = ImportJob(
+        created_by=admin.id, filename="bank.xlsx", spool_path=str(path),
+        status=ImportJobStatus.RUNNING, heartbeat_at=datetime.now() - timedelta(minutes=10),
+        rows_processed=2, rows_imported=2,
+    )
+    session.add(job)
+    session.commit()
+
+    factory = lambda: Session(db_engine)
+    assert claim_job(factory, stale_seconds=60) == job.id
+    assert run_import_job(job.id, factory, batch_size=1) == "completed"
+
+    session.refresh(job)
+    assert (job.rows_processed, job.rows_imported, job.rows_failed) == (4, 3, 1)
+    assert job.errors[0].startswith("Row 4:")
+    assert question_count(session) == 1  # only the rows after the checkpoint
+
+
+def test_stop_requeues_and_bad_file_fails(session, db_engine, tmp_path):
+    admin = create_admin(session)
+    factory = lambda: Session(db_engine)
+
+    path = write_sheet(tmp_path / "bank.xlsx", valid_rows(3))
+    job = ImportJob(created_by=admin.id, filename="bank.xlsx", spool_path=str(path))
+    session.add(job)
+    session.commit()
+    stop = threading.Event()
+    stop.set()
+    claim_job(factory, stale_seconds=60)
+    assert run_import_job(job.id, factory, batch_size=1, stop=stop) == "interrupted"
+    session.refresh(job)
+    assert (job.status, job.rows_processed) == (ImportJobStatus.QUEUED, 1)
+
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"not a workbook")
+    job.spool_path = str(broken)
+    session.add(job)
+    session.commit()
+    claim_job(factory, stale_seconds=60)
+    assert run_import_job(job.id, factory) == "failed"
+    session.refresh(job)
+    assert job.status == ImportJobStatus.FAILED
+    assert job.failure.startswith("Invalid Excel file")
+    assert not broken.exists()
+
+
+def test_imported_questions_are_added_to_the_exam(session, db_engine, tmp_path):
+    admin = create_admin(session)
+    exam, _ = create_exam_with_questions(session, count=1)
+    version = exam.content_version
+    path = write_sheet(tmp_path / "bank.xlsx", valid_rows(3, max_score=2.0))
+    job = ImportJob(created_by=admin.id, filename="bank.xlsx", spool_path=str(path), exam_id=exam.id)
+    session.add(job)
+    session.commit()
+
+    factory = lambda: Session(db_engine)
+    claim_job(factory, stale_seconds=60)
+    assert run_import_job(job.id, factory, batch_size=2) == "completed"
+
+    exam = session.exec(select(Exam).where(Exam.id == exam.id).execution_options(populate_existing=True)).one()
+    assert (exam.question_count, exam.max_possible_score) == (4, 7.0)
+    assert exam.content_version == version + 2  # one bump per batch
+
+    # Re-uploading the sheet with new scores updates the questions already on the exam
+    path = write_sheet(tmp_path / "rescored.xlsx", valid_rows(3, max_score=3.0))
+    job = ImportJob(created_by=admin.id, filename="rescored.xlsx", spool_path=str(path), on_duplicate="update")
+    session.add(job)
+    session.commit()
+    claim_job(factory, stale_seconds=60)
+    assert run_import_job(job.id, factory) == "completed"
+
+    session.refresh(job)
+    assert (job.rows_imported, job.rows_updated, job.rows_skipped) == (0, 3, 0)
+    session.refresh(exam)
+    assert (exam.question_count, exam.max_possible_score) == (4, 10.0)
+    assert exam.content_version == version + 3
@@ -0,0 +1,43 @@
+from uuid import uuid4
+from app.services.paper_cache import CompiledPaper, PaperCache
+
+
+def make_paper(version=1, size=10):
+    return CompiledPaper(version=version, questions_json=b"x" * size)
+
+
+def test_hit_requires_current_version():
+    cache = PaperCache(max_entries=10, max_bytes=1000)
+    exam_id = uuid4()
+    cache.put(exam_id, make_paper(version=1))
+
+    assert cache.get(exam_id, 1) is not None
+    assert cache.get(exam_id, 2) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = PaperCache(max_entries=2, max_bytes=1000)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    cache.put(first, make_paper())
+    cache.put(second, make_paper())
+    cache.get(first, 1)  # first is now the most recently used
+    cache.put(third, make_paper())
+
+    assert cache.get(second, 1) is None
+    assert cache.get(first, 1) is not None
+    assert cache.get(third, 1) is not None
+
+
+def test_respects_byte_bound():
+    cache = PaperCache(max_entries=10, max_bytes=25)
+    first, second = uuid4(), uuid4()
+    cache.put(first, make_paper(size=15))
+    cache.put(second, make_paper(size=15))
+
+    assert cache.get(first, 1) is None
+    assert cache.stats()["bytes"] == 15
+
+    cache.put(uuid4(), make_paper(size=100))  # larger than the whole cache
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from app.core.security import password_context
+from app.services.password_hasher import HasherBusy, PasswordHasher
+
+
+def test_outdated_cost_is_rehashed_on_verify():
+    hasher = PasswordHasher(rounds=5, workers=0, concurrency=4, wait_seconds=1)
+    stored = password_context(4).hash("secret")
+
+    valid, new_hash = asyncio.run(hasher.verify("secret", stored))
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+
+    # Current cost: nothing to update; wrong password: rejected
+    assert asyncio.run(hasher.verify("secret", new_hash)) == (True, None)
+    assert asyncio.run(hasher.verify("wrong", new_hash))[0] is False
+    assert hasher.stats()["rehashed"] == 1
+
+
+def test_hashes_in_worker_processes():
+    hasher = PasswordHasher(rounds=4, workers=1, concurrency=4, wait_seconds=5)
+    try:
+        hashed = asyncio.run(hasher.hash("secret"))
+        assert asyncio.run(hasher.verify("secret", hashed)) == (True, None)
+    finally:
+        hasher.shutdown()
+
+
+def test_full_queue_raises_busy():
+    hasher = PasswordHasher(rounds=10, workers=0, concurrency=1, wait_seconds=0.01)
+
+    async def two_at_once():
+        return await asyncio.gather(hasher.hash("a"), hasher.hash("b"), return_exceptions=True)
+
+    results = asyncio.run(two_at_once())
+    assert sum(isinstance(r, HasherBusy) for r in results) == 1
+    assert hasher.stats()["rejected"] == 1
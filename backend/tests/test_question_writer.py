@@ -0,0 +1,66 @@
+from sqlmodel import select
+from app.models.exam import ExamQuestionLink
+from app.models.question import Question, QuestionType
+from app.schemas.question_schema import QuestionCreate
+from app.services.question_hash import question_content_hash
+from app.services.exam_questions import append_questions
+from app.services.question_writer import write_questions
+from tests.factories import create_exam_with_questions
+
+
+def test_content_hash_ignores_case_spacing_and_answer_order():
+    a = question_content_hash("What  is 2+2?", QuestionType.MULTI_CHOICE, ["3", "4.0"], ["A", "B"])
+    b = question_content_hash(" what is 2+2? ", QuestionType.MULTI_CHOICE, ["3", "4.0"], ["B", "A"])
+    assert a == b
+    assert a != question_content_hash("What is 2+2?", QuestionType.MULTI_CHOICE, ["4.0", "3"], ["A", "B"])
+    assert a != question_content_hash("What is 2+2?", QuestionType.SINGLE_CHOICE, ["3", "4.0"], ["A", "B"])
+
+
+def test_copy_round_trips_through_the_orm(session):
+    exam, existing = create_exam_with_questions(session, count=1)
+    rows = [
+        QuestionCreate(title="Pick", complexity="Easy", type="multi_choice",
+                       options=["A", {"id": 2, "text": "B"}], correct_answers=["A"], max_score=2.5, tags="x,y"),
+        QuestionCreate(title="Essay\twith\\escapes\n", complexity="Hard", type="text"),
+    ]
+
+    written = write_questions(session, rows)
+    append_questions(session, exam.id, written.ids + [existing[0].id])
+    session.commit()
+
+    assert (written.inserted, written.skipped) == (2, 0)
+    pick, essay = (session.get(Question, question_id) for question_id in written.ids)
+    assert pick.q_type == QuestionType.MULTI_CHOICE
+    assert pick.options == ["A", {"id": 2, "text": "B"}]
+    assert (pick.correct_answers, pick.max_score, pick.tags) == (["A"], 2.5, ["x", "y"])
+    assert pick.content_hash == question_content_hash("Pick", QuestionType.MULTI_CHOICE, pick.options, ["A"])
+    assert essay.title == "Essay\twith\\escapes\n"
+    assert essay.options is None and essay.description is None
+
+    linked = session.exec(select(ExamQuestionLink.question_id).where(ExamQuestionLink.exam_id == exam.id)).all()
+    assert sorted(linked) == sorted([existing[0].id, *written.ids])
+
+
+def test_duplicates_are_skipped_or_updated(session):
+    first = write_questions(session, [QuestionCreate(title="Q", complexity="Easy", type="text", max_score=1)])
+    session.commit()
+
+    rows = [
+        QuestionCreate(title="q ", complexity="Hard", type="text", max_score=3),  # same content as "Q"
+        QuestionCreate(title="New", complexity="Easy", type="text"),
+        QuestionCreate(title="new", complexity="Easy", type="text"),  # repeats the row above
+    ]
+    skipped = write_questions(session, rows)
+    session.commit()
+    assert (skipped.inserted, skipped.skipped, skipped.updated) == (1, 2, 0)
+    assert skipped.ids[0] == first.ids[0]
+    assert skipped.ids[1] == skipped.ids[2]
+    assert session.get(Question, first.ids[0]).max_score == 1
+
+    updated = write_questions(session, rows, on_duplicate="update")
+    session.commit()
+    assert (updated.inserted, updated.skipped, updated.updated) == (0, 2, 1)
+    assert updated.updated_ids == [first.ids[0]]
+    question = session.get(Question, first.ids[0])
+    session.refresh(question)
+    assert (question.title, question.complexity, question.max_score) == ("Q", "Hard", 3)
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.v1.questions import list_questions, update_question
+from app.models.attempt import AttemptStatus, StudentAnswer, StudentExamAttempt
+from app.models.exam import Exam
+from app.models.question import Question, QuestionType
+from app.schemas.question_schema import QuestionUpdate
+from app.services.question_hash import question_content_hash
+from app.services.rescore import rescore_questions
+from tests.factories import (
+    count_queries, create_attempt, create_exam_with_questions, create_question, create_student, run_async,
+)
+
+
+def list_page(async_engine, after_id=None, limit=100, q_type=None, complexity=None, tags=(), search=None):
+    return run_async(async_engine, lambda db: list_questions(
+        after_id, limit, q_type, complexity, list(tags), search, session=db, current_user=None
+    ))
+
+
+def test_list_questions_keyset_pages(session, async_engine):
+    session.add_all(Question(title=f"Q{i}", type=QuestionType.TEXT) for i in range(7))
+    session.commit()
+
+    seen, after_id = [], None
+    while True:
+        page = list_page(async_engine, after_id=after_id, limit=3)
+        if not page:
+            break
+        seen += [q.id for q in page]
+        after_id = page[-1].id
+
+    assert seen == sorted(session.exec(select(Question.id)).all())
+
+
+def test_list_questions_filters(session, async_engine):
+    session.add_all([
+        Question(title="Photosynthesis in plants", description="Light reactions", complexity="Hard",
+                 type=QuestionType.TEXT, tags=["biology", "plants"]),
+        Question(title="Cell division", description="Mitosis and meiosis", complexity="Easy",
+                 type=QuestionType.SINGLE_CHOICE, options=["A"], correct_answers=["A"], tags=["biology"]),
+        Question(title="What is 2+2?", complexity="Easy", type=QuestionType.SINGLE_CHOICE,
+                 options=["4"], correct_answers=["4"], tags=["math"]),
+    ])
+    session.commit()
+
+    def titles(**filters):
+        return sorted(q.title for q in list_page(async_engine, **filters))
+
+    assert titles(q_type=QuestionType.SINGLE_CHOICE) == ["Cell division", "What is 2+2?"]
+    assert titles(complexity="Easy", tags=["Biology"]) == ["Cell division"]
+    assert titles(tags=["biology", "plants"]) == ["Photosynthesis in plants"]
+    # Stemmed and case-insensitive, over title and description
+    assert titles(search="PLANT") == ["Photosynthesis in plants"]
+    assert titles(search="meiosis -photosynthesis") == ["Cell division"]
+    assert titles(search="biology", q_type=QuestionType.TEXT) == []
+
+    with count_queries(async_engine.sync_engine) as statements:
+        list_page(async_engine, complexity="Easy", tags=["math"], search="2")
+    assert len(statements) == 1
+
+
+def test_update_question_moves_hash_and_exam_totals(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=2)
+    for q in questions:
+        q.content_hash = question_content_hash(q.title, q.q_type, q.options, q.correct_answers)
+        session.add(q)
+    session.commit()
+    question_id, version = questions[0].id, exam.content_version
+
+    def patch(**fields):
+        return run_async(async_engine, lambda db: update_question(
+            question_id, QuestionUpdate(**fields), session=db, current_user=None
+        ))
+
+    updated = patch(correct_answers=["B"], max_score=3.0)
+    assert updated.correct_answers == ["B"]
+    session.expire_all()
+    q = session.get(Question, question_id)
+    assert q.content_hash == question_content_hash(q.title, q.q_type, q.options, ["B"])
+    exam = session.get(Exam, exam.id)
+    assert (exam.max_possible_score, exam.content_version) == (4.0, version + 1)
+
+    # Q1 already has this content
+    with pytest.raises(HTTPException) as conflict:
+        patch(title="Q1", correct_answers=["A"])
+    assert conflict.value.status_code == 409
+
+
+def test_concurrent_edits_to_the_same_content_conflict(session, db_engine, async_engine):
+    first, second = create_question(session, title="First"), create_question(session, title="Second")
+    for q in (first, second):
+        q.content_hash = question_content_hash(q.title, q.q_type, q.options, q.correct_answers)
+        session.add(q)
+    session.commit()
+    target = question_content_hash("Same", first.q_type, first.options, first.correct_answers)
+
+    with Session(db_engine) as other:
+        # Another edit gave `second` the same content and has not committed:
+        # the duplicate check misses it, the unique index waits for it
+        other.exec(update(Question).where(Question.id == second.id).values(title="Same", content_hash=target))
+        threading.Timer(0.5, other.commit).start()
+        with pytest.raises(HTTPException) as conflict:
+            run_async(async_engine, lambda db: update_question(
+                first.id, QuestionUpdate(title="Same"), session=db, current_user=None
+            ))
+
+    assert conflict.value.status_code == 409
+    assert conflict.value.detail == f"Question {second.id} has the same content"
+    session.refresh(first)
+    assert first.title == "First"
+
+
+def test_question_update_rejects_null_for_required_fields():
+    assert QuestionUpdate(description=None, options=None).model_dump(exclude_unset=True) == {
+        "description": None, "options": None
+    }
+    for field in ("title", "type", "complexity", "max_score"):
+        with pytest.raises(ValidationError):
+            QuestionUpdate(**{field: None})
+
+
+def rescore(async_engine, question_ids, batch_size):
+    async def main():
+        steps = []
+        async for progress in rescore_questions(
+            lambda: AsyncSession(async_engine, expire_on_commit=False), question_ids, batch_size
+        ):
+            steps.append(progress.model_copy())
+        return steps
+    return asyncio.run(main())
+
+
+def test_rescore_moves_totals_by_the_change(session, async_engine):
+    exam, questions = create_exam_with_questions(session, count=2)
+    essay = create_question(session, title="Essay", q_type=QuestionType.TEXT)
+    picks = ["A", "B", "B", "C", "B"]  # key was A, the right answer is B
+    attempts = []
+    for i, pick in enumerate(picks):
+        attempt = create_attempt(session, exam, create_student(session, f"s{i}@example.com"))
+        attempt.status = AttemptStatus.SUBMITTED if i < 4 else AttemptStatus.IN_PROGRESS
+        attempt.total_score = (pick == "A") + 1.0
+        session.add_all([
+            StudentAnswer(attempt_id=attempt.id, question_id=questions[0].id, selected_options=[pick],
+                          score_awarded=float(pick == "A"), is_correct=pick == "A", is_graded=True),
+            StudentAnswer(attempt_id=attempt.id, question_id=questions[1].id, selected_options=["A"],
+                          score_awarded=1.0, is_correct=True, is_graded=True),
+        ])
+        attempts.append(attempt)
+    questions[0].correct_answers = ["B"]
+    session.add(questions[0])
+    session.commit()
+
+    steps = rescore(async_engine, [questions[0].id, questions[1].id, essay.id], batch_size=3)
+
+    final = steps[-1]
+    assert final.done and [s.batches for s in steps] == [1, 2, 3, 4, 4]  # 3 + 1 answers per question
+    assert final.skipped_ids == [essay.id]
+    # 4 submitted answers to each question; the A and the two B answers changed
+    assert (final.answers_checked, final.answers_changed, final.attempts_changed) == (8, 3, 3)
+    session.expire_all()
+    totals = [session.get(StudentExamAttempt, a.id).total_score for a in attempts]
+    assert totals == [1.0, 2.0, 2.0, 1.0, 1.0]  # the open attempt is graded at submit
+
+    again = rescore(async_engine, [questions[0].id], batch_size=3)[-1]
+    assert (again.answers_checked, again.answers_changed) == (4, 0)
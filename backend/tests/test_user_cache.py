@@ -0,0 +1,63 @@
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import UserRole
+from app.services.user_cache import AuthUser, UserCache, user_cache
+from tests.factories import create_student
+
+
+def test_entries_expire_and_evict_least_recent():
+    cache = UserCache(max_entries=2, ttl_seconds=0.05)
+    first, second, third = (AuthUser(id=uuid4(), role=UserRole.STUDENT, is_active=True) for _ in range(3))
+
+    cache.put(first)
+    cache.put(second)
+    assert cache.get(first.id) == first  # first is now the most recent
+    cache.put(third)
+    assert cache.get(second.id) is None
+
+    time.sleep(0.06)
+    assert cache.get(first.id) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["evictions"], stats["expired"]) == (1, 1, 1)
+
+
+def test_signed_claims_skip_the_database(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CLAIMS", True)
+    user_id = uuid4()
+    token = create_access_token(user_id, claims={"role": "admin", "active": True})
+
+    # No session: a lookup would fail
+    user = asyncio.run(get_current_user(token, None))
+    assert user == AuthUser(id=user_id, role=UserRole.ADMIN, is_active=True)
+
+    inactive = create_access_token(user_id, claims={"role": "student", "active": False})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_current_user(inactive, None))
+    assert error.value.status_code == 400
+
+
+def test_lookup_is_cached_until_role_changes(session, async_engine):
+    user_cache.clear()
+    student = create_student(session)
+    token = create_access_token(student.id)
+
+    async def current_user():
+        async with AsyncSession(async_engine) as db:
+            return await get_current_user(token, db)
+
+    assert asyncio.run(current_user()).role == UserRole.STUDENT
+    assert asyncio.run(get_current_user(token, None)).role == UserRole.STUDENT  # served from the cache
+
+    student.role = UserRole.ADMIN
+    session.add(student)
+    session.commit()
+
+    assert user_cache.get(student.id) is None
+    assert asyncio.run(current_user()).role == UserRole.ADMIN
@@ -0,0 +1,32 @@
+import asyncio
+from io import BytesIO
+from fastapi import UploadFile
+from sqlmodel import select
+from app.api.v1.users import import_students
+from app.core.security import password_context
+from app.models.user import User, UserRole
+from app.services.password_hasher import password_hasher
+from tests.factories import create_student, run_async
+
+
+def test_import_students_skips_existing_emails(session, async_engine, monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+    monkeypatch.setattr(password_hasher, "bulk_workers", 1)
+    create_student(session, "taken@example.com")
+
+    csv_data = (
+        "email,password,full_name\n"
+        "taken@example.com,pw,Taken\n"
+        "new1@example.com,pw1,New One\n"
+        "new2@example.com,pw2,\n"
+    ).encode()
+    upload = UploadFile(filename="students.csv", file=BytesIO(csv_data))
+
+    result = run_async(async_engine, lambda db: import_students(upload, db, None))
+
+    assert result.imported_count == 2
+    assert result.errors == ["Row 2: email taken@example.com is already registered"]
+    users = {u.email: u for u in session.exec(select(User)).all()}
+    assert users["new1@example.com"].role == UserRole.STUDENT
+    assert users["new1@example.com"].full_name == "New One"
+    assert password_context(4).verify("pw2", users["new2@example.com"].hashed_password)
@@ -12,8 +12,9 @@ import { Progress } from "@/components/ui/progress";
 import { Badge } from "@/components/ui/badge";
 import { Clock, Save, Send, AlertCircle, Loader2, Play, CheckCircle } from "lucide-react";
 import { toast } from "sonner"; 
-import { useStartExamMutation, useSaveAnswerMutation, useSubmitExamMutation, AttemptState } from "@/lib/redux/services/attemptApi";
+import { useStartExamMutation, useSubmitExamMutation, AttemptState } from "@/lib/redux/services/attemptApi";
 import { useAppSelector } from "@/lib/redux/hooks";
+import { useAutoSave } from "@/hooks/useAutoSave";
 
 export default function ExamInterface({ params }: { params: Promise<{ examId: string }> }) {
   const router = useRouter();
@@ -23,17 +24,22 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
   const { token } = useAppSelector((state) => state.auth);
 
   const [startExam, { isLoading: isStarting, error: startError }] = useStartExamMutation();
-  const [saveAnswer] = useSaveAnswerMutation();
   const [submitExam, { isLoading: isSubmitting }] = useSubmitExamMutation();
 
   const [attemptData, setAttemptData] = useState<AttemptState | null>(null);
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
   const [answers, setAnswers] = useState<Record<string, string | string[] | null>>({});
   const [timeRemaining, setTimeRemaining] = useState<number | null>(null);
-  const [isSaving, setIsSaving] = useState(false);
   
   const hasStartedRef = useRef(false);
-  const saveTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+
+  // Changed answers go out together, one bulk request per tick
+  const { flush, isSaving, hasUnsavedChanges } = useAutoSave({
+    studentExamId: attemptData?.attempt_id ?? null,
+    answers,
+    questions: attemptData?.questions ?? [],
+    interval: 5000,
+  });
 
   // --- 1. Start Exam Logic ---
   const handleStartExam = async () => {
@@ -89,46 +95,19 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
 
   // --- 3. Save Logic ---
   const handleAnswerChange = (questionId: string, value: string | string[] | null) => {
+    // Saved on the next auto-save tick
     setAnswers((prev) => ({ ...prev, [questionId]: value }));
-    
-    if(!attemptData) return;
-
-    // Show saving immediately for better UX
-    setIsSaving(true);
-
-    const payload: { attemptId: string; question_id: string; selected_options?: string[]; text_answer?: string } = {
-      attemptId: attemptData.attempt_id,
-      question_id: questionId
-    };
-    if (Array.isArray(value)) {
-      payload.selected_options = value;
-    } else if (typeof value === 'string') {
-      const currentQ = attemptData.questions.find((q: { id: string; type: string }) => q.id === questionId);
-      if (currentQ?.type === 'text') {
-        payload.text_answer = value;
-      } else {
-        payload.selected_options = [value];
-      }
-    }
-
-    // Debounce the actual network request
-    if (saveTimeoutRef.current) {
-      clearTimeout(saveTimeoutRef.current);
-    }
-
-    saveTimeoutRef.current = setTimeout(async () => {
-      try {
-        await saveAnswer(payload).unwrap();
-      } catch (err) {
-        // Silent fail to avoid annoying user during exam
-      } finally {
-        setIsSaving(false);
-      }
-    }, 1000);
   };
 
   const handleSubmit = async () => {
     if (!attemptData) return;
+    try {
+      // Answers not yet sent would otherwise be graded as blank
+      await flush();
+    } catch (error) {
+      toast.error("Could not save your latest answers. Please try again.");
+      return;
+    }
     try {
       const result = await submitExam(attemptData.attempt_id).unwrap();
       toast.success(`Exam submitted! Score: ${result.total_score}`);
@@ -232,7 +211,7 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
               
               {/* Status Indicator: Absolute positioning prevents layout shift */}
               <div className="absolute right-full mr-4 top-1/2 -translate-y-1/2 w-24 text-right">
-                {isSaving ? (
+                {isSaving || hasUnsavedChanges ? (
                   <span className="text-xs text-slate-400 flex items-center justify-end gap-1 transition-opacity">
                     <Loader2 className="h-3 w-3 animate-spin" /> Saving...
                   </span>
@@ -12,8 +12,9 @@ import { Progress } from "@/components/ui/progress";
 import { Badge } from "@/components/ui/badge";
 import { Clock, Save, Send, AlertCircle, Loader2, Play } from "lucide-react";
 import { toast } from "sonner"; 
-import { useStartExamMutation, useSaveAnswerMutation, useSubmitExamMutation, AttemptState } from "@/lib/redux/services/attemptApi";
+import { useStartExamMutation, useSubmitExamMutation, AttemptState } from "@/lib/redux/services/attemptApi";
 import { useAppSelector } from "@/lib/redux/hooks";
+import { useAutoSave } from "@/hooks/useAutoSave";
 
 // Next.js 15: Page props are Promises
 export default function ExamInterface({ params }: { params: Promise<{ examId: string }> }) {
@@ -28,7 +29,6 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
 
   // --- API Hooks ---
   const [startExam, { isLoading: isStarting, error: startError }] = useStartExamMutation();
-  const [saveAnswer] = useSaveAnswerMutation();
   const [submitExam, { isLoading: isSubmitting }] = useSubmitExamMutation();
 
   // --- Local State ---
@@ -36,10 +36,17 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
   const [answers, setAnswers] = useState<Record<string, string | string[] | null>>({});
   const [timeRemaining, setTimeRemaining] = useState<number | null>(null);
-  const [isSaving, setIsSaving] = useState(false);
   
   const hasStartedRef = useRef(false);
 
+  // Changed answers go out together, one bulk request per tick
+  const { flush, isSaving, hasUnsavedChanges } = useAutoSave({
+    studentExamId: attemptData?.attempt_id ?? null,
+    answers,
+    questions: attemptData?.questions ?? [],
+    interval: 5000,
+  });
+
   const handleStartExam = async () => {
     if (!examId) {
       toast.error("Error: Exam ID is missing.");
@@ -100,40 +107,20 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
   }, [timeRemaining]);
 
   // --- 3. Handlers ---
-  const handleAnswerChange = async (questionId: string, value: string | string[] | null) => {
-    // 1. Optimistic Update
+  const handleAnswerChange = (questionId: string, value: string | string[] | null) => {
+    // Saved on the next auto-save tick
     setAnswers((prev) => ({ ...prev, [questionId]: value }));
-    
-    if(!attemptData) return;
-
-    const payload: { attemptId: string; question_id: string; selected_options?: string[]; text_answer?: string } = {
-      attemptId: attemptData.attempt_id,
-      question_id: questionId
-    };
-
-    if (Array.isArray(value)) {
-      payload.selected_options = value;
-    } else if (typeof value === 'string') {
-      const currentQ = attemptData.questions.find((q: { id: string; type: string }) => q.id === questionId);
-      if (currentQ?.type === 'text') {
-        payload.text_answer = value;
-      } else {
-        payload.selected_options = [value];
-      }
-    }
-
-    setIsSaving(true);
-    try {
-      await saveAnswer(payload).unwrap();
-    } catch (err) {
-      // Silent fail to avoid annoying user during exam
-    } finally {
-      setIsSaving(false);
-    }
   };
 
   const handleSubmit = async () => {
     if (!attemptData) return;
+    try {
+      // Answers not yet sent would otherwise be graded as blank
+      await flush();
+    } catch (error) {
+      toast.error("Could not save your latest answers. Please try again.");
+      return;
+    }
     try {
       const result = await submitExam(attemptData.attempt_id).unwrap();
       toast.success(`Exam submitted! Score: ${result.total_score}`);
@@ -226,7 +213,7 @@ export default function ExamInterface({ params }: { params: Promise<{ examId: st
                 <Clock className="h-3.5 w-3.5" />
                 <span className="font-mono text-base">{timeRemaining !== null ? formatTime(timeRemaining) : "--:--"}</span>
               </Badge>
-              {isSaving && <span className="text-xs text-slate-400 flex gap-1"><Loader2 className="h-3 w-3 animate-spin" /> Saving</span>}
+              {(isSaving || hasUnsavedChanges) && <span className="text-xs text-slate-400 flex gap-1"><Loader2 className="h-3 w-3 animate-spin" /> Saving</span>}
             </div>
           </div>
           <Progress value={progress} className="h-1.5" />
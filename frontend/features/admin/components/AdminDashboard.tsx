@@ -1,17 +1,24 @@
 'use client';
 
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { 
   useImportQuestionsMutation, 
+  useGetImportJobQuery,
   useGetAllQuestionsQuery, 
   useCreateExamMutation, 
   useAddQuestionsToExamMutation,
-  usePublishExamMutation 
+  usePublishExamMutation,
+  adminApi,
+  Question
 } from '@/lib/redux/services/adminApi';
-import { Upload, Plus, Check, Calendar, Clock } from 'lucide-react';
+import { useAppDispatch } from '@/lib/redux/hooks';
+import { Upload, Plus, Check, Calendar, Clock, Search } from 'lucide-react';
 import { toast } from 'sonner';
 
+const QUESTION_PAGE_SIZE = 100;
+
 export default function AdminDashboard() {
+  const dispatch = useAppDispatch();
   const [file, setFile] = useState<File | null>(null);
   const [examForm, setExamForm] = useState({
     title: '',
@@ -22,25 +29,72 @@ export default function AdminDashboard() {
   const [selectedQuestions, setSelectedQuestions] = useState<string[]>([]);
   
   const [importQuestions, { isLoading: isUploading }] = useImportQuestionsMutation();
-  const { data: questions, isLoading: isLoadingQuestions } = useGetAllQuestionsQuery();
+  const [importJobId, setImportJobId] = useState<string | null>(null);
+  const { data: importJob } = useGetImportJobQuery(importJobId ?? '', {
+    skip: !importJobId,
+    pollingInterval: 2000,
+  });
+  // The bank is keyset-paged: pages are appended as the admin loads more
+  const [search, setSearch] = useState('');
+  const [afterId, setAfterId] = useState<string | undefined>(undefined);
+  const [questions, setQuestions] = useState<Question[]>([]);
+  const { currentData: questionPage, isLoading: isLoadingQuestions, isFetching: isFetchingQuestions } = useGetAllQuestionsQuery({
+    after_id: afterId,
+    limit: QUESTION_PAGE_SIZE,
+    search: search.trim() || undefined,
+  });
+  const hasMoreQuestions = questionPage?.length === QUESTION_PAGE_SIZE;
   const [createExam, { isLoading: isCreating }] = useCreateExamMutation();
   const [addQuestions] = useAddQuestionsToExamMutation();
   const [publishExam] = usePublishExamMutation();
 
+  useEffect(() => {
+    if (!questionPage) return;
+    setQuestions(prev => afterId
+      ? [...prev.filter(q => !questionPage.some(p => p.id === q.id)), ...questionPage]
+      : questionPage);
+  }, [questionPage, afterId]);
+
+  const reloadQuestions = () => {
+    setAfterId(undefined);
+    dispatch(adminApi.util.invalidateTags(['Question']));
+  };
+
   const handleFileUpload = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!file) return;
     const formData = new FormData();
     formData.append('file', file);
     try {
-      const res = await importQuestions(formData).unwrap();
-      toast.success(`Successfully imported ${res.imported_count} questions!`);
+      const job = await importQuestions(formData).unwrap();
+      setImportJobId(job.id);
       setFile(null);
     } catch (err) {
       toast.error('Upload failed. Please try again.');
     }
   };
 
+  // The import runs in the background; stop polling once it is done
+  useEffect(() => {
+    if (!importJob || importJob.id !== importJobId) return;
+    if (importJob.status === 'completed') {
+      toast.success(`Successfully imported ${importJob.rows_imported} questions!`);
+      if (importJob.rows_skipped > 0) {
+        toast.info(`${importJob.rows_skipped} duplicate questions were already in the bank.`);
+      }
+      if (importJob.rows_failed > 0) {
+        toast.warning(`${importJob.rows_failed} rows were skipped: ${importJob.errors[0]}`);
+      }
+      reloadQuestions();
+      setImportJobId(null);
+    } else if (importJob.status === 'failed') {
+      toast.error(`Import failed: ${importJob.failure}`);
+      setImportJobId(null);
+    }
+  }, [importJob, importJobId]);
+
+  const isImporting = isUploading || importJobId !== null;
+
   const handleCreateExam = async (e: React.FormEvent) => {
     e.preventDefault();
     if (selectedQuestions.length === 0) {
@@ -97,10 +151,14 @@ export default function AdminDashboard() {
           </div>
           <button 
             type="submit" 
-            disabled={!file || isUploading}
+            disabled={!file || isImporting}
             className="bg-primary text-white px-4 py-2 rounded-md hover:bg-primary/90 disabled:opacity-50 transition-colors"
           >
-            {isUploading ? 'Uploading...' : 'Upload'}
+            {isUploading
+              ? 'Uploading...'
+              : importJobId
+                ? `Importing... ${importJob?.rows_processed ?? 0} rows`
+                : 'Upload'}
           </button>
         </form>
       </div>
@@ -173,11 +231,22 @@ export default function AdminDashboard() {
           {/* Question Selection */}
           <div>
             <label className="block text-sm font-medium text-gray-700 mb-2">Select Questions ({selectedQuestions.length})</label>
+            <div className="relative mb-2">
+              <Search className="absolute left-3 top-2.5 h-4 w-4 text-gray-400" />
+              <input 
+                type="search" 
+                value={search}
+                onChange={e => { setSearch(e.target.value); setAfterId(undefined); }}
+                onKeyDown={e => { if (e.key === 'Enter') e.preventDefault(); }}
+                className="w-full pl-10 p-2 border rounded focus:ring-2 focus:ring-blue-500 outline-none"
+                placeholder="Search questions..."
+              />
+            </div>
             <div className="border rounded-md max-h-64 overflow-y-auto p-2 bg-gray-50">
               {isLoadingQuestions ? (
                 <div className="p-4 text-center text-gray-500">Loading questions...</div>
               ) : (
-                questions?.map(q => (
+                questions.map(q => (
                   <div 
                     key={q.id} 
                     onClick={() => toggleQuestion(q.id)}
@@ -195,8 +264,20 @@ export default function AdminDashboard() {
                   </div>
                 ))
               )}
-              {questions?.length === 0 && (
-                <div className="text-center p-4 text-gray-500">No questions available. Please upload questions first.</div>
+              {!isLoadingQuestions && questions.length === 0 && (
+                <div className="text-center p-4 text-gray-500">
+                  {search.trim() ? 'No questions match your search.' : 'No questions available. Please upload questions first.'}
+                </div>
+              )}
+              {hasMoreQuestions && (
+                <button 
+                  type="button" 
+                  onClick={() => setAfterId(questions[questions.length - 1].id)}
+                  disabled={isFetchingQuestions}
+                  className="w-full p-2 text-sm text-primary hover:bg-primary/5 rounded disabled:opacity-50 transition-colors"
+                >
+                  {isFetchingQuestions ? 'Loading...' : 'Load more questions'}
+                </button>
               )}
             </div>
           </div>
@@ -1,90 +1,112 @@
 'use client'
 
 import { useEffect, useRef, useCallback } from 'react'
-import { useSaveAnswerMutation } from '@/lib/api/participationApi'
-import { useAppSelector } from '@/lib/redux/hooks'
+import { useSaveAnswersMutation, AnswerPayload, BulkSaveResult, Question } from '@/lib/redux/services/attemptApi'
 import { toast } from 'sonner'
 
-// Fallback selector if the slice export is not available.
-// This tries common shapes: state.answers.entities or state.answers, and falls back to {}
-const selectAllAnswers = (state: { answers?: Record<string, unknown> | { entities?: Record<string, unknown> } }) => {
-  if (!state.answers) return {};
-  return 'entities' in state.answers ? state.answers.entities ?? {} : state.answers;
+type Answer = string | string[] | number | null
+
+// Answer -> request body, by question type: text questions carry text_answer,
+// choice questions carry selected_options even when a single pick is held as a scalar
+const toPayload = (questionId: string, type: Question['type'] | undefined, answer: Answer): AnswerPayload => {
+  if (answer === null || answer === undefined) return { question_id: questionId }
+  if (type === 'text') {
+    return { question_id: questionId, text_answer: Array.isArray(answer) ? answer.join('') : String(answer) }
+  }
+  const selected = Array.isArray(answer) ? answer : [answer]
+  return { question_id: questionId, selected_options: selected.map(String) }
 }
 
 interface UseAutoSaveOptions {
   studentExamId: string | null
+  answers: Record<string, Answer>
+  questions: Pick<Question, 'id' | 'type'>[]
   enabled?: boolean
   interval?: number // milliseconds
 }
 
 /**
  * Hook for auto-saving exam answers
- * Saves changed answers every 30 seconds (configurable)
+ * Saves changed answers every 30 seconds (configurable), all in one request per tick
  */
 export function useAutoSave({
   studentExamId,
+  answers,
+  questions,
   enabled = true,
   interval = 30000, // 30 seconds default
 }: UseAutoSaveOptions) {
-  const [saveAnswer, { isLoading }] = useSaveAnswerMutation()
-  const answers = useAppSelector(selectAllAnswers)
-  const previousAnswersRef = useRef<Record<string, unknown>>({})
-  const saveIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null)
-  const isSavingRef = useRef(false)
-
-  // Save changed answers
-  const saveChangedAnswers = useCallback(async () => {
-    if (!studentExamId || isSavingRef.current) return
-
-    // Find changed answers
-    const changedQuestions = Object.keys(answers).filter(
+  const [saveAnswers, { isLoading }] = useSaveAnswersMutation()
+  const answersRef = useRef(answers)
+  const typesRef = useRef<Record<string, Question['type']>>({})
+  const previousAnswersRef = useRef<Record<string, Answer>>({})
+  const inFlightRef = useRef<Promise<BulkSaveResult | null> | null>(null)
+
+  // Read through refs so the interval is not reset on every keystroke
+  answersRef.current = answers
+  typesRef.current = Object.fromEntries(questions.map((q) => [q.id, q.type]))
+
+  const changedQuestions = () =>
+    Object.keys(answersRef.current).filter(
       (questionId) =>
-        JSON.stringify(answers[questionId]) !==
+        JSON.stringify(answersRef.current[questionId]) !==
         JSON.stringify(previousAnswersRef.current[questionId])
     )
 
-    if (changedQuestions.length === 0) return
+  // One bulk request; only the answers the server stored stop being dirty
+  const saveBulk = useCallback(
+    async (questionIds: string[]): Promise<BulkSaveResult> => {
+      const snapshot = Object.fromEntries(questionIds.map((id) => [id, answersRef.current[id]]))
+      const result = await saveAnswers({
+        attemptId: studentExamId as string,
+        answers: questionIds.map((id) => toPayload(id, typesRef.current[id], snapshot[id])),
+      }).unwrap()
+      const saved = result.results.filter((r) => r.saved).map((r) => r.question_id)
+      previousAnswersRef.current = {
+        ...previousAnswersRef.current,
+        ...Object.fromEntries(saved.map((id) => [id, snapshot[id]])),
+      }
+      return result
+    },
+    [studentExamId, saveAnswers]
+  )
+
+  // Save changed answers, waiting for a save already on the wire first
+  const flush = useCallback(async (): Promise<BulkSaveResult | null> => {
+    if (!studentExamId) return null
+    while (inFlightRef.current) await inFlightRef.current.catch(() => null)
 
-    isSavingRef.current = true
+    const changed = changedQuestions()
+    if (changed.length === 0) return null
 
+    const request = saveBulk(changed)
+    inFlightRef.current = request
     try {
-      // Save all changed answers
-      const promises = changedQuestions.map((questionId) =>
-        saveAnswer({
-          student_exam_id: studentExamId,
-          question_id: questionId,
-          answer: answers[questionId],
-        }).unwrap()
-      )
-
-      await Promise.all(promises)
-
-      // Update reference
-      previousAnswersRef.current = { ...answers }
-    } catch (error) {
-      // Silent fail - don't show toast to avoid annoying user
+      return await request
     } finally {
-      isSavingRef.current = false
+      inFlightRef.current = null
     }
-  }, [studentExamId, answers, saveAnswer])
+  }, [studentExamId, saveBulk])
+
+  // Answers loaded with the attempt are already on the server
+  useEffect(() => {
+    previousAnswersRef.current = { ...answersRef.current }
+  }, [studentExamId])
 
   // Setup auto-save interval
   useEffect(() => {
     if (!enabled || !studentExamId) return
 
-    // Initial save
-    saveChangedAnswers()
-
-    // Setup interval
-    saveIntervalRef.current = setInterval(saveChangedAnswers, interval)
-
-    return () => {
-      if (saveIntervalRef.current) {
-        clearInterval(saveIntervalRef.current)
-      }
+    const tick = () => {
+      // Rejected answers stay dirty and go out again on the next tick
+      if (!inFlightRef.current) flush().catch(() => {
+        // Silent fail - don't show toast to avoid annoying user
+      })
     }
-  }, [enabled, studentExamId, interval, saveChangedAnswers])
+    const saveInterval = setInterval(tick, interval)
+
+    return () => clearInterval(saveInterval)
+  }, [enabled, studentExamId, interval, flush])
 
   // Manual save function
   const manualSave = useCallback(async () => {
@@ -94,25 +116,23 @@ export function useAutoSave({
     }
 
     try {
-      const promises = Object.entries(answers).map(([questionId, answer]) =>
-        saveAnswer({
-          student_exam_id: studentExamId,
-          question_id: questionId,
-          answer,
-        }).unwrap()
-      )
-
-      await Promise.all(promises)
-      previousAnswersRef.current = { ...answers }
+      const result = await flush()
+      const rejected = result?.results.filter((r) => !r.saved) ?? []
+      if (rejected.length > 0) {
+        toast.error(`${rejected.length} answer(s) could not be saved`)
+        return
+      }
       toast.success('All answers saved successfully')
     } catch (error) {
       toast.error('Failed to save answers')
       throw error
     }
-  }, [studentExamId, answers, saveAnswer])
+  }, [studentExamId, flush])
 
   return {
+    flush,
     manualSave,
     isSaving: isLoading,
+    hasUnsavedChanges: changedQuestions().length > 0,
   }
-}
\ No newline at end of file
+}
@@ -27,13 +27,25 @@ export interface ImportResult {
 }
 
 export interface QuestionFilters {
-  skip?: number
+  after_id?: string // id of the last question on the previous page
   limit?: number
   complexity?: string
   type?: string
+  tags?: string[]
   search?: string
 }
 
+export interface RescoreProgress {
+  question_ids: string[]
+  skipped_ids: string[] // unknown, or text/image questions graded by hand
+  answers_checked: number
+  answers_changed: number
+  attempts_changed: number
+  batches: number
+  answers_per_second: number
+  done: boolean
+}
+
 export const questionsApi = baseApi.injectEndpoints({
   endpoints: (builder) => ({
     // Import questions from Excel
@@ -67,14 +79,14 @@ export const questionsApi = baseApi.injectEndpoints({
       providesTags: (result, error, id) => [{ type: 'Question', id }],
     }),
     
-    // Update question
+    // Update question (only the fields sent change; stored scores stay until rescoreQuestions)
     updateQuestion: builder.mutation<
       Question,
       { id: string; data: Partial<Question> }
     >({
       query: ({ id, data }) => ({
         url: `/questions/${id}`,
-        method: 'PUT',
+        method: 'PATCH',
         body: data,
       }),
       invalidatesTags: (result, error, { id }) => [
@@ -83,6 +95,20 @@ export const questionsApi = baseApi.injectEndpoints({
       ],
     }),
     
+    // Regrade submitted answers after an answer key correction.
+    // The server streams NDJSON progress; the last line is the final report.
+    rescoreQuestions: builder.mutation<RescoreProgress, string[]>({
+      query: (questionIds) => ({
+        url: '/questions/rescore',
+        method: 'POST',
+        body: { question_ids: questionIds },
+        responseHandler: async (response) => {
+          const lines = (await response.text()).trim().split('\n')
+          return JSON.parse(lines[lines.length - 1])
+        },
+      }),
+    }),
+
     // Delete question
     deleteQuestion: builder.mutation<void, string>({
       query: (id) => ({
@@ -99,5 +125,6 @@ export const {
   useGetQuestionsQuery,
   useGetQuestionQuery,
   useUpdateQuestionMutation,
+  useRescoreQuestionsMutation,
   useDeleteQuestionMutation,
 } = questionsApi
\ No newline at end of file
@@ -7,19 +7,52 @@ export interface Question {
   complexity: string;
 }
 
+export interface QuestionListParams {
+  after_id?: string;
+  limit?: number;
+  search?: string;
+  tags?: string[];
+}
+
+export interface ImportJob {
+  id: string;
+  filename: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  rows_processed: number;
+  rows_imported: number;
+  rows_skipped: number;
+  rows_updated: number;
+  rows_failed: number;
+  rows_per_second: number;
+  errors: string[];
+  failure: string | null;
+}
+
 export const adminApi = api.injectEndpoints({
   endpoints: (builder) => ({
-    importQuestions: builder.mutation<{ imported_count: number }, FormData>({
+    // Returns a queued job; poll getImportJob until it completes
+    importQuestions: builder.mutation<ImportJob, FormData>({
       query: (formData) => ({
         url: '/questions/import',
         method: 'POST',
         body: formData,
       }),
-      invalidatesTags: ['Question'],
     }),
 
-    getAllQuestions: builder.query<Question[], void>({
-      query: () => '/questions/',
+    getImportJob: builder.query<ImportJob, string>({
+      query: (jobId) => `/questions/import/${jobId}`,
+    }),
+
+    // One page of the bank in id order; next page with after_id = last id
+    getAllQuestions: builder.query<Question[], QuestionListParams>({
+      query: ({ tags = [], ...filters }) => {
+        const params = new URLSearchParams();
+        Object.entries(filters).forEach(([key, value]) => {
+          if (value !== undefined && value !== '') params.append(key, String(value));
+        });
+        tags.forEach((tag) => params.append('tags', tag));
+        return `/questions/?${params}`;
+      },
       providesTags: ['Question'],
     }),
 
@@ -53,6 +86,7 @@ export const adminApi = api.injectEndpoints({
 
 export const {
   useImportQuestionsMutation,
+  useGetImportJobQuery,
   useGetAllQuestionsQuery,
   useCreateExamMutation,
   useAddQuestionsToExamMutation,
@@ -22,6 +22,17 @@ export interface AttemptState {
   }[];
 }
 
+export interface AnswerPayload {
+  question_id: string;
+  selected_options?: string[];
+  text_answer?: string;
+}
+
+export interface BulkSaveResult {
+  saved_count: number;
+  results: { question_id: string; saved: boolean; detail: string | null }[];
+}
+
 export interface AttemptHistory {
   id: string;
   exam_title: string;
@@ -57,6 +68,53 @@ export interface AttemptReview {
   questions: QuestionReview[];
 }
 
+export interface AnswerGrade {
+  attempt_id: string;
+  question_id: string;
+  score: number;
+}
+
+export interface BulkGradeResult {
+  graded_count: number;
+  totals: { attempt_id: string; total_score: number }[];
+  rejected: (AnswerGrade & { detail: string })[];
+}
+
+export interface UngradedAnswer {
+  id: string;
+  attempt_id: string;
+  selected_options: string[] | null;
+  text_answer: string | null;
+}
+
+export interface QuestionStats {
+  question_id: string;
+  title: string;
+  type: string;
+  max_score: number;
+  answered: number;
+  mean_score: number;
+  difficulty: number | null;
+  discrimination: number | null;
+  point_biserial: number | null;
+  options: { value: string; count: number; share: number; is_key: boolean }[];
+}
+
+export interface ExamAnalytics {
+  exam_id: string;
+  computed_at: string;
+  stale: boolean;
+  attempt_count: number;
+  max_possible_score: number;
+  mean: number | null;
+  std: number | null;
+  min: number | null;
+  max: number | null;
+  percentiles: Record<string, number>;
+  histogram: { edges: number[]; counts: number[] } | null;
+  questions: QuestionStats[];
+}
+
 export const attemptApi = api.injectEndpoints({
   endpoints: (builder) => ({
     startExam: builder.mutation<AttemptState, string>({
@@ -72,6 +130,15 @@ export const attemptApi = api.injectEndpoints({
         body,
       }),
     }),
+
+    // Saves every changed answer in one request; `results` says which ones were stored
+    saveAnswers: builder.mutation<BulkSaveResult, { attemptId: string; answers: AnswerPayload[] }>({
+      query: ({ attemptId, answers }) => ({
+        url: `/attempts/${attemptId}/save/bulk`,
+        method: 'POST',
+        body: { answers },
+      }),
+    }),
     
     submitExam: builder.mutation<{ total_score: number }, string>({
       query: (attemptId) => ({
@@ -99,11 +166,33 @@ export const attemptApi = api.injectEndpoints({
       }),
       invalidatesTags: ['Attempt'],
     }),
+
+    // Grader queue: ungraded answers to one question; next page with after_id = last id
+    getGradingQueue: builder.query<UngradedAnswer[], { questionId: string; after_id?: string; limit?: number }>({
+      query: ({ questionId, ...params }) => ({ url: `/attempts/grading/${questionId}`, params }),
+      providesTags: ['Attempt'],
+    }),
+
+    // Many scores in one request; returns new totals instead of reviews
+    gradeAnswers: builder.mutation<BulkGradeResult, AnswerGrade[]>({
+      query: (grades) => ({
+        url: '/attempts/grading/bulk',
+        method: 'POST',
+        body: { grades },
+      }),
+      invalidatesTags: ['Attempt'],
+    }),
         // 7. Get All Attempts for a Specific Exam (Admin View)
     getExamAttempts: builder.query<AttemptHistory[], string>({
       query: (examId) => `/attempts/exam/${examId}`,
       providesTags: ['Attempt'],
     }),
+
+    // Item analysis, served from the cached report; refresh recomputes it now
+    getExamAnalytics: builder.query<ExamAnalytics, { examId: string; refresh?: boolean }>({
+      query: ({ examId, ...params }) => ({ url: `/attempts/exam/${examId}/analytics`, params }),
+      providesTags: ['Attempt'],
+    }),
   }),
 
   
@@ -112,9 +201,13 @@ export const attemptApi = api.injectEndpoints({
 export const { 
   useStartExamMutation, 
   useSaveAnswerMutation, 
+  useSaveAnswersMutation,
   useSubmitExamMutation, 
   useGetHistoryQuery,
   useGetAttemptReviewQuery,
   useUpdateScoreMutation,
-  useGetExamAttemptsQuery
+  useGetGradingQueueQuery,
+  useGradeAnswersMutation,
+  useGetExamAttemptsQuery,
+  useGetExamAnalyticsQuery
 } = attemptApi;
\ No newline at end of file